@@ -30,4 +30,4 @@ ENV FLASK_APP=app.py
 ENV PYTHONUNBUFFERED=1
 
 # Initialize database and run application
-CMD ["sh", "-c", "flask init-db && gunicorn -w 4 -b 0.0.0.0:5000 app:app"]
+CMD ["sh", "-c", "flask init-db && gunicorn -w 4 -b 0.0.0.0:5000 'app:create_app()'"]
@@ -0,0 +1,182 @@
+# Streaming export/import formats for the analysis history
+#
+# Rows are flat tuples in EXPORT_COLUMNS order. Writers turn one chunk of
+# rows at a time into bytes, so an export can be streamed to a response or a
+# file without holding the history in memory. Readers yield one dict per
+# record from a file-like object. Parquet needs the optional pyarrow package.
+
+import csv
+import io
+import json
+from datetime import datetime
+
+from risk_rules import FEATURE_NAMES
+
+EXPORT_COLUMNS = ['id', 'project_id', 'timestamp', 'risk_score', 'risk_level', 'model_version'] + FEATURE_NAMES
+
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet'
+}
+
+
+def _load_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError('Parquet support requires the pyarrow package')
+    return pyarrow
+
+
+def _json_line(record):
+    return (json.dumps(record, default=lambda o: o.isoformat()) + '\n').encode('utf-8')
+
+
+class NDJSONWriter:
+    """One JSON object per line, encoded by dumps_line (the app passes its JSON provider's)"""
+
+    def __init__(self, dumps_line=_json_line):
+        self._dumps_line = dumps_line
+
+    def write(self, rows):
+        return b''.join(self._dumps_line(dict(zip(EXPORT_COLUMNS, row))) for row in rows)
+
+    def close(self):
+        return b''
+
+
+class CSVWriter:
+    def __init__(self):
+        self._header = True
+
+    def write(self, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if self._header:
+            writer.writerow(EXPORT_COLUMNS)
+            self._header = False
+        writer.writerows(rows)
+        return buffer.getvalue().encode('utf-8')
+
+    def close(self):
+        # An empty export still gets its header
+        return self.write([]) if self._header else b''
+
+
+class _DrainedSink(io.RawIOBase):
+    """Write-only file whose content is handed out (and forgotten) chunk by chunk"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        # Parquet records absolute offsets in its footer
+        return self._position
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ParquetWriter:
+    """One row group per chunk"""
+
+    def __init__(self):
+        pa = _load_pyarrow()
+        self._pa = pa
+        self._schema = pa.schema(
+            [('id', pa.int64()), ('project_id', pa.int64()), ('timestamp', pa.timestamp('us')),
+             ('risk_score', pa.float64()), ('risk_level', pa.string()), ('model_version', pa.string())]
+            + [(name, pa.float64()) for name in FEATURE_NAMES]
+        )
+        self._sink = _DrainedSink()
+        self._writer = pa.parquet.ParquetWriter(self._sink, self._schema)
+
+    def write(self, rows):
+        if rows:
+            columns = list(zip(*rows))
+            self._writer.write_table(self._pa.Table.from_arrays(
+                [self._pa.array(column, type=field.type) for column, field in zip(columns, self._schema)],
+                schema=self._schema
+            ))
+        return self._sink.drain()
+
+    def close(self):
+        self._writer.close()
+        return self._sink.drain()
+
+
+def export_writer(fmt, dumps_line=None):
+    """Chunk writer for an export format; dumps_line encodes an NDJSON record as a bytes line"""
+    if fmt == 'ndjson':
+        return NDJSONWriter(dumps_line) if dumps_line else NDJSONWriter()
+    if fmt == 'csv':
+        return CSVWriter()
+    if fmt == 'parquet':
+        return ParquetWriter()
+    raise ValueError(f'Unknown format: {fmt}')
+
+
+def read_records(fmt, stream):
+    """Yield one dict per record of a binary file-like object"""
+    if fmt == 'ndjson':
+        for line in stream:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # Rejected by import_row, so one bad line does not end the import
+                    yield None
+    elif fmt == 'csv':
+        try:
+            yield from csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8', newline=''))
+        except csv.Error as e:
+            raise ValueError(f'Malformed CSV: {e}')
+    elif fmt == 'parquet':
+        pa = _load_pyarrow()
+        for batch in pa.parquet.ParquetFile(stream).iter_batches():
+            yield from batch.to_pylist()
+    else:
+        raise ValueError(f'Unknown format: {fmt}')
+
+
+def _float(record, name):
+    value = record.get(name)
+    return None if value in (None, '') else float(value)
+
+
+def import_row(record):
+    """Analysis column values for one imported record (raises ValueError if invalid)"""
+    if not isinstance(record, dict):
+        raise ValueError('Malformed record')
+    try:
+        timestamp = record['timestamp']
+        if not isinstance(timestamp, datetime):
+            timestamp = datetime.fromisoformat(str(timestamp).replace('Z', '+00:00')).replace(tzinfo=None)
+        features = {name: _float(record, name) for name in FEATURE_NAMES}
+        row = {
+            'project_id': int(record['project_id']),
+            'timestamp': timestamp,
+            'risk_score': float(record['risk_score']),
+            'risk_level': str(record['risk_level']),
+            'model_version': record.get('model_version') or None,
+            'metrics': {name: value for name, value in features.items() if value is not None},
+            'warnings': [],
+            'recommendations': []
+        }
+    except (KeyError, TypeError) as e:
+        raise ValueError(f'Missing or invalid field: {e}')
+    row.update(features)
+    return row
@@ -1,35 +1,281 @@
 # Flask Backend for ML-Based Early Warning System
 # This is a production-ready backend API for the early warning system
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import (
     JWTManager, create_access_token, jwt_required, get_jwt_identity
 )
-from datetime import datetime, timedelta
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+import base64
+import hmac
+import json
 import os
-import pandas as pd
+import tempfile
+import threading
+import time
+import click
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from xgboost import XGBClassifier
-import joblib
-import requests
+
+from risk_rules import (
+    FEATURE_NAMES, rule_based_scores, rule_based_contributions, condition_masks, warning_masks,
+    decode_warnings, decode_recommendations
+)
+from model_registry import ModelRegistry, ModelRegistryError
+from tree_engine import CompiledEnsemble
+from prediction_cache import PredictionCache, RedisCacheBackend
+from github_client import GitHubClient, GitHubRateLimitError
+from github_cache import ResponseCache
+from github_metrics import sync_repository
+from job_queue import JobWorkerPool
+from password_hasher import PasswordHasher, PasswordHasherBusy
+from scan_scheduler import ScanScheduler
+from metric_trends import TREND_SERIES, as_history, compute_trends
+from analysis_io import EXPORT_COLUMNS, FORMATS, export_writer, import_row, read_records
+from ensemble_selection import EQUAL_WEIGHTS, candidate_weights, choose, held_out_scores, measure_latency
+from drift_monitor import FeatureDriftMonitor, reference_profile
+from metrics import MetricsRegistry
+from db_engine import engine_options, install_sqlite_pragmas, is_sqlite, sqlite_pragmas
+from group_commit import GroupCommitter
+from json_provider import make_json_provider
+from request_profiler import SlowRequestProfiler
 
 # Initialize Flask app
 app = Flask(__name__)
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'your-secret-key-change-in-production')
 app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///early_warning.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# SQLite pragmas: journal mode (empty = leave as is), NORMAL or FULL sync, lock wait, page cache
+app.config['SQLITE_JOURNAL_MODE'] = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+app.config['SQLITE_SYNCHRONOUS'] = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+app.config['SQLITE_BUSY_TIMEOUT_MS'] = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+app.config['SQLITE_CACHE_SIZE_KB'] = int(os.environ.get('SQLITE_CACHE_SIZE_KB', 20000))
+# Connection pool per process for server databases (PostgreSQL, MySQL)
+app.config['DB_POOL_SIZE'] = int(os.environ.get('DB_POOL_SIZE', 10))
+app.config['DB_MAX_OVERFLOW'] = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+app.config['DB_POOL_TIMEOUT'] = float(os.environ.get('DB_POOL_TIMEOUT', 30))
+app.config['DB_POOL_RECYCLE'] = int(os.environ.get('DB_POOL_RECYCLE', 1800))
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(
+    app.config['SQLALCHEMY_DATABASE_URI'],
+    pool_size=app.config['DB_POOL_SIZE'],
+    max_overflow=app.config['DB_MAX_OVERFLOW'],
+    pool_timeout=app.config['DB_POOL_TIMEOUT'],
+    pool_recycle=app.config['DB_POOL_RECYCLE'],
+    sqlite_busy_timeout=app.config['SQLITE_BUSY_TIMEOUT_MS']
+)
+# Commit synchronous analyses arriving within WINDOW_MS of each other in one transaction (opt-in)
+app.config['ANALYSIS_GROUP_COMMIT'] = os.environ.get('ANALYSIS_GROUP_COMMIT', '0') in ('1', 'true')
+app.config['ANALYSIS_GROUP_COMMIT_WINDOW_MS'] = float(os.environ.get('ANALYSIS_GROUP_COMMIT_WINDOW_MS', 2))
+app.config['ANALYSIS_GROUP_COMMIT_MAX_BATCH'] = int(os.environ.get('ANALYSIS_GROUP_COMMIT_MAX_BATCH', 100))
 app.config['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY', 'jwt-secret-key-change-in-production')
 app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(days=7)
+# bcrypt cost; stored hashes with another cost are rehashed on the next login
+app.config['BCRYPT_LOG_ROUNDS'] = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+# Password hashing processes per web process (0 = inline) and hashes allowed in flight
+app.config['PASSWORD_HASH_WORKERS'] = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+app.config['PASSWORD_HASH_MAX_PENDING'] = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 16))
+app.config['PASSWORD_HASH_TIMEOUT'] = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 10))
+app.config['MODEL_REGISTRY_DIR'] = os.environ.get('MODEL_REGISTRY_DIR', 'model_registry')
+# Seconds between checks of the registry's active version (0 disables hot-swap)
+app.config['MODEL_RELOAD_INTERVAL'] = float(os.environ.get('MODEL_RELOAD_INTERVAL', 5))
+# joblib mmap_mode for model artifacts ('r' shares arrays through the page cache)
+app.config['MODEL_MMAP_MODE'] = os.environ.get('MODEL_MMAP_MODE') or None
+# 'native' (sklearn/xgboost predict_proba) or 'compiled' (flat-array tree evaluator)
+app.config['INFERENCE_ENGINE'] = os.environ.get('INFERENCE_ENGINE', 'native')
+# p50 single-row latency budget for the ensemble chosen by `flask train`, in microseconds (0 = no budget)
+app.config['ENSEMBLE_LATENCY_BUDGET_US'] = float(os.environ.get('ENSEMBLE_LATENCY_BUDGET_US', 0))
+# Analyses per input-drift window in each worker (0 disables the monitor)
+app.config['DRIFT_WINDOW'] = int(os.environ.get('DRIFT_WINDOW', 1000))
+# Analyses a window needs before it is compared with the training reference
+app.config['DRIFT_MIN_SAMPLES'] = int(os.environ.get('DRIFT_MIN_SAMPLES', 200))
+# PSI at which a feature counts as drifted and an alert is logged and counted
+app.config['DRIFT_PSI_THRESHOLD'] = float(os.environ.get('DRIFT_PSI_THRESHOLD', 0.25))
+# Analysis result cache (0 entries disables it); features are rounded to PRECISION decimals
+app.config['PREDICTION_CACHE_SIZE'] = int(os.environ.get('PREDICTION_CACHE_SIZE', 10000))
+app.config['PREDICTION_CACHE_TTL'] = float(os.environ.get('PREDICTION_CACHE_TTL', 300))
+app.config['PREDICTION_CACHE_PRECISION'] = int(os.environ.get('PREDICTION_CACHE_PRECISION', 2))
+app.config['PREDICTION_CACHE_REDIS_URL'] = os.environ.get('PREDICTION_CACHE_REDIS_URL')
+# GitHub API (point GITHUB_API_URL at a stand-in server for local testing)
+app.config['GITHUB_API_URL'] = os.environ.get('GITHUB_API_URL', 'https://api.github.com')
+app.config['GITHUB_TOKEN'] = os.environ.get('GITHUB_TOKEN')
+app.config['GITHUB_TIMEOUT'] = float(os.environ.get('GITHUB_TIMEOUT', 10))
+app.config['GITHUB_MAX_RETRIES'] = int(os.environ.get('GITHUB_MAX_RETRIES', 3))
+# Conditional-request (ETag) cache for GitHub responses (empty path disables it)
+app.config['GITHUB_CACHE_PATH'] = os.environ.get('GITHUB_CACHE_PATH', 'github_cache.db')
+app.config['GITHUB_CACHE_MAX_MB'] = float(os.environ.get('GITHUB_CACHE_MAX_MB', 50))
+# Repository metrics: rolling window, page cap per listing, commit stats fetched per sync
+app.config['GITHUB_METRICS_WINDOW_DAYS'] = int(os.environ.get('GITHUB_METRICS_WINDOW_DAYS', 30))
+app.config['GITHUB_MAX_PAGES'] = int(os.environ.get('GITHUB_MAX_PAGES', 50))
+app.config['GITHUB_MAX_COMMIT_DETAILS'] = int(os.environ.get('GITHUB_MAX_COMMIT_DETAILS', 100))
+# Background jobs: worker threads per process (0 = enqueue only, run `flask run-jobs`)
+app.config['JOB_WORKERS'] = int(os.environ.get('JOB_WORKERS', 2))
+app.config['JOB_POLL_INTERVAL'] = float(os.environ.get('JOB_POLL_INTERVAL', 1))
+# Running jobs without a heartbeat for this long are requeued (worker died)
+app.config['JOB_LEASE_SECONDS'] = int(os.environ.get('JOB_LEASE_SECONDS', 300))
+app.config['JOB_MAX_ATTEMPTS'] = int(os.environ.get('JOB_MAX_ATTEMPTS', 3))
+# Periodic re-analysis of projects with a repository (in-process loop; or run `flask run-scheduler`)
+app.config['SCHEDULER_ENABLED'] = os.environ.get('SCHEDULER_ENABLED', '0') in ('1', 'true')
+app.config['SCHEDULER_INTERVAL'] = float(os.environ.get('SCHEDULER_INTERVAL', 60))
+# Low-risk projects are due after this many hours; medium after 1/2, high after 1/3 of it
+app.config['SCHEDULER_MIN_AGE_HOURS'] = float(os.environ.get('SCHEDULER_MIN_AGE_HOURS', 6))
+# Expected GitHub calls per incremental sync, and share of the budget kept for users
+app.config['SCHEDULER_CALLS_PER_SYNC'] = float(os.environ.get('SCHEDULER_CALLS_PER_SYNC', 6))
+app.config['SCHEDULER_RATE_RESERVE'] = float(os.environ.get('SCHEDULER_RATE_RESERVE', 0.2))
+app.config['SCHEDULER_MAX_PER_TICK'] = int(os.environ.get('SCHEDULER_MAX_PER_TICK', 50))
+# Metric trends: default history window, rows read per project, points per rolling window
+app.config['TREND_WINDOW_DAYS'] = int(os.environ.get('TREND_WINDOW_DAYS', 90))
+app.config['TREND_MAX_POINTS'] = int(os.environ.get('TREND_MAX_POINTS', 50000))
+app.config['TREND_ROLLING_WINDOW'] = int(os.environ.get('TREND_ROLLING_WINDOW', 10))
+# Rows per server-side cursor fetch (export) and per executemany batch (import)
+app.config['EXPORT_CHUNK_SIZE'] = int(os.environ.get('EXPORT_CHUNK_SIZE', 1000))
+# Serve /api/stats from an incrementally maintained per-user summary row
+app.config['STATS_SUMMARY_ENABLED'] = os.environ.get('STATS_SUMMARY_ENABLED', '0') in ('1', 'true')
+# Response serializer: 'orjson', 'stdlib' or 'auto' (orjson when installed)
+app.config['JSON_PROVIDER'] = os.environ.get('JSON_PROVIDER', 'auto')
+# Prometheus metrics at /metrics; METRICS_TOKEN (if set) must be sent as a bearer token to scrape
+app.config['METRICS_ENABLED'] = os.environ.get('METRICS_ENABLED', '1') in ('1', 'true')
+app.config['METRICS_TOKEN'] = os.environ.get('METRICS_TOKEN')
+# Directory shared by the gunicorn workers so a scrape sees all of them (unset = this process only)
+app.config['METRICS_MULTIPROC_DIR'] = os.environ.get('METRICS_MULTIPROC_DIR')
+# Requests running more SELECTs than this are logged as a likely N+1 (0 = never); batch writes do not count
+app.config['METRICS_QUERY_WARN_THRESHOLD'] = int(os.environ.get('METRICS_QUERY_WARN_THRESHOLD', 50))
+# cProfile dumps of requests slower than this many ms (0 = profiler off), and the share of requests profiled
+app.config['PROFILE_SLOW_REQUESTS_MS'] = float(os.environ.get('PROFILE_SLOW_REQUESTS_MS', 0))
+app.config['PROFILE_SAMPLE_RATE'] = float(os.environ.get('PROFILE_SAMPLE_RATE', 1.0))
+app.config['PROFILE_DIR'] = os.environ.get('PROFILE_DIR', 'profiles')
+app.config['PROFILE_MAX_FILES'] = int(os.environ.get('PROFILE_MAX_FILES', 100))
 
 # Initialize extensions
+app.json = make_json_provider(app, app.config['JSON_PROVIDER'])
 CORS(app)
+if is_sqlite(app.config['SQLALCHEMY_DATABASE_URI']):
+    install_sqlite_pragmas(sqlite_pragmas(
+        journal_mode=app.config['SQLITE_JOURNAL_MODE'],
+        synchronous=app.config['SQLITE_SYNCHRONOUS'],
+        busy_timeout=app.config['SQLITE_BUSY_TIMEOUT_MS'],
+        cache_size_kb=app.config['SQLITE_CACHE_SIZE_KB']
+    ))
 db = SQLAlchemy(app)
 bcrypt = Bcrypt(app)
 jwt = JWTManager(app)
+password_hasher = PasswordHasher(
+    rounds=app.config['BCRYPT_LOG_ROUNDS'],
+    workers=app.config['PASSWORD_HASH_WORKERS'],
+    max_pending=app.config['PASSWORD_HASH_MAX_PENDING'],
+    timeout=app.config['PASSWORD_HASH_TIMEOUT']
+)
+
+# ============================================================================
+# INSTRUMENTATION
+# ============================================================================
+
+metrics_registry = MetricsRegistry(directory=app.config['METRICS_MULTIPROC_DIR'])
+request_counter = metrics_registry.counter(
+    'http_requests_total', 'HTTP requests by route and status code', ('method', 'route', 'status')
+)
+request_latency = metrics_registry.histogram(
+    'http_request_duration_seconds', 'HTTP request latency by route', ('method', 'route')
+)
+inference_latency = metrics_registry.histogram(
+    'model_inference_seconds', 'predict_risk latency by scoring path (ml or rule_based)', ('path', 'call'),
+    buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05)
+)
+db_query_count = metrics_registry.histogram(
+    'db_queries_per_request', 'SQL statements executed per request', ('route',),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+)
+db_query_time = metrics_registry.histogram(
+    'db_query_seconds_per_request', 'Time spent in SQL statements per request', ('route',)
+)
+github_call_latency = metrics_registry.histogram(
+    'github_request_duration_seconds', 'GitHub API call latency by resource and status', ('resource', 'status')
+)
+github_rate_limit_remaining = metrics_registry.gauge(
+    'github_rate_limit_remaining', 'GitHub API calls left in the current rate-limit window'
+)
+drift_alerts_counter = metrics_registry.counter(
+    'model_input_drift_alerts_total', 'Features whose input drift crossed DRIFT_PSI_THRESHOLD', ('feature',)
+)
+group_commit_size = metrics_registry.histogram(
+    'analysis_group_commit_size', 'Analyses committed per group-commit transaction',
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200)
+)
+
+request_profiler = SlowRequestProfiler(
+    app.config['PROFILE_DIR'],
+    threshold_ms=app.config['PROFILE_SLOW_REQUESTS_MS'],
+    sample_rate=app.config['PROFILE_SAMPLE_RATE'],
+    max_files=app.config['PROFILE_MAX_FILES']
+) if app.config['PROFILE_SLOW_REQUESTS_MS'] > 0 else None
+
+# Per-thread request state; SQL statements are only counted while a request is active
+_request_state = threading.local()
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info['query_started'] = time.perf_counter()
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _stop_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if getattr(_request_state, 'active', False):
+        _request_state.queries += 1
+        if statement.lstrip()[:6].upper() == 'SELECT':
+            _request_state.selects += 1
+        _request_state.query_seconds += time.perf_counter() - conn.info.pop('query_started', time.perf_counter())
+
+
+@app.before_request
+def start_request_metrics():
+    """Start the request timer, SQL counters and (if configured) the slow-request profiler"""
+    if not app.config['METRICS_ENABLED'] and request_profiler is None:
+        return
+    _request_state.active = True
+    _request_state.started = time.perf_counter()
+    _request_state.queries = 0
+    _request_state.selects = 0
+    _request_state.query_seconds = 0.0
+    if request_profiler is not None:
+        request_profiler.start()
+
+
+@app.after_request
+def record_request_metrics(response):
+    """Record latency, status and SQL usage of the request under its route pattern"""
+    if not getattr(_request_state, 'active', False):
+        return response
+    _request_state.active = False
+    
+    # The route pattern (not the URL) keeps label cardinality bounded
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    if request_profiler is not None:
+        path = request_profiler.stop(f'{request.method} {route}')
+        if path:
+            app.logger.info(f'Slow request profile written to {path}')
+    if not app.config['METRICS_ENABLED']:
+        return response
+    
+    request_counter.inc(method=request.method, route=route, status=response.status_code)
+    request_latency.observe(time.perf_counter() - _request_state.started, method=request.method, route=route)
+    db_query_count.observe(_request_state.queries, route=route)
+    db_query_time.observe(_request_state.query_seconds, route=route)
+    
+    threshold = app.config['METRICS_QUERY_WARN_THRESHOLD']
+    if threshold and _request_state.selects > threshold:
+        app.logger.warning(
+            f'{request.method} {request.path} ran {_request_state.selects} SELECTs (possible N+1 query)'
+        )
+    
+    metrics_registry.flush()
+    return response
+
 
 # ============================================================================
 # DATABASE MODELS
@@ -59,6 +305,7 @@ class User(db.Model):
 
 class Project(db.Model):
     __tablename__ = 'projects'
+    __table_args__ = (db.Index('ix_projects_user_risk_level', 'user_id', 'risk_level'),)
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -88,16 +335,26 @@ class Project(db.Model):
 
 class Analysis(db.Model):
     __tablename__ = 'analyses'
+    __table_args__ = (db.Index('ix_analyses_project_timestamp', 'project_id', 'timestamp', 'id'),)
     
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
     risk_score = db.Column(db.Float, nullable=False)
     risk_level = db.Column(db.String(20), nullable=False)
+    model_version = db.Column(db.String(64))
+    
+    # Model features as typed columns, so a project's history reads as one array
+    commit_frequency = db.Column(db.Float)
+    contributor_activity = db.Column(db.Float)
+    issue_resolution_time = db.Column(db.Float)
+    code_churn = db.Column(db.Float)
+    open_issues_ratio = db.Column(db.Float)
     
     # Store as JSON
     metrics = db.Column(db.JSON)
     feature_importance = db.Column(db.JSON)
+    contributions = db.Column(db.JSON)  # this prediction's per-feature explanation
     warnings = db.Column(db.JSON)
     recommendations = db.Column(db.JSON)
     
@@ -108,8 +365,10 @@ class Analysis(db.Model):
             'timestamp': self.timestamp.isoformat(),
             'risk_score': self.risk_score,
             'risk_level': self.risk_level,
+            'model_version': self.model_version,
             'metrics': self.metrics,
             'feature_importance': self.feature_importance,
+            'contributions': self.contributions,
             'warnings': self.warnings,
             'recommendations': self.recommendations
         }
@@ -117,6 +376,10 @@ class Analysis(db.Model):
 
 class Warning(db.Model):
     __tablename__ = 'warnings'
+    __table_args__ = (
+        db.Index('ix_warnings_project_timestamp', 'project_id', 'timestamp', 'id'),
+        db.Index('ix_warnings_project_acknowledged_timestamp', 'project_id', 'acknowledged', 'timestamp', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
@@ -136,6 +399,97 @@ class Warning(db.Model):
         }
 
 
+class UserStats(db.Model):
+    __tablename__ = 'user_stats'
+    
+    # Running totals behind /api/stats; built from the source tables on first read
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    total_projects = db.Column(db.Integer, nullable=False, default=0)
+    risk_score_sum = db.Column(db.Float, nullable=False, default=0.0)
+    low_risk = db.Column(db.Integer, nullable=False, default=0)
+    medium_risk = db.Column(db.Integer, nullable=False, default=0)
+    high_risk = db.Column(db.Integer, nullable=False, default=0)
+    active_warnings = db.Column(db.Integer, nullable=False, default=0)
+    
+    def to_dict(self):
+        return {
+            'total_projects': self.total_projects,
+            'average_risk_score': round(self.risk_score_sum / self.total_projects, 2) if self.total_projects > 0 else 0,
+            'risk_distribution': {
+                'low': self.low_risk,
+                'medium': self.medium_risk,
+                'high': self.high_risk
+            },
+            'active_warnings': self.active_warnings
+        }
+
+
+class RepositorySync(db.Model):
+    __tablename__ = 'repository_syncs'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False, unique=True)
+    repository = db.Column(db.String(500), nullable=False)
+    commits_cursor = db.Column(db.String(32))  # newest commit date seen
+    issues_cursor = db.Column(db.String(32))  # newest issue updated_at seen
+    state = db.Column(db.JSON, nullable=False)  # running aggregates (see github_metrics)
+    synced_at = db.Column(db.DateTime)
+    
+    project = db.relationship(
+        'Project', backref=db.backref('repository_sync', uselist=False, cascade='all, delete-orphan')
+    )
+    
+    def to_dict(self):
+        return {
+            'project_id': self.project_id,
+            'repository': self.repository,
+            'commits_cursor': self.commits_cursor,
+            'issues_cursor': self.issues_cursor,
+            'synced_at': self.synced_at.isoformat() if self.synced_at else None
+        }
+
+
+class Job(db.Model):
+    __tablename__ = 'jobs'
+    __table_args__ = (db.Index('ix_jobs_status_id', 'status', 'id'),)
+    
+    # Rough progress per stage, reported to pollers
+    STAGE_PROGRESS = {'queued': 0, 'fetching': 25, 'predicting': 60, 'persisting': 85, 'done': 100}
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    kind = db.Column(db.String(50), nullable=False)  # analyze, github_analyze
+    origin = db.Column(db.String(20), nullable=False, default='api')  # api, scheduler
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, succeeded, failed
+    stage = db.Column(db.String(20), nullable=False, default='queued')
+    payload = db.Column(db.JSON, nullable=False)
+    result = db.Column(db.JSON)
+    error = db.Column(db.Text)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    worker = db.Column(db.String(100))
+    run_after = db.Column(db.DateTime)  # set when deferred by the GitHub rate limit
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'origin': self.origin,
+            'status': self.status,
+            'stage': self.stage,
+            'progress': self.STAGE_PROGRESS.get(self.stage, 0),
+            'attempts': self.attempts,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
 # ============================================================================
 # ML MODEL CLASS
 # ============================================================================
@@ -143,95 +497,236 @@ class Warning(db.Model):
 class RiskPredictor:
     """Machine Learning model for project failure risk prediction"""
     
-    def __init__(self):
+    RULE_BASED_VERSION = 'rule-based'
+    INFERENCE_ENGINES = ('native', 'compiled')
+    # Largest accepted probability difference between the compiled trees and predict_proba
+    COMPILED_TOLERANCE = 1e-5
+    
+    def __init__(self, inference_engine='native'):
+        if inference_engine not in self.INFERENCE_ENGINES:
+            raise ValueError(f'Unknown inference engine: {inference_engine}')
         self.rf_model = None
         self.xgb_model = None
-        self.feature_names = [
-            'commit_frequency',
-            'contributor_activity',
-            'issue_resolution_time',
-            'code_churn',
-            'open_issues_ratio'
-        ]
+        self.compiled = None
+        self.inference_engine = inference_engine
+        self.feature_names = list(FEATURE_NAMES)
+        self.version = None
+        self.metadata = {}
+        # Share of each model in the risk score; a zero-weight model is never evaluated
+        self.weights = dict(EQUAL_WEIGHTS)
+        self.ensemble = None
+        self.drift_reference = None
+        self.drift_monitor = None
+        self._feature_importance = None
+        self._explainer = None
+    
+    @classmethod
+    def from_bundle(cls, bundle, inference_engine='native'):
+        """Build a predictor from a model registry bundle"""
+        instance = cls(inference_engine=inference_engine)
+        instance.rf_model = bundle['rf_model']
+        instance.xgb_model = bundle['xgb_model']
+        instance.compiled = bundle.get('compiled')
+        instance.feature_names = list(bundle['feature_names'])
+        instance.version = bundle.get('version')
+        instance.metadata = bundle.get('metadata', {})
+        # Artifacts saved before ensemble selection existed use equal weights
+        instance.ensemble = bundle.get('ensemble')
+        if instance.ensemble:
+            instance.weights = dict(instance.ensemble['weights'])
+        instance.set_drift_reference(bundle.get('drift_reference'))
         
-    def train_models(self, X, y):
-        """Train both Random Forest and XGBoost models"""
-        self.rf_model = RandomForestClassifier(
-            n_estimators=100,
-            max_depth=10,
-            random_state=42
-        )
-        self.rf_model.fit(X, y)
+        # Artifacts saved before the compiled engine existed
+        if instance.compiled is None and inference_engine == 'compiled':
+            instance.compiled = CompiledEnsemble.from_models(instance.rf_model, instance.xgb_model)
+        return instance
+    
+    @property
+    def model_version(self):
+        """Version label recorded on each analysis"""
+        if self.rf_model is None or self.xgb_model is None:
+            return self.RULE_BASED_VERSION
+        return self.version or 'unversioned'
+        
+    def train_models(self, X, y, n_jobs=None):
+        """Train the Random Forest and XGBoost models side by side on n_jobs cores"""
+        # scikit-learn and XGBoost are only imported once a model is trained or loaded
+        from training import fit_models
+        
+        self.version = None
+        self._feature_importance = None
+        self._explainer = None
+        self.weights = dict(EQUAL_WEIGHTS)
+        self.ensemble = None
+        self.metadata = {
+            'trained_at': datetime.utcnow().isoformat(),
+            'n_samples': int(len(y)),
+            'positive_rate': float(np.mean(y)) if len(y) else 0.0
+        }
         
-        self.xgb_model = XGBClassifier(
-            n_estimators=100,
-            max_depth=10,
-            learning_rate=0.1,
-            random_state=42
+        self.rf_model, self.xgb_model = fit_models(X, y, n_jobs)
+        self.set_drift_reference(reference_profile(X, self.feature_names))
+        
+        # Serve through the native models if the export does not verify
+        self.compiled = None
+        try:
+            self.compile(np.asarray(X, dtype=float)[:1000])
+        except ValueError as e:
+            app.logger.warning(f'Compiled inference disabled: {e}')
+    
+    def set_drift_reference(self, reference):
+        """Monitor served inputs against a training reference profile (None disables it)"""
+        self.drift_reference = reference
+        self.drift_monitor = None
+        if reference is not None and app.config['DRIFT_WINDOW'] > 0:
+            self.drift_monitor = FeatureDriftMonitor(
+                reference,
+                window=app.config['DRIFT_WINDOW'],
+                min_samples=app.config['DRIFT_MIN_SAMPLES'],
+                psi_threshold=app.config['DRIFT_PSI_THRESHOLD']
+            )
+    
+    def compile(self, X_check):
+        """Export both ensembles to flat node arrays and verify them on X_check"""
+        compiled = CompiledEnsemble.from_models(self.rf_model, self.xgb_model)
+        error = compiled.max_abs_error(X_check, self.rf_model, self.xgb_model)
+        if error > self.COMPILED_TOLERANCE:
+            raise ValueError(f'Compiled trees differ from predict_proba by {error:.2e}')
+        self.compiled = compiled
+    
+    def _predict_proba(self, X):
+        """Positive class probabilities of the RF and XGBoost models (zeros for a dropped model)"""
+        use_rf, use_xgb = self.weights['rf'] > 0, self.weights['xgb'] > 0
+        if self.inference_engine == 'compiled' and self.compiled is not None:
+            return self.compiled.predict_proba(X, rf=use_rf, xgb=use_xgb)
+        return (
+            self.rf_model.predict_proba(X)[:, 1] if use_rf else np.zeros(len(X)),
+            self.xgb_model.predict_proba(X)[:, 1] if use_xgb else np.zeros(len(X))
         )
-        self.xgb_model.fit(X, y)
+    
+    def _blend(self, rf_value, xgb_value):
+        """Weighted ensemble of per-model values (probabilities or contributions)"""
+        return self.weights['rf'] * rf_value + self.weights['xgb'] * xgb_value
         
     def predict_risk(self, features):
         """Predict failure risk score (0-100)"""
+        started = time.perf_counter()
         if self.rf_model is None or self.xgb_model is None:
             # Use rule-based prediction if models not trained
-            return self._rule_based_prediction(features)
+            risk_score = self._rule_based_prediction(features)
+            inference_latency.observe(time.perf_counter() - started, path='rule_based', call='single')
+            return risk_score
         
         # Get predictions from both models
-        rf_prob = self.rf_model.predict_proba([features])[0][1]
-        xgb_prob = self.xgb_model.predict_proba([features])[0][1]
+        rf_prob, xgb_prob = self._predict_proba(np.asarray([features], dtype=float))
         
-        # Ensemble prediction (average)
-        risk_score = (rf_prob + xgb_prob) / 2 * 100
+        # Ensemble prediction (weighted average)
+        risk_score = self._blend(rf_prob[0], xgb_prob[0]) * 100
         
+        inference_latency.observe(time.perf_counter() - started, path='ml', call='single')
         return risk_score
     
+    def predict_risk_batch(self, feature_matrix):
+        """Predict failure risk scores (0-100) for an (N x 5) feature matrix"""
+        started = time.perf_counter()
+        X = np.asarray(feature_matrix, dtype=float).reshape(-1, len(self.feature_names))
+        
+        if self.rf_model is None or self.xgb_model is None:
+            scores = rule_based_scores(X)
+            inference_latency.observe(time.perf_counter() - started, path='rule_based', call='batch')
+            return scores
+        
+        # One predict_proba call per model for the whole batch
+        rf_prob, xgb_prob = self._predict_proba(X)
+        
+        scores = self._blend(rf_prob, xgb_prob) * 100
+        inference_latency.observe(time.perf_counter() - started, path='ml', call='batch')
+        return scores
+    
+    def explain_batch(self, feature_matrix, exact=False):
+        """Per-feature contributions to each risk score: (base values (N,), contributions (N x 5)).
+        
+        base + contributions.sum(axis=1) reproduces the risk score (0-100). Both
+        models use tree-path decomposition over the flattened trees; exact=True
+        switches XGBoost to its exact TreeSHAP (pred_contribs), which is a few
+        hundred times slower on deep trees.
+        """
+        X = np.asarray(feature_matrix, dtype=float).reshape(-1, len(self.feature_names))
+        
+        if self.rf_model is None or self.xgb_model is None:
+            return np.zeros(len(X)), rule_based_contributions(X)
+        
+        rf_bias, rf_contributions, xgb_bias, margin_contributions = self._tree_explainer().contributions(
+            X, len(self.feature_names)
+        )
+        base_margin = np.full(len(X), xgb_bias)
+        if exact:
+            from xgboost import DMatrix
+            booster = self.xgb_model.get_booster()
+            shap = booster.predict(DMatrix(X, feature_names=booster.feature_names), pred_contribs=True)
+            margin_contributions, base_margin = shap[:, :-1], shap[:, -1]
+        
+        # XGBoost works in log-odds: split its probability change in proportion
+        margin_change = margin_contributions.sum(axis=1)
+        prob = 1.0 / (1.0 + np.exp(-(base_margin + margin_change)))
+        base_prob = 1.0 / (1.0 + np.exp(-base_margin))
+        flat = np.abs(margin_change) < 1e-9
+        scale = np.where(flat, prob * (1 - prob), (prob - base_prob) / np.where(flat, 1.0, margin_change))
+        xgb_contributions = margin_contributions * scale[:, None]
+        
+        # Same weighting as predict_risk_batch
+        base = self._blend(rf_bias, base_prob) * 100
+        return base, self._blend(rf_contributions, xgb_contributions) * 100
+    
+    def select_ensemble(self, rf_prob, xgb_prob, y, probe, latency_budget_us=None, loss_tolerance=0.01):
+        """Choose the served weights from held-out probabilities and measured latency.
+        
+        Candidates are RF alone, XGBoost alone and the log-loss optimal blend.
+        Each is timed on single-row predict_risk calls over the probe rows with
+        this predictor's inference engine. The result is kept in
+        self.ensemble, which is saved with the model artifact.
+        """
+        candidates = {}
+        for name, weights in candidate_weights(rf_prob, xgb_prob, y).items():
+            self.weights = weights
+            candidates[name] = {
+                'weights': weights,
+                **held_out_scores(rf_prob, xgb_prob, y, weights),
+                'latency': measure_latency(self.predict_risk, probe)
+            }
+        
+        selected = choose(candidates, latency_budget_us, loss_tolerance)
+        self.weights = dict(candidates[selected]['weights'])
+        self.ensemble = {
+            'selected': selected,
+            'weights': self.weights,
+            'inference_engine': self.inference_engine,
+            'latency_budget_us': latency_budget_us,
+            'loss_tolerance': loss_tolerance,
+            'candidates': candidates
+        }
+        self.metadata['ensemble'] = self.ensemble
+        return self.ensemble
+    
+    def _tree_explainer(self):
+        """Flattened trees with node means (rebuilt for artifacts compiled without them)"""
+        if getattr(self.compiled, 'node_mean', None) is not None:
+            return self.compiled
+        if self._explainer is None:
+            self._explainer = CompiledEnsemble.from_models(self.rf_model, self.xgb_model)
+        return self._explainer
+    
     def _rule_based_prediction(self, features):
         """Fallback rule-based prediction when models aren't trained"""
-        commit_freq, contributor_activity, resolution_time, code_churn, open_ratio = features
-        
-        risk_score = 0.0
-        
-        # Commit frequency (lower is worse)
-        if commit_freq < 2:
-            risk_score += 25
-        elif commit_freq < 4:
-            risk_score += 15
-        elif commit_freq < 6:
-            risk_score += 5
-            
-        # Contributor activity (lower is worse)
-        if contributor_activity < 40:
-            risk_score += 30
-        elif contributor_activity < 60:
-            risk_score += 20
-        elif contributor_activity < 80:
-            risk_score += 10
-            
-        # Issue resolution time (higher is worse)
-        if resolution_time > 14:
-            risk_score += 25
-        elif resolution_time > 10:
-            risk_score += 15
-        elif resolution_time > 7:
-            risk_score += 5
-            
-        # Code churn (very high is unstable)
-        if code_churn > 500:
-            risk_score += 10
-        elif code_churn > 300:
-            risk_score += 5
-            
-        # Open issues ratio (higher is worse)
-        if open_ratio > 0.4:
-            risk_score += 10
-        elif open_ratio > 0.3:
-            risk_score += 5
-            
-        return min(risk_score, 100)
+        return float(rule_based_scores(features)[0])
     
     def get_feature_importance(self):
-        """Get feature importance scores"""
+        """Get feature importance scores (computed once per trained model)"""
+        if self._feature_importance is None:
+            self._feature_importance = self._compute_feature_importance()
+        return [dict(item) for item in self._feature_importance]
+    
+    def _compute_feature_importance(self):
         if self.rf_model is None:
             # Return default importance
             return [
@@ -255,69 +750,97 @@ class RiskPredictor:
     
     def generate_warnings(self, features, risk_score):
         """Generate specific warnings based on metrics"""
-        warnings = []
-        commit_freq, contributor_activity, resolution_time, code_churn, open_ratio = features
-        
-        if contributor_activity < 50:
-            warnings.append("Declining contributor activity detected - engagement is below healthy levels")
-        
-        if open_ratio > 0.3:
-            warnings.append("Increasing number of unresolved issues - backlog is growing")
-        
-        if resolution_time > 10:
-            warnings.append("Delayed issue resolution times - average resolution taking too long")
-        
-        if commit_freq < 3:
-            warnings.append("Low commit frequency - development activity is declining")
-        
-        if code_churn > 400:
-            warnings.append("High code churn detected - potential instability in codebase")
-        
-        if risk_score > 70 and not warnings:
-            warnings.append("Multiple risk factors detected - comprehensive review recommended")
-        
-        return warnings
+        return self.generate_warnings_batch(features, [risk_score])[0]
     
     def generate_recommendations(self, features, warnings):
         """Generate actionable recommendations"""
-        recommendations = []
-        commit_freq, contributor_activity, resolution_time, code_churn, open_ratio = features
-        
-        if contributor_activity < 50:
-            recommendations.append("Increase team collaboration through daily standups or weekly syncs")
-            recommendations.append("Consider bringing in additional contributors or redistributing workload")
-        
-        if open_ratio > 0.3:
-            recommendations.append("Prioritize and address open issues - consider triage meeting")
-            recommendations.append("Review issue management workflow for bottlenecks")
-        
-        if resolution_time > 10:
-            recommendations.append("Optimize bug resolution workflow to reduce average resolution time")
-            recommendations.append("Implement automated testing to catch issues earlier")
-        
-        if commit_freq < 3:
-            recommendations.append("Establish regular development cadence with consistent commit schedule")
-            recommendations.append("Break down large tasks into smaller, more frequent commits")
-        
-        if code_churn > 400:
-            recommendations.append("Review code review practices to reduce unnecessary changes")
-            recommendations.append("Stabilize architecture before adding new features")
-        
-        if not recommendations:
-            recommendations.append("Project is healthy - maintain current development practices")
-            recommendations.append("Continue regular contributions and active issue management")
-        
-        return recommendations[:5]  # Return top 5 recommendations
+        return self.generate_recommendations_batch(features)[0]
+    
+    def generate_warnings_batch(self, feature_matrix, risk_scores):
+        """Generate warnings for every row of an (N x 5) feature matrix"""
+        return decode_warnings(warning_masks(feature_matrix, risk_scores))
+    
+    def generate_recommendations_batch(self, feature_matrix):
+        """Generate recommendations (top 5) for every row of an (N x 5) feature matrix"""
+        return decode_recommendations(condition_masks(feature_matrix))
 
 
 # Initialize predictor
-predictor = RiskPredictor()
+predictor = RiskPredictor(inference_engine=app.config['INFERENCE_ENGINE'])
+model_registry = ModelRegistry(app.config['MODEL_REGISTRY_DIR'])
+prediction_cache = PredictionCache(
+    max_entries=app.config['PREDICTION_CACHE_SIZE'],
+    ttl=app.config['PREDICTION_CACHE_TTL'],
+    precision=app.config['PREDICTION_CACHE_PRECISION'],
+    backend=RedisCacheBackend(
+        app.config['PREDICTION_CACHE_REDIS_URL'], app.config['PREDICTION_CACHE_TTL']
+    ) if app.config['PREDICTION_CACHE_REDIS_URL'] else None
+)
+
+_model_reload_lock = threading.Lock()
+_last_model_check = 0.0
+
+
+def activate_predictor(new_predictor):
+    """Swap the predictor served to new requests"""
+    # Requests take a reference to the current predictor when they start, so
+    # in-flight requests finish on the model they began with
+    global predictor
+    predictor = new_predictor
+    # Entries are keyed by model version; drop the old version's results
+    prediction_cache.clear()
+
+
+def load_active_model():
+    """Load the registry's active version if it differs from the served one"""
+    version = model_registry.get_active_version()
+    if not version or version == predictor.version:
+        return False
+    
+    try:
+        new_predictor = RiskPredictor.from_bundle(
+            model_registry.load(version, mmap_mode=app.config['MODEL_MMAP_MODE']),
+            inference_engine=app.config['INFERENCE_ENGINE']
+        )
+    except Exception as e:
+        app.logger.error(f'Failed to load model version {version}: {e}')
+        return False
+    
+    activate_predictor(new_predictor)
+    app.logger.info(f'Serving model version {version}')
+    return True
+
+
+@app.before_request
+def refresh_model():
+    """Pick up a newly activated model version (throttled, non-blocking)"""
+    global _last_model_check
+    interval = app.config['MODEL_RELOAD_INTERVAL']
+    if interval <= 0 or time.monotonic() - _last_model_check < interval:
+        return
+    
+    # Only one thread per worker checks; others keep serving the current model
+    if not _model_reload_lock.acquire(blocking=False):
+        return
+    try:
+        _last_model_check = time.monotonic()
+        load_active_model()
+    finally:
+        _model_reload_lock.release()
 
 
 # ============================================================================
 # AUTHENTICATION ROUTES
 # ============================================================================
 
+@app.errorhandler(PasswordHasherBusy)
+def password_hasher_busy(e):
+    """Shed login/signup load instead of tying up the worker"""
+    response = jsonify({'error': str(e)})
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response, 503
+
+
 @app.route('/api/auth/signup', methods=['POST'])
 def signup():
     """User registration endpoint"""
@@ -335,7 +858,10 @@ def signup():
         return jsonify({'error': 'Email already exists'}), 400
     
     # Create user
-    password_hash = bcrypt.generate_password_hash(data['password']).decode('utf-8')
+    try:
+        password_hash = password_hasher.hash(data['password'])
+    except ValueError as e:
+        return jsonify({'error': f'Invalid password: {e}'}), 400
     user = User(
         username=data['username'],
         email=data['email'],
@@ -366,9 +892,21 @@ def login():
     
     user = User.query.filter_by(username=data['username']).first()
     
-    if not user or not bcrypt.check_password_hash(user.password_hash, data['password']):
+    try:
+        valid = user is not None and password_hasher.check(user.password_hash, data['password'])
+    except ValueError:
+        valid = False
+    if not valid:
         return jsonify({'error': 'Invalid credentials'}), 401
     
+    if password_hasher.needs_rehash(user.password_hash):
+        # The configured cost changed: upgrade the stored hash while we know the password
+        try:
+            user.password_hash = password_hasher.hash(data['password'])
+            db.session.commit()
+        except PasswordHasherBusy:
+            pass  # try again on a later login
+    
     access_token = create_access_token(identity=user.id)
     
     return jsonify({
@@ -387,6 +925,9 @@ def login():
 def get_projects():
     """Get all projects for current user"""
     user_id = get_jwt_identity()
+    if wants_ndjson():
+        return stream_ndjson(Project.query.filter_by(user_id=user_id).order_by(Project.id), PROJECT_FIELDS)
+    
     projects = Project.query.filter_by(user_id=user_id).all()
     
     return jsonify({
@@ -412,6 +953,8 @@ def create_project():
     )
     
     db.session.add(project)
+    db.session.flush()
+    adjust_user_stats(user_id, project_stat_deltas(project))
     db.session.commit()
     
     return jsonify({
@@ -445,6 +988,10 @@ def delete_project(project_id):
     if not project:
         return jsonify({'error': 'Project not found'}), 404
     
+    deltas = project_stat_deltas(project, sign=-1)
+    deltas['active_warnings'] = -Warning.query.filter_by(project_id=project.id, acknowledged=False).count()
+    adjust_user_stats(user_id, deltas)
+    
     db.session.delete(project)
     db.session.commit()
     
@@ -455,75 +1002,316 @@ def delete_project(project_id):
 # ANALYSIS ROUTES
 # ============================================================================
 
-@app.route('/api/analyze', methods=['POST'])
-@jwt_required()
-def analyze_project():
-    """Run ML analysis on project data"""
-    user_id = get_jwt_identity()
-    data = request.get_json()
-    
-    project_id = data.get('project_id')
-    if not project_id:
-        return jsonify({'error': 'Project ID required'}), 400
-    
-    project = Project.query.filter_by(id=project_id, user_id=user_id).first()
-    if not project:
-        return jsonify({'error': 'Project not found'}), 404
-    
-    # Extract metrics from data
-    metrics = data.get('metrics', {})
+# Upper bound on the number of projects scored by a single batch request
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', 1000))
+
+
+def extract_features(metrics):
+    """Build the model feature vector from a metrics dict"""
+    return [metrics.get(name, 0) for name in FEATURE_NAMES]
+
+
+def get_risk_level(risk_score):
+    """Map a 0-100 risk score to a risk level"""
+    if risk_score < 30:
+        return 'low'
+    elif risk_score < 60:
+        return 'medium'
+    return 'high'
+
+
+def format_contributions(base_value, contributions):
+    """Explanation of one score, largest effect first"""
     features = [
-        metrics.get('commit_frequency', 0),
-        metrics.get('contributor_activity', 0),
-        metrics.get('issue_resolution_time', 0),
-        metrics.get('code_churn', 0),
-        metrics.get('open_issues_ratio', 0)
+        {'feature': name.replace('_', ' ').title(), 'contribution': round(float(value), 4)}
+        for name, value in zip(FEATURE_NAMES, contributions)
     ]
+    return {
+        'base_value': round(float(base_value), 4),
+        'features': sorted(features, key=lambda item: abs(item['contribution']), reverse=True)
+    }
+
+
+def build_analysis_result(model, features, risk_score, warnings=None, recommendations=None,
+                          explanation=None):
+    """Risk level, warnings, recommendations and feature importance for a score"""
+    risk_score = float(risk_score)
+    
+    # Generate warnings, recommendations and explanation unless precomputed for a batch
+    if warnings is None:
+        warnings = model.generate_warnings(features, risk_score)
+    if recommendations is None:
+        recommendations = model.generate_recommendations(features, warnings)
+    if explanation is None:
+        base_values, contributions = model.explain_batch([features])
+        explanation = (base_values[0], contributions[0])
+    
+    return {
+        'risk_score': risk_score,
+        'risk_level': get_risk_level(risk_score),
+        'warnings': warnings,
+        'recommendations': recommendations,
+        'feature_importance': model.get_feature_importance(),
+        'contributions': format_contributions(*explanation)
+    }
+
+
+def analyze_features(model, features):
+    """Analysis result for one feature vector, served from the prediction cache when possible"""
+    key = prediction_cache.make_key(model.model_version, features)
+    result = prediction_cache.get(key)
+    if result is None:
+        result = build_analysis_result(model, features, model.predict_risk(features))
+        prediction_cache.set(key, result)
+    return result
+
+
+def analyze_features_batch(model, rows):
+    """Analysis results for a feature matrix; only cache misses are scored (as one batch)"""
+    keys = [prediction_cache.make_key(model.model_version, features) for features in rows]
+    results = [prediction_cache.get(key) for key in keys]
+    
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        # One feature matrix, one predict_proba call per model
+        X = [rows[i] for i in missing]
+        risk_scores = model.predict_risk_batch(X)
+        warnings = model.generate_warnings_batch(X, risk_scores)
+        recommendations = model.generate_recommendations_batch(X)
+        base_values, contributions = model.explain_batch(X)
+        
+        for i, risk_score, item_warnings, item_recommendations, base_value, item_contributions in zip(
+            missing, risk_scores, warnings, recommendations, base_values, contributions
+        ):
+            results[i] = build_analysis_result(
+                model, rows[i], risk_score,
+                warnings=item_warnings, recommendations=item_recommendations,
+                explanation=(base_value, item_contributions)
+            )
+            prediction_cache.set(keys[i], results[i])
     
-    # Predict risk
-    risk_score = predictor.predict_risk(features)
-    
-    # Determine risk level
-    if risk_score < 30:
-        risk_level = 'low'
-    elif risk_score < 60:
-        risk_level = 'medium'
+    return results
+
+
+def feature_columns(features):
+    """Typed Analysis column values for a feature vector (None where not numeric)"""
+    columns = {}
+    for name, value in zip(FEATURE_NAMES, features):
+        try:
+            columns[name] = float(value)
+        except (TypeError, ValueError):
+            columns[name] = None
+    return columns
+
+
+# Per-project LIMIT queries combined in one UNION ALL; SQLite allows at most 500 terms in a compound SELECT
+HISTORY_UNION_SIZE = 100
+
+
+def load_metric_history(project_ids, since=None, max_points=None):
+    """{project_id: (timestamps, rows)} of feature + risk score history, oldest first"""
+    query = db.session.query(
+        Analysis.project_id, Analysis.timestamp, *[getattr(Analysis, name) for name in TREND_SERIES]
+    )
+    if since is not None:
+        query = query.filter(Analysis.timestamp >= since)
+    
+    if max_points:
+        # The newest max_points of each project, each read backwards along ix_analyses_project_timestamp.
+        # (ROW_NUMBER() OVER (PARTITION BY project_id) would number a project's whole history first.)
+        newest = [
+            query.filter(Analysis.project_id == project_id)
+            .order_by(Analysis.timestamp.desc(), Analysis.id.desc()).limit(max_points).subquery().select()
+            for project_id in dict.fromkeys(project_ids)
+        ]
+        statements = [
+            db.union_all(*newest[start:start + HISTORY_UNION_SIZE])
+            for start in range(0, len(newest), HISTORY_UNION_SIZE)
+        ]
     else:
-        risk_level = 'high'
+        statements = [
+            query.filter(Analysis.project_id.in_(project_ids))
+            .order_by(Analysis.project_id, Analysis.timestamp).statement
+        ]
     
-    # Generate warnings and recommendations
-    warnings = predictor.generate_warnings(features, risk_score)
-    recommendations = predictor.generate_recommendations(features, warnings)
-    feature_importance = predictor.get_feature_importance()
+    history = {project_id: ([], []) for project_id in project_ids}
+    for statement in statements:
+        for row in db.session.execute(statement):
+            timestamps, rows = history[row[0]]
+            timestamps.append(row[1])
+            rows.append(row[2:])
+    
+    if max_points:
+        for timestamps, rows in history.values():
+            timestamps.reverse()
+            rows.reverse()
+    return history
+
+
+def feature_trend_labels(projects, rows, risk_scores):
+    """Per-feature trend label for each project, with the new point appended to its history"""
+    # Labels follow the recent analyses only: two rolling windows, not the whole TREND_WINDOW_DAYS
+    # history GET /trends reads, so a write costs the same however long the project has existed
+    window = app.config['TREND_ROLLING_WINDOW']
+    since = datetime.utcnow() - timedelta(days=app.config['TREND_WINDOW_DAYS'])
+    history = load_metric_history([project.id for project in projects], since, max_points=2 * window)
+    
+    labels = []
+    for project, features, risk_score in zip(projects, rows, risk_scores):
+        timestamps, values = history[project.id]
+        point = list(feature_columns(features).values()) + [risk_score]
+        days, matrix = as_history(timestamps + [datetime.utcnow()], values + [point])
+        trends = compute_trends(days, matrix, window=window)
+        labels.append({item['name']: item['trend'] for item in trends})
+    return labels
+
+
+def record_analysis(model, project, metrics, result, trend_labels=None):
+    """Add the Analysis/Warning rows and project update to the session (no commit)"""
+    risk_score = result['risk_score']
+    risk_level = result['risk_level']
+    warnings = result['warnings']
+    features = extract_features(metrics)
+    
+    # Inputs unlike the training data make the score less reliable
+    drift_alerts = model.drift_monitor.observe(features) if model.drift_monitor is not None else []
+    
+    # Trends read the stored history, so compute them before adding this analysis
+    if trend_labels is None:
+        trend_labels = feature_trend_labels([project], [features], [risk_score])[0]
+    feature_importance = [
+        dict(item, trend=trend_labels.get(item['feature'].lower().replace(' ', '_'), 'stable'))
+        for item in result['feature_importance']
+    ]
     
     # Create analysis record
     analysis = Analysis(
-        project_id=project_id,
+        project_id=project.id,
         risk_score=risk_score,
         risk_level=risk_level,
+        model_version=model.model_version,
         metrics=metrics,
         feature_importance=feature_importance,
+        contributions=result.get('contributions'),
         warnings=warnings,
-        recommendations=recommendations
+        recommendations=result['recommendations'],
+        **feature_columns(features)
     )
     
     db.session.add(analysis)
     
     # Update project
+    deltas = Counter(project_stat_deltas(project, sign=-1))
     project.risk_score = risk_score
     project.risk_level = risk_level
     project.last_analyzed = datetime.utcnow()
+    deltas.update(project_stat_deltas(project))
     
     # Create warning records for high severity issues
     if risk_level == 'high':
         for warning_msg in warnings[:2]:  # Top 2 warnings
             warning = Warning(
-                project_id=project_id,
+                project_id=project.id,
                 severity='critical' if risk_score > 80 else 'high',
                 message=warning_msg
             )
             db.session.add(warning)
+            deltas['active_warnings'] += 1
+    
+    # Drift is a property of the model's traffic, not of this project: report it to operators only
+    for feature, psi in drift_alerts:
+        drift_alerts_counter.inc(feature=feature)
+        app.logger.warning(
+            f"Input drift in {feature} (PSI {psi:.2f}): recent metrics differ from the training data of "
+            f"model {model.model_version}, so risk scores may be less reliable"
+        )
+    
+    adjust_user_stats(project.user_id, deltas)
+    return analysis
+
+
+def run_analysis(project, metrics):
+    """Predict and add the analysis for one project to the session (no commit)"""
+    features = extract_features(metrics)
     
+    # Predict risk with a stable reference in case the model is hot-swapped
+    model = predictor
+    result = analyze_features(model, features)
+    
+    return record_analysis(model, project, metrics, result)
+
+
+def commit_analysis_batch(items):
+    """Record and commit (project_id, metrics, model, result) items in one transaction; returns their dicts"""
+    analyses = []
+    for project_id, metrics, model, result in items:
+        project = db.session.get(Project, project_id)
+        if project is None:
+            raise LookupError(f'Project {project_id} not found')
+        analyses.append(record_analysis(model, project, metrics, result))
+    
+    # Flush to assign ids, serialize before commit expires the objects
+    db.session.flush()
+    results = [analysis.to_dict() for analysis in analyses]
+    db.session.commit()
+    group_commit_size.observe(len(items))
+    return results
+
+
+group_committer = GroupCommitter(
+    app,
+    apply_batch=commit_analysis_batch,
+    apply_one=lambda item: commit_analysis_batch([item])[0],
+    window=app.config['ANALYSIS_GROUP_COMMIT_WINDOW_MS'] / 1000.0,
+    max_batch=app.config['ANALYSIS_GROUP_COMMIT_MAX_BATCH']
+) if app.config['ANALYSIS_GROUP_COMMIT'] else None
+
+
+def is_project_id(value):
+    """Whether a JSON value can be a project id (bool is an int subclass, so exclude it)"""
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+@app.route('/api/analyze', methods=['POST'])
+@jwt_required()
+def analyze_project():
+    """Run ML analysis on project data"""
+    user_id = get_jwt_identity()
+    data = request.get_json()
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    
+    project_id = data.get('project_id')
+    if not project_id:
+        return jsonify({'error': 'Project ID required'}), 400
+    if not is_project_id(project_id):
+        return jsonify({'error': 'Project ID must be an integer'}), 400
+    
+    project = Project.query.filter_by(id=project_id, user_id=user_id).first()
+    if not project:
+        return jsonify({'error': 'Project not found'}), 404
+    
+    # Extract metrics from data
+    metrics = data.get('metrics', {})
+    try:
+        features = [float(value) for value in extract_features(metrics)]
+    except (AttributeError, TypeError, ValueError):
+        return jsonify({'error': 'Metrics must be numeric'}), 400
+    
+    if wants_async(data):
+        return enqueue_job(user_id, 'analyze', {'project_id': project.id, 'metrics': metrics})
+    
+    if group_committer is not None:
+        # Predict here, write in the committer's next shared transaction
+        model = predictor
+        result = analyze_features(model, features)
+        try:
+            analysis = group_committer.submit((project.id, metrics, model, result))
+        except LookupError:
+            return jsonify({'error': 'Project not found'}), 404
+        return jsonify({'message': 'Analysis completed successfully', 'analysis': analysis}), 200
+    
+    analysis = run_analysis(project, metrics)
     db.session.commit()
     
     return jsonify({
@@ -532,35 +1320,267 @@ def analyze_project():
     }), 200
 
 
+@app.route('/api/analyze/batch', methods=['POST'])
+@jwt_required()
+def analyze_projects_batch():
+    """Run ML analysis on many projects in one request and one transaction"""
+    user_id = get_jwt_identity()
+    data = request.get_json()
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Request body must be a JSON object'}), 400
+    
+    items = data.get('items')
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'A non-empty list of items is required'}), 400
+    
+    if len(items) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'Batch size exceeds the maximum of {MAX_BATCH_SIZE}'}), 400
+    
+    # Load every referenced project with a single query
+    requested_ids = {
+        item.get('project_id') for item in items
+        if isinstance(item, dict) and is_project_id(item.get('project_id'))
+    }
+    projects = {
+        p.id: p for p in Project.query.filter(
+            Project.id.in_(requested_ids), Project.user_id == user_id
+        ).all()
+    } if requested_ids else {}
+    
+    results = [None] * len(items)
+    accepted = []  # (index, project, metrics)
+    rows = []
+    
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[index] = {'index': index, 'error': 'Item must be an object'}
+            continue
+        
+        project_id = item.get('project_id')
+        if not project_id:
+            results[index] = {'index': index, 'error': 'Project ID required'}
+            continue
+        
+        if not is_project_id(project_id):
+            results[index] = {'index': index, 'error': 'Project ID must be an integer'}
+            continue
+        
+        project = projects.get(project_id)
+        if not project:
+            results[index] = {'index': index, 'project_id': project_id, 'error': 'Project not found'}
+            continue
+        
+        metrics = item.get('metrics', {})
+        try:
+            features = [float(value) for value in extract_features(metrics)]
+        except (AttributeError, TypeError, ValueError):
+            results[index] = {'index': index, 'project_id': project_id, 'error': 'Metrics must be numeric'}
+            continue
+        
+        accepted.append((index, project, metrics))
+        rows.append(features)
+    
+    if accepted:
+        model = predictor
+        analysis_results = analyze_features_batch(model, rows)
+        
+        # One history query for every project's trend labels
+        trend_labels = feature_trend_labels(
+            [project for _, project, _ in accepted], rows, [result['risk_score'] for result in analysis_results]
+        )
+        
+        analyses = []
+        for (index, project, metrics), result, labels in zip(accepted, analysis_results, trend_labels):
+            analyses.append((index, record_analysis(model, project, metrics, result, labels)))
+        
+        # Flush to assign ids, serialize before commit expires the objects
+        db.session.flush()
+        for index, analysis in analyses:
+            results[index] = {'index': index, 'project_id': analysis.project_id, 'analysis': analysis.to_dict()}
+        
+        db.session.commit()
+    
+    succeeded = len(accepted)
+    return jsonify({
+        'message': 'Batch analysis completed',
+        'succeeded': succeeded,
+        'failed': len(items) - succeeded,
+        'results': results
+    }), 200
+
+
+# Page size for listings (?limit=), and the most a client may ask for
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(row):
+    """Opaque keyset cursor pointing just past row in (timestamp, id) order"""
+    return base64.urlsafe_b64encode(f'{row.timestamp.isoformat()}|{row.id}'.encode()).decode()
+
+
+def decode_cursor(value):
+    try:
+        timestamp, row_id = base64.urlsafe_b64decode(value.encode()).decode().split('|')
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
+
+
+def parse_datetime_arg(name):
+    """ISO 8601 query argument as naive UTC, or None"""
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f'Invalid {name} timestamp')
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def filter_listing(query, model):
+    """Apply ?since/until/after to a listing query"""
+    since, until = parse_datetime_arg('since'), parse_datetime_arg('until')
+    if since is not None:
+        query = query.filter(model.timestamp >= since)
+    if until is not None:
+        query = query.filter(model.timestamp < until)
+    if request.args.get('after'):
+        # Keyset condition: strictly older than the last row of the previous page
+        query = query.filter(db.tuple_(model.timestamp, model.id) < decode_cursor(request.args['after']))
+    return query
+
+
+def paginate(query, model):
+    """Apply ?since/until/after/limit to a listing, newest first; returns (rows, next cursor)"""
+    limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    if limit < 1:
+        raise ValueError('limit must be positive')
+    limit = min(limit, MAX_PAGE_SIZE)
+    
+    query = filter_listing(query, model)
+    rows = query.order_by(model.timestamp.desc(), model.id.desc()).limit(limit + 1).all()
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+# Keys of each model's to_dict(), selected as columns for NDJSON listings
+PROJECT_FIELDS = ('id', 'name', 'description', 'repository', 'risk_score', 'risk_level', 'created_at', 'last_analyzed')
+ANALYSIS_FIELDS = ('id', 'project_id', 'timestamp', 'risk_score', 'risk_level', 'model_version', 'metrics',
+                   'feature_importance', 'contributions', 'warnings', 'recommendations')
+WARNING_FIELDS = ('id', 'project_id', 'severity', 'message', 'timestamp', 'acknowledged')
+
+
+def wants_ndjson():
+    """Whether the client prefers newline-delimited JSON (Accept: application/x-ndjson)"""
+    return request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson']) == 'application/x-ndjson'
+
+
+def stream_ndjson(query, fields):
+    """Stream one JSON object per row of query, fetched through a server-side cursor (constant memory)"""
+    model = query.column_descriptions[0]['entity']
+    statement = query.with_entities(*[getattr(model, name) for name in fields]).statement
+    chunk_size = app.config['EXPORT_CHUNK_SIZE']
+    dumps_line = app.json.dumps_line
+    
+    def generate():
+        result = db.session.execute(statement.execution_options(stream_results=True, yield_per=chunk_size))
+        for rows in result.partitions():
+            # Datetimes are written as ISO 8601 by the JSON provider
+            yield b''.join(dumps_line(dict(zip(fields, row))) for row in rows)
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
+def stream_listing(query, model, fields):
+    """NDJSON form of a paginated listing: every matching row newest first (?limit optional)"""
+    query = filter_listing(query, model).order_by(model.timestamp.desc(), model.id.desc())
+    limit = request.args.get('limit', type=int)
+    if limit is not None:
+        if limit < 1:
+            raise ValueError('limit must be positive')
+        query = query.limit(limit)
+    return stream_ndjson(query, fields)
+
+
 @app.route('/api/projects/<int:project_id>/analyses', methods=['GET'])
 @jwt_required()
 def get_project_analyses(project_id):
-    """Get all analyses for a project"""
+    """Get a page of analyses for a project"""
     user_id = get_jwt_identity()
     project = Project.query.filter_by(id=project_id, user_id=user_id).first()
     
     if not project:
         return jsonify({'error': 'Project not found'}), 404
     
-    analyses = Analysis.query.filter_by(project_id=project_id).order_by(Analysis.timestamp.desc()).all()
+    try:
+        if wants_ndjson():
+            return stream_listing(Analysis.query.filter_by(project_id=project_id), Analysis, ANALYSIS_FIELDS)
+        analyses, next_cursor = paginate(Analysis.query.filter_by(project_id=project_id), Analysis)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify({
-        'analyses': [a.to_dict() for a in analyses]
+        'analyses': [a.to_dict() for a in analyses],
+        'next_cursor': next_cursor
+    }), 200
+
+
+@app.route('/api/projects/<int:project_id>/trends', methods=['GET'])
+@jwt_required()
+def get_project_trends(project_id):
+    """Per-feature and risk score trends over a project's analysis history"""
+    user_id = get_jwt_identity()
+    project = Project.query.filter_by(id=project_id, user_id=user_id).first()
+    
+    if not project:
+        return jsonify({'error': 'Project not found'}), 404
+    
+    # ?days=0 reads the whole history (newest TREND_MAX_POINTS analyses)
+    days = request.args.get('days', app.config['TREND_WINDOW_DAYS'], type=int)
+    window = request.args.get('window', app.config['TREND_ROLLING_WINDOW'], type=int)
+    since = datetime.utcnow() - timedelta(days=days) if days and days > 0 else None
+    
+    timestamps, values = load_metric_history([project.id], since, app.config['TREND_MAX_POINTS'])[project.id]
+    span, matrix = as_history(timestamps, values)
+    
+    return jsonify({
+        'project_id': project.id,
+        'analyses': len(timestamps),
+        'points': len(span),  # analyses with every metric present
+        'since': timestamps[0].isoformat() if timestamps else None,
+        'until': timestamps[-1].isoformat() if timestamps else None,
+        'trends': compute_trends(span, matrix, window=max(window or 1, 1))
     }), 200
 
 
 @app.route('/api/warnings', methods=['GET'])
 @jwt_required()
 def get_warnings():
-    """Get all warnings for user's projects"""
+    """Get a page of warnings for user's projects"""
     user_id = get_jwt_identity()
-    user_projects = Project.query.filter_by(user_id=user_id).all()
-    project_ids = [p.id for p in user_projects]
+    query = Warning.query.join(Project).filter(Project.user_id == user_id)
     
-    warnings = Warning.query.filter(Warning.project_id.in_(project_ids)).order_by(Warning.timestamp.desc()).all()
+    if request.args.get('project_id'):
+        query = query.filter(Warning.project_id == request.args.get('project_id', type=int))
+    if request.args.get('severity'):
+        query = query.filter(Warning.severity.in_(request.args['severity'].split(',')))
+    if request.args.get('acknowledged'):
+        query = query.filter(Warning.acknowledged == (request.args['acknowledged'] in ('1', 'true')))
+    
+    try:
+        if wants_ndjson():
+            return stream_listing(query, Warning, WARNING_FIELDS)
+        warnings, next_cursor = paginate(query, Warning)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify({
-        'warnings': [w.to_dict() for w in warnings]
+        'warnings': [w.to_dict() for w in warnings],
+        'next_cursor': next_cursor
     }), 200
 
 
@@ -573,6 +1593,8 @@ def acknowledge_warning(warning_id):
     if not warning:
         return jsonify({'error': 'Warning not found'}), 404
     
+    if not warning.acknowledged:
+        adjust_user_stats(warning.project.user_id, {'active_warnings': -1})
     warning.acknowledged = True
     db.session.commit()
     
@@ -583,86 +1605,553 @@ def acknowledge_warning(warning_id):
 # GITHUB INTEGRATION
 # ============================================================================
 
+def github_resource(url):
+    """Low-cardinality metric label for a GitHub API URL (repo, commits, commit, issues, ...)"""
+    path = url[len(github_client.base_url):] if url.startswith(github_client.base_url) else url
+    parts = path.split('?')[0].strip('/').split('/')
+    if parts[0] != 'repos' or len(parts) < 3:
+        return parts[0] or 'root'
+    if len(parts) == 3:
+        return 'repo'
+    if parts[3] == 'commits' and len(parts) == 5:
+        return 'commit'
+    return parts[3]
+
+
+def observe_github_call(url, status, seconds):
+    """Record one GitHub API attempt and the rate-limit budget it left"""
+    if not app.config['METRICS_ENABLED']:
+        return
+    github_call_latency.observe(seconds, resource=github_resource(url), status=status or 'error')
+    remaining = github_client.rate_limit_status()['remaining']
+    if remaining is not None:
+        github_rate_limit_remaining.set(remaining)
+
+
+github_client = GitHubClient(
+    base_url=app.config['GITHUB_API_URL'],
+    token=app.config['GITHUB_TOKEN'],
+    timeout=app.config['GITHUB_TIMEOUT'],
+    max_retries=app.config['GITHUB_MAX_RETRIES'],
+    cache=ResponseCache(
+        app.config['GITHUB_CACHE_PATH'], max_bytes=int(app.config['GITHUB_CACHE_MAX_MB'] * 2**20)
+    ) if app.config['GITHUB_CACHE_PATH'] else None,
+    observer=observe_github_call
+)
+
+
+def parse_repository_url(repo_url):
+    """Return (owner, repo) from a repository URL, or None if it is invalid"""
+    # Expected format: https://github.com/owner/repo
+    parts = repo_url.rstrip('/').split('/')
+    if len(parts) < 2:
+        return None
+    return parts[-2], parts[-1]
+
+
+def fetch_repository_metrics(repo_url, project=None):
+    """Sync a repository (incrementally if the project has a cursor) and return its metrics"""
+    owner, repo = parse_repository_url(repo_url)
+    
+    sync = project.repository_sync if project is not None else None
+    # A changed repository URL starts from scratch
+    state = sync.state if sync is not None and sync.repository == repo_url else None
+    
+    metrics, repo_data, state, summary = sync_repository(
+        github_client, owner, repo, state,
+        window_days=app.config['GITHUB_METRICS_WINDOW_DAYS'],
+        max_pages=app.config['GITHUB_MAX_PAGES'],
+        max_commit_details=app.config['GITHUB_MAX_COMMIT_DETAILS']
+    )
+    
+    if project is not None:
+        if sync is None:
+            sync = RepositorySync(project_id=project.id)
+            db.session.add(sync)
+        sync.repository = repo_url
+        sync.state = state
+        sync.commits_cursor = state['commits_cursor']
+        sync.issues_cursor = state['issues_cursor']
+        sync.synced_at = datetime.utcnow()
+    
+    return metrics, repo_data, summary
+
+
+def github_result(metrics, repo_data, summary):
+    """Response body for a repository sync"""
+    return {
+        'metrics': metrics,
+        'sync': summary,
+        'repository_info': {
+            'name': repo_data.get('name'),
+            'description': repo_data.get('description'),
+            'stars': repo_data.get('stargazers_count'),
+            'forks': repo_data.get('forks_count')
+        }
+    }
+
+
 @app.route('/api/github/analyze', methods=['POST'])
 @jwt_required()
 def analyze_github_repo():
     """Fetch and analyze GitHub repository data"""
+    user_id = get_jwt_identity()
     data = request.get_json()
     repo_url = data.get('repository')
     
     if not repo_url:
         return jsonify({'error': 'Repository URL required'}), 400
     
-    # Extract owner and repo from URL
-    # Expected format: https://github.com/owner/repo
-    parts = repo_url.rstrip('/').split('/')
-    if len(parts) < 2:
+    if parse_repository_url(repo_url) is None:
         return jsonify({'error': 'Invalid repository URL'}), 400
     
-    owner = parts[-2]
-    repo = parts[-1]
+    # With a project, the sync cursor is stored so the next call only fetches new data
+    project = None
+    if data.get('project_id'):
+        project = Project.query.filter_by(id=data['project_id'], user_id=user_id).first()
+        if not project:
+            return jsonify({'error': 'Project not found'}), 404
     
-    # GitHub API token (should be set in environment)
-    github_token = os.environ.get('GITHUB_TOKEN')
-    headers = {'Authorization': f'token {github_token}'} if github_token else {}
+    if wants_async(data):
+        # The job also runs and stores the analysis when a project is given
+        return enqueue_job(user_id, 'github_analyze', {
+            'repository': repo_url,
+            'project_id': project.id if project else None
+        })
     
     try:
-        # Fetch repository data
-        repo_response = requests.get(
-            f'https://api.github.com/repos/{owner}/{repo}',
-            headers=headers
-        )
-        
-        # Fetch commits
-        commits_response = requests.get(
-            f'https://api.github.com/repos/{owner}/{repo}/commits',
-            headers=headers
-        )
-        
-        # Fetch issues
-        issues_response = requests.get(
-            f'https://api.github.com/repos/{owner}/{repo}/issues?state=all',
-            headers=headers
-        )
-        
-        # Fetch contributors
-        contributors_response = requests.get(
-            f'https://api.github.com/repos/{owner}/{repo}/contributors',
-            headers=headers
-        )
-        
-        # Calculate metrics
-        repo_data = repo_response.json()
-        commits_data = commits_response.json() if commits_response.status_code == 200 else []
-        issues_data = issues_response.json() if issues_response.status_code == 200 else []
-        contributors_data = contributors_response.json() if contributors_response.status_code == 200 else []
-        
-        open_issues = len([i for i in issues_data if i.get('state') == 'open'])
-        closed_issues = len([i for i in issues_data if i.get('state') == 'closed'])
-        
-        metrics = {
-            'commit_frequency': min(len(commits_data) / 7, 10),  # Commits per day (simplified)
-            'contributor_activity': min((len(contributors_data) / 5) * 100, 100),
-            'issue_resolution_time': 7.0,  # Would need more complex calculation
-            'code_churn': 200,  # Would need commit diff analysis
-            'open_issues_ratio': open_issues / max(open_issues + closed_issues, 1)
-        }
+        metrics, repo_data, summary = fetch_repository_metrics(repo_url, project)
+        db.session.commit()
         
         return jsonify({
             'message': 'GitHub data fetched successfully',
-            'metrics': metrics,
-            'repository_info': {
-                'name': repo_data.get('name'),
-                'description': repo_data.get('description'),
-                'stars': repo_data.get('stargazers_count'),
-                'forks': repo_data.get('forks_count')
-            }
+            **github_result(metrics, repo_data, summary)
         }), 200
         
+    except GitHubRateLimitError as e:
+        db.session.rollback()
+        response = jsonify({'error': str(e)})
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response, 429
+        
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': f'Failed to fetch GitHub data: {str(e)}'}), 500
 
 
+@app.route('/api/github/stats', methods=['GET'])
+@jwt_required()
+def get_github_stats():
+    """GitHub rate-limit budget and response cache counters for this worker"""
+    return jsonify({
+        'rate_limit': github_client.rate_limit_status(),
+        'cache': github_client.cache.stats() if github_client.cache else None
+    }), 200
+
+
+# ============================================================================
+# BACKGROUND JOBS
+# ============================================================================
+
+def wants_async(data):
+    """Whether the client asked for the job mode (?async=1 or "async": true)"""
+    return bool(data.get('async')) or request.args.get('async') in ('1', 'true')
+
+
+def enqueue_job(user_id, kind, payload):
+    """Store a queued job and return the 202 response pointing at it"""
+    job = Job(user_id=user_id, kind=kind, payload=payload, status='queued', stage='queued')
+    db.session.add(job)
+    db.session.commit()
+    
+    job_workers.start()
+    job_workers.notify()
+    
+    response = jsonify({'message': 'Job queued', 'job_id': job.id, 'status_url': f'/api/jobs/{job.id}'})
+    response.headers['Location'] = f'/api/jobs/{job.id}'
+    return response, 202
+
+
+def claim_next_job(worker_name):
+    """Atomically move the oldest runnable queued job to running"""
+    now = datetime.utcnow()
+    candidates = Job.query.with_entities(Job.id).filter(
+        Job.status == 'queued',
+        db.or_(Job.run_after.is_(None), Job.run_after <= now)
+    ).order_by(Job.id).limit(5).all()
+    
+    for (job_id,) in candidates:
+        # The status condition makes the claim safe across threads and processes
+        claimed = Job.query.filter_by(id=job_id, status='queued').update({
+            'status': 'running',
+            'worker': worker_name,
+            'attempts': Job.attempts + 1,
+            'started_at': now,
+            'heartbeat_at': now
+        }, synchronize_session=False)
+        db.session.commit()
+        if claimed:
+            return db.session.get(Job, job_id)
+    return None
+
+
+def set_job_stage(job, stage):
+    job.stage = stage
+    job.heartbeat_at = datetime.utcnow()
+    db.session.commit()
+
+
+def run_job(job):
+    """Execute a claimed job: fetch -> predict -> persist"""
+    payload = job.payload
+    project = None
+    if payload.get('project_id'):
+        project = Project.query.filter_by(id=payload['project_id'], user_id=job.user_id).first()
+        if not project:
+            raise ValueError('Project not found')
+    
+    if job.kind == 'analyze':
+        set_job_stage(job, 'predicting')
+        analysis = run_analysis(project, payload.get('metrics', {}))
+        set_job_stage(job, 'persisting')
+        db.session.flush()
+        return {'analysis': analysis.to_dict()}
+    
+    if job.kind == 'github_analyze':
+        set_job_stage(job, 'fetching')
+        metrics, repo_data, summary = fetch_repository_metrics(payload['repository'], project)
+        result = github_result(metrics, repo_data, summary)
+        if project is not None:
+            set_job_stage(job, 'predicting')
+            analysis = run_analysis(project, metrics)
+            set_job_stage(job, 'persisting')
+            db.session.flush()
+            result['analysis'] = analysis.to_dict()
+        return result
+    
+    raise ValueError(f'Unknown job kind: {job.kind}')
+
+
+def process_next_job(worker_name):
+    """Claim and run one job; returns False when the queue is empty"""
+    job = claim_next_job(worker_name)
+    if job is None:
+        return False
+    
+    try:
+        result = run_job(job)
+        job.status = 'succeeded'
+        job.result = result
+    except GitHubRateLimitError as e:
+        # Not the job's fault: retry once the budget resets, without using up an attempt
+        db.session.rollback()
+        job.status = 'queued'
+        job.stage = 'queued'
+        job.attempts -= 1
+        job.run_after = datetime.utcfromtimestamp(e.reset_at)
+        job.error = str(e)
+        db.session.commit()
+        return True
+    except Exception as e:
+        db.session.rollback()
+        app.logger.exception(f'Job {job.id} failed')
+        job.status = 'failed'
+        job.error = str(e)
+    
+    job.stage = 'done'
+    job.finished_at = datetime.utcnow()
+    job.heartbeat_at = job.finished_at
+    db.session.commit()
+    return True
+
+
+def requeue_stale_jobs():
+    """Requeue running jobs whose worker stopped sending heartbeats"""
+    cutoff = datetime.utcnow() - timedelta(seconds=app.config['JOB_LEASE_SECONDS'])
+    stale = Job.query.filter(Job.status == 'running', Job.heartbeat_at < cutoff).all()
+    for job in stale:
+        if job.attempts >= app.config['JOB_MAX_ATTEMPTS']:
+            job.status = 'failed'
+            job.stage = 'done'
+            job.error = 'Worker stopped responding'
+            job.finished_at = datetime.utcnow()
+        else:
+            job.status = 'queued'
+            job.stage = 'queued'
+    db.session.commit()
+    return len(stale)
+
+
+job_workers = JobWorkerPool(
+    app, process_next_job,
+    workers=app.config['JOB_WORKERS'],
+    poll_interval=app.config['JOB_POLL_INTERVAL']
+)
+
+
+@app.before_request
+def start_job_workers():
+    """Start this process's job workers (threads do not survive a gunicorn fork)"""
+    if app.config['JOB_WORKERS'] > 0 and not job_workers.running:
+        try:
+            requeue_stale_jobs()
+        except Exception as e:
+            # e.g. tables not created yet; never block the request on this
+            db.session.rollback()
+            app.logger.warning(f'Could not requeue stale jobs: {e}')
+        job_workers.start()
+
+
+@app.route('/api/jobs/<int:job_id>', methods=['GET'])
+@jwt_required()
+def get_job(job_id):
+    """Get the status, progress and result of a background job"""
+    user_id = get_jwt_identity()
+    job = Job.query.filter_by(id=job_id, user_id=user_id).first()
+    
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return jsonify({'job': job.to_dict()}), 200
+
+
+# ============================================================================
+# SCHEDULED RE-ANALYSIS
+# ============================================================================
+
+def pending_scheduled_jobs():
+    """Queued or running scheduler jobs"""
+    return Job.query.filter(Job.origin == 'scheduler', Job.status.in_(('queued', 'running')))
+
+
+def list_scan_candidates(cutoff):
+    """(id, last_analyzed, risk_level) of repository projects not analyzed since cutoff"""
+    # Skip projects already queued, and back off from ones whose last scan failed
+    failed_since = datetime.utcnow() - timedelta(hours=app.config['SCHEDULER_MIN_AGE_HOURS'])
+    skip = Job.query.with_entities(Job.payload).filter(
+        Job.origin == 'scheduler',
+        db.or_(
+            Job.status.in_(('queued', 'running')),
+            db.and_(Job.status == 'failed', Job.finished_at >= failed_since)
+        )
+    )
+    pending = {payload.get('project_id') for (payload,) in skip}
+    rows = Project.query.with_entities(Project.id, Project.last_analyzed, Project.risk_level).filter(
+        Project.repository.isnot(None),
+        Project.repository != '',
+        db.or_(Project.last_analyzed.is_(None), Project.last_analyzed <= cutoff)
+    ).all()
+    return [tuple(row) for row in rows if row.id not in pending]
+
+
+def enqueue_scans(project_ids):
+    """Queue a GitHub sync + analysis job for each project"""
+    projects = Project.query.filter(Project.id.in_(project_ids)).all()
+    for project in projects:
+        db.session.add(Job(
+            user_id=project.user_id,
+            kind='github_analyze',
+            origin='scheduler',
+            status='queued',
+            stage='queued',
+            payload={'repository': project.repository, 'project_id': project.id}
+        ))
+    db.session.commit()
+    job_workers.notify()
+
+
+def scan_budget():
+    """GitHub budget left after the calls queued scheduler jobs will still make"""
+    status = github_client.rate_limit_status()
+    if status['remaining'] is None or (status['reset'] and status['reset'] < time.time()):
+        status = github_client.refresh_rate_limit()
+    if status['remaining'] is None:
+        return None, None, None
+    
+    promised = pending_scheduled_jobs().filter(Job.status == 'queued').count()
+    remaining = status['remaining'] - promised * app.config['SCHEDULER_CALLS_PER_SYNC']
+    return status['limit'], max(remaining, 0), status['reset']
+
+
+scan_scheduler = ScanScheduler(
+    app, list_scan_candidates, enqueue_scans, scan_budget,
+    interval=app.config['SCHEDULER_INTERVAL'],
+    min_age_hours=app.config['SCHEDULER_MIN_AGE_HOURS'],
+    calls_per_sync=app.config['SCHEDULER_CALLS_PER_SYNC'],
+    reserve=app.config['SCHEDULER_RATE_RESERVE'],
+    max_per_tick=app.config['SCHEDULER_MAX_PER_TICK']
+)
+
+
+@app.before_request
+def start_scan_scheduler():
+    """Start the in-process scheduler when enabled (run it in one process only)"""
+    if app.config['SCHEDULER_ENABLED'] and not scan_scheduler.running:
+        scan_scheduler.start()
+
+
+@app.route('/api/scheduler/stats', methods=['GET'])
+@jwt_required()
+def get_scheduler_stats():
+    """Scheduler throughput, backlog and analysis lag"""
+    now = datetime.utcnow()
+    hour_ago = now - timedelta(hours=1)
+    
+    finished = Job.query.with_entities(Job.status, Job.started_at, Job.finished_at).filter(
+        Job.origin == 'scheduler', Job.finished_at >= hour_ago
+    ).all()
+    durations = [(f - s).total_seconds() for _, s, f in finished if s and f]
+    oldest_queued = pending_scheduled_jobs().filter(Job.status == 'queued').with_entities(
+        db.func.min(Job.created_at)
+    ).scalar()
+    
+    last_analyzed = [
+        row.last_analyzed for row in Project.query.with_entities(Project.last_analyzed).filter(
+            Project.repository.isnot(None), Project.repository != ''
+        )
+    ]
+    lag_hours = sorted((now - ts).total_seconds() / 3600 for ts in last_analyzed if ts is not None)
+    due = scan_scheduler.due(list_scan_candidates(scan_scheduler.cutoff(now)), now)
+    
+    return jsonify({
+        'throughput': {
+            'succeeded_last_hour': sum(1 for status, _, _ in finished if status == 'succeeded'),
+            'failed_last_hour': sum(1 for status, _, _ in finished if status == 'failed'),
+            'avg_job_seconds': round(float(np.mean(durations)), 3) if durations else None
+        },
+        'backlog': {
+            'due_projects': len(due),
+            'queued_jobs': pending_scheduled_jobs().filter(Job.status == 'queued').count(),
+            'running_jobs': pending_scheduled_jobs().filter(Job.status == 'running').count(),
+            'oldest_queued_seconds': (now - oldest_queued).total_seconds() if oldest_queued else None
+        },
+        'lag_hours': {
+            'projects': len(last_analyzed),
+            'never_analyzed': len(last_analyzed) - len(lag_hours),
+            'p50': round(float(np.percentile(lag_hours, 50)), 2) if lag_hours else None,
+            'p95': round(float(np.percentile(lag_hours, 95)), 2) if lag_hours else None,
+            'max': round(lag_hours[-1], 2) if lag_hours else None
+        },
+        'scheduler': scan_scheduler.stats(),
+        'rate_limit': github_client.rate_limit_status()
+    }), 200
+
+
+# ============================================================================
+# ANALYSIS EXPORT / IMPORT
+# ============================================================================
+
+def analysis_export_query(user_id=None, project_id=None, since=None, until=None):
+    """Flat EXPORT_COLUMNS rows in id order, optionally for one user or project"""
+    query = db.select(*[getattr(Analysis, name) for name in EXPORT_COLUMNS]).order_by(Analysis.id)
+    if user_id is not None:
+        query = query.join(Project, Project.id == Analysis.project_id).where(Project.user_id == user_id)
+    if project_id is not None:
+        query = query.where(Analysis.project_id == project_id)
+    if since is not None:
+        query = query.where(Analysis.timestamp >= since)
+    if until is not None:
+        query = query.where(Analysis.timestamp < until)
+    return query
+
+
+def stream_export(query, writer):
+    """Encoded export chunks, fetched through a server-side cursor (constant memory)"""
+    chunk_size = app.config['EXPORT_CHUNK_SIZE']
+    result = db.session.execute(query.execution_options(stream_results=True, yield_per=chunk_size))
+    for rows in result.partitions():
+        data = writer.write([tuple(row) for row in rows])
+        if data:
+            yield data
+    yield writer.close()
+
+
+def import_analyses(records, project_ids):
+    """Insert records with one executemany per chunk, in the caller's transaction; returns (imported, errors)"""
+    chunk_size = app.config['EXPORT_CHUNK_SIZE']
+    imported, errors, chunk = 0, [], []
+    
+    for line, record in enumerate(records, start=1):
+        try:
+            row = import_row(record)
+            if row['project_id'] not in project_ids:
+                raise ValueError('Project not found')
+        except ValueError as e:
+            if len(errors) < 100:
+                errors.append({'record': line, 'error': str(e)})
+            continue
+        
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            db.session.execute(Analysis.__table__.insert(), chunk)
+            imported += len(chunk)
+            chunk = []
+    
+    if chunk:
+        db.session.execute(Analysis.__table__.insert(), chunk)
+        imported += len(chunk)
+    return imported, errors
+
+
+@app.route('/api/analyses/export', methods=['GET'])
+@jwt_required()
+def export_analyses():
+    """Stream the user's analysis history as NDJSON, CSV or Parquet"""
+    user_id = get_jwt_identity()
+    fmt = request.args.get('format', 'ndjson')
+    
+    if fmt not in FORMATS:
+        return jsonify({'error': f'format must be one of {", ".join(FORMATS)}'}), 400
+    
+    try:
+        query = analysis_export_query(
+            user_id=user_id,
+            project_id=request.args.get('project_id', type=int),
+            since=parse_datetime_arg('since'),
+            until=parse_datetime_arg('until')
+        )
+        writer = export_writer(fmt, app.json.dumps_line)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return Response(
+        stream_with_context(stream_export(query, writer)),
+        mimetype=FORMATS[fmt],
+        headers={'Content-Disposition': f'attachment; filename=analyses.{fmt}'}
+    )
+
+
+@app.route('/api/analyses/import', methods=['POST'])
+@jwt_required()
+def import_analyses_route():
+    """Bulk-load historical analyses for the user's projects from the request body"""
+    user_id = get_jwt_identity()
+    fmt = request.args.get('format', 'ndjson')
+    
+    if fmt not in FORMATS:
+        return jsonify({'error': f'format must be one of {", ".join(FORMATS)}'}), 400
+    
+    project_ids = {project_id for (project_id,) in db.session.query(Project.id).filter_by(user_id=user_id)}
+    
+    try:
+        if fmt == 'parquet':
+            # The Parquet footer is at the end, so the body must be seekable
+            with tempfile.TemporaryFile() as body:
+                while chunk := request.stream.read(1 << 20):
+                    body.write(chunk)
+                body.seek(0)
+                imported, errors = import_analyses(read_records(fmt, body), project_ids)
+        else:
+            imported, errors = import_analyses(read_records(fmt, request.stream), project_ids)
+    except ValueError as e:
+        # One transaction: an unreadable body imports nothing, so the request can simply be retried
+        db.session.rollback()
+        return jsonify({'error': f'Could not read {fmt} body: {e}', 'imported': 0}), 400
+    db.session.commit()
+    
+    return jsonify({'imported': imported, 'rejected': len(errors), 'errors': errors}), 200
+
+
 # ============================================================================
 # UTILITY ROUTES
 # ============================================================================
@@ -676,31 +2165,114 @@ def health_check():
     }), 200
 
 
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Request, inference, SQL and GitHub metrics in the Prometheus text format"""
+    if not app.config['METRICS_ENABLED']:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    
+    token = app.config['METRICS_TOKEN']
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return jsonify({'error': 'Invalid metrics token'}), 401
+    
+    return Response(metrics_registry.exposition(), mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/api/cache/stats', methods=['GET'])
+@jwt_required()
+def get_cache_stats():
+    """Prediction cache hit/miss counters for this worker"""
+    return jsonify(prediction_cache.stats()), 200
+
+
+@app.route('/api/model/drift', methods=['GET'])
+@jwt_required()
+def get_model_drift():
+    """Input drift of the served model's features as seen by this worker"""
+    model = predictor
+    if model.drift_monitor is None:
+        return jsonify({
+            'model_version': model.model_version,
+            'enabled': False,
+            'reason': 'No training reference' if model.drift_reference is None else 'Monitor disabled'
+        }), 200
+    
+    return jsonify({
+        'model_version': model.model_version,
+        'enabled': True,
+        'pid': os.getpid(),
+        **model.drift_monitor.snapshot()
+    }), 200
+
+
+# Summary counter for each risk level
+RISK_LEVEL_COUNTERS = {'low': 'low_risk', 'medium': 'medium_risk', 'high': 'high_risk'}
+
+
+def project_stat_deltas(project, sign=1):
+    """Contribution of one project to its owner's summary row"""
+    deltas = {'total_projects': sign, 'risk_score_sum': sign * (project.risk_score or 0.0)}
+    if project.risk_level in RISK_LEVEL_COUNTERS:
+        deltas[RISK_LEVEL_COUNTERS[project.risk_level]] = sign
+    return deltas
+
+
+def adjust_user_stats(user_id, deltas):
+    """Apply deltas to the user's summary row in the current transaction (no commit)"""
+    if not app.config['STATS_SUMMARY_ENABLED']:
+        return
+    values = {getattr(UserStats, name): getattr(UserStats, name) + delta for name, delta in deltas.items() if delta}
+    if values:
+        # No row yet: nothing to adjust, it is built from the source tables on first read
+        UserStats.query.filter_by(user_id=user_id).update(values, synchronize_session=False)
+
+
+def compute_user_stats(user_id):
+    """Aggregate a user's projects and active warnings in SQL"""
+    stats = UserStats(user_id=user_id, total_projects=0, risk_score_sum=0.0,
+                      low_risk=0, medium_risk=0, high_risk=0)
+    
+    rows = db.session.query(
+        Project.risk_level, db.func.count(Project.id), db.func.coalesce(db.func.sum(Project.risk_score), 0.0)
+    ).filter(Project.user_id == user_id).group_by(Project.risk_level).all()
+    for risk_level, count, score_sum in rows:
+        stats.total_projects += count
+        stats.risk_score_sum += score_sum
+        if risk_level in RISK_LEVEL_COUNTERS:
+            setattr(stats, RISK_LEVEL_COUNTERS[risk_level], count)
+    
+    stats.active_warnings = db.session.query(db.func.count(Warning.id)).join(Project).filter(
+        Project.user_id == user_id, Warning.acknowledged == False
+    ).scalar()
+    return stats
+
+
+def rebuild_user_stats(user_id):
+    """Replace the user's summary row with freshly aggregated values"""
+    stats = db.session.merge(compute_user_stats(user_id))
+    db.session.commit()
+    return stats
+
+
 @app.route('/api/stats', methods=['GET'])
 @jwt_required()
 def get_dashboard_stats():
     """Get dashboard statistics"""
     user_id = get_jwt_identity()
-    projects = Project.query.filter_by(user_id=user_id).all()
-    
-    total_projects = len(projects)
-    avg_risk = sum(p.risk_score for p in projects) / total_projects if total_projects > 0 else 0
     
-    risk_distribution = {
-        'low': len([p for p in projects if p.risk_level == 'low']),
-        'medium': len([p for p in projects if p.risk_level == 'medium']),
-        'high': len([p for p in projects if p.risk_level == 'high'])
-    }
+    if not app.config['STATS_SUMMARY_ENABLED']:
+        return jsonify(compute_user_stats(user_id).to_dict()), 200
     
-    project_ids = [p.id for p in projects]
-    warnings = Warning.query.filter(Warning.project_id.in_(project_ids), Warning.acknowledged == False).all()
+    stats = UserStats.query.filter_by(user_id=user_id).first()
+    if stats is None:
+        try:
+            stats = rebuild_user_stats(user_id)
+        except IntegrityError:
+            # Built concurrently by another request
+            db.session.rollback()
+            stats = UserStats.query.filter_by(user_id=user_id).first()
     
-    return jsonify({
-        'total_projects': total_projects,
-        'average_risk_score': round(avg_risk, 2),
-        'risk_distribution': risk_distribution,
-        'active_warnings': len(warnings)
-    }), 200
+    return jsonify(stats.to_dict()), 200
 
 
 # ============================================================================
@@ -711,9 +2283,35 @@ def get_dashboard_stats():
 def init_db():
     """Initialize the database"""
     db.create_all()
+    # create_all skips existing tables; add columns and indexes introduced since they were created
+    for table, column in add_missing_columns():
+        print(f"Added column {table}.{column}")
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
     print("Database initialized successfully!")
 
 
+def add_missing_columns():
+    """ALTER TABLE ... ADD COLUMN for nullable model columns missing from existing tables; returns them"""
+    inspector = sa_inspect(db.engine)
+    added = []
+    with db.engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                if not column.nullable:
+                    raise click.ClickException(
+                        f'{table.name}.{column.name} is missing and NOT NULL; migrate this table manually'
+                    )
+                column_type = column.type.compile(dialect=db.engine.dialect)
+                connection.execute(db.text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                added.append((table.name, column.name))
+    return added
+
+
 @app.cli.command()
 def seed_db():
     """Seed database with sample data"""
@@ -731,10 +2329,270 @@ def seed_db():
     print("Database seeded successfully!")
 
 
+@app.cli.command()
+@click.option('--chunk-size', default=1000, show_default=True, help='Rows updated per transaction')
+def backfill_metrics(chunk_size):
+    """Fill the typed metric columns of older analyses from their JSON metrics"""
+    last_id, filled = 0, 0
+    while True:
+        analyses = Analysis.query.filter(
+            Analysis.id > last_id, Analysis.commit_frequency.is_(None)
+        ).order_by(Analysis.id).limit(chunk_size).all()
+        if not analyses:
+            break
+        for analysis in analyses:
+            for name, value in feature_columns(extract_features(analysis.metrics or {})).items():
+                setattr(analysis, name, value)
+        last_id = analyses[-1].id
+        filled += len(analyses)
+        db.session.commit()
+    print(f"Backfilled metric columns of {filled} analyses")
+
+
+@app.cli.command('export-analyses')
+@click.option('--format', 'fmt', type=click.Choice(list(FORMATS)), default='ndjson', show_default=True)
+@click.option('--output', required=True, type=click.Path(dir_okay=False), help='File to write')
+@click.option('--user-id', type=int, help='Only this user\'s projects')
+@click.option('--project-id', type=int, help='Only this project')
+def export_analyses_command(fmt, output, user_id, project_id):
+    """Export the analysis history (constant memory)"""
+    try:
+        writer = export_writer(fmt, app.json.dumps_line)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    
+    size = 0
+    with open(output, 'wb') as f:
+        for data in stream_export(analysis_export_query(user_id=user_id, project_id=project_id), writer):
+            f.write(data)
+            size += len(data)
+    print(f"Wrote {size} bytes to {output}")
+
+
+@app.cli.command('import-analyses')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(list(FORMATS)), help='Defaults to the file extension')
+def import_analyses_command(path, fmt):
+    """Bulk-load historical analyses (batched executemany inserts, one transaction)"""
+    fmt = fmt or os.path.splitext(path)[1].lstrip('.').lower()
+    if fmt not in FORMATS:
+        raise click.ClickException(f'Cannot infer the format of {path}; pass --format')
+    
+    project_ids = {project_id for (project_id,) in db.session.query(Project.id)}
+    try:
+        with open(path, 'rb') as f:
+            imported, errors = import_analyses(read_records(fmt, f), project_ids)
+    except ValueError as e:
+        db.session.rollback()
+        raise click.ClickException(f'Could not read {path}: {e} (nothing imported)')
+    db.session.commit()
+    
+    for error in errors:
+        print(f"record {error['record']}: {error['error']}")
+    print(f"Imported {imported} analyses ({len(errors)} rejected)")
+
+
+@app.cli.command()
+def rebuild_stats():
+    """Recompute every user's dashboard summary row from the source tables"""
+    user_ids = [user_id for (user_id,) in db.session.query(User.id)]
+    for user_id in user_ids:
+        rebuild_user_stats(user_id)
+    print(f"Rebuilt dashboard stats for {len(user_ids)} users")
+
+
+@app.cli.command()
+@click.option('--workers', default=4, show_default=True, help='Worker threads')
+def run_jobs(workers):
+    """Run background job workers in the foreground"""
+    load_active_model()
+    requeue_stale_jobs()
+    pool = JobWorkerPool(app, process_next_job, workers=workers, poll_interval=app.config['JOB_POLL_INTERVAL'])
+    pool.start()
+    print(f"Running {workers} job workers (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pool.stop(timeout=30)
+
+
+@app.cli.command()
+@click.option('--workers', default=4, show_default=True, help='Job worker threads (0 = only enqueue)')
+@click.option('--once', is_flag=True, help='Run a single scheduling pass and exit')
+def run_scheduler(workers, once):
+    """Periodically re-analyze projects with a repository"""
+    if once:
+        print(scan_scheduler.tick())
+        return
+    
+    load_active_model()
+    requeue_stale_jobs()
+    pool = JobWorkerPool(app, process_next_job, workers=workers, poll_interval=app.config['JOB_POLL_INTERVAL'])
+    pool.start()
+    scan_scheduler.start()
+    print(f"Scheduling every {app.config['SCHEDULER_INTERVAL']:g}s with {workers} job workers (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        scan_scheduler.stop()
+        pool.stop(timeout=30)
+
+
+# ============================================================================
+# MODEL REGISTRY
+# ============================================================================
+
+def training_query():
+    """Complete feature rows with a label: 1 when the project's next analysis was high risk"""
+    # The label is the service's own later risk_level, not an independent outcome (see README "Training")
+    next_level = db.func.lead(Analysis.risk_level).over(
+        partition_by=Analysis.project_id, order_by=(Analysis.timestamp, Analysis.id)
+    )
+    history = db.select(
+        *[getattr(Analysis, name) for name in FEATURE_NAMES], next_level.label('next_level')
+    ).subquery()
+    # The latest analysis of each project has no outcome yet
+    return db.select(
+        *[history.c[name] for name in FEATURE_NAMES],
+        db.case((history.c.next_level == 'high', 1), else_=0)
+    ).where(history.c.next_level.isnot(None), *[history.c[name].isnot(None) for name in FEATURE_NAMES])
+
+
+def load_training_set(chunk_size):
+    """(X float32 N x 5, y) filled chunk by chunk from a server-side cursor"""
+    query = training_query()
+    total = db.session.execute(db.select(db.func.count()).select_from(query.subquery())).scalar()
+    X = np.empty((total, len(FEATURE_NAMES)), dtype=np.float32)
+    y = np.empty(total, dtype=np.int64)
+    
+    filled = 0
+    result = db.session.execute(query.execution_options(stream_results=True, yield_per=chunk_size))
+    for rows in result.partitions():
+        # Rows written after the count are left for the next run
+        chunk = np.array([tuple(row) for row in rows[:total - filled]], dtype=np.float64)
+        X[filled:filled + len(chunk)] = chunk[:, :-1]
+        y[filled:filled + len(chunk)] = chunk[:, -1]
+        filled += len(chunk)
+        if filled == total:
+            break
+    result.close()
+    return X[:filled], y[:filled]
+
+
+@app.cli.command()
+@click.option('--folds', default=5, show_default=True, help='Cross-validation folds (0 = skip)')
+@click.option('--n-jobs', default=-1, show_default=True, help='Cores to use (-1 = all)')
+@click.option('--chunk-size', default=10000, show_default=True, help='Rows fetched per database round trip')
+@click.option('--latency-budget-us', type=float, help='p50 single-row budget (default ENSEMBLE_LATENCY_BUDGET_US)')
+@click.option('--loss-tolerance', default=0.01, show_default=True,
+              help='Relative log-loss increase accepted for a faster ensemble')
+@click.option('--activate', is_flag=True, help='Make the new version active')
+@click.option('--json', 'json_path', type=click.Path(dir_okay=False), help='Also write the report to this file')
+def train(folds, n_jobs, chunk_size, latency_budget_us, loss_tolerance, activate, json_path):
+    """Train on the analysis history and publish a new model version"""
+    from training import StageProfiler, cross_validate, resolve_cores
+    profiler = StageProfiler()
+    
+    with profiler.stage('load'):
+        X, y = load_training_set(chunk_size)
+    if len(y) == 0 or y.min() == y.max():
+        raise click.ClickException(
+            f'Need analyses followed by both high and non-high risk analyses to train (found {len(y)} labeled rows)'
+        )
+    print(f"Loaded {len(y)} labeled analyses ({y.mean():.1%} positive) on {resolve_cores(n_jobs)} cores")
+    
+    scores, out_of_fold = None, None
+    if folds:
+        with profiler.stage('cv'):
+            try:
+                scores, out_of_fold = cross_validate(X, y, folds, n_jobs)
+            except ValueError as e:
+                raise click.ClickException(str(e))
+        print(f"{folds}-fold AUC {scores['auc']['mean']:.3f} +/- {scores['auc']['std']:.3f} "
+              f"(RF {scores['rf_auc']['mean']:.3f}, XGB {scores['xgb_auc']['mean']:.3f}), "
+              f"Brier {scores['brier']['mean']:.3f}")
+    
+    # Latencies are measured with the engine the workers will serve through
+    predictor = RiskPredictor(inference_engine=app.config['INFERENCE_ENGINE'])
+    with profiler.stage('fit'):
+        predictor.train_models(X, y, n_jobs=n_jobs)
+    
+    if out_of_fold is not None:
+        if latency_budget_us is None:
+            latency_budget_us = app.config['ENSEMBLE_LATENCY_BUDGET_US'] or None
+        probe = X[np.random.default_rng(42).choice(len(X), size=min(len(X), 200), replace=False)].astype(float)
+        with profiler.stage('select'):
+            ensemble = predictor.select_ensemble(*out_of_fold, y, probe, latency_budget_us, loss_tolerance)
+        for name, candidate in ensemble['candidates'].items():
+            marker = '*' if name == ensemble['selected'] else ' '
+            print(f"{marker} {name:<6} rf={candidate['weights']['rf']:.2f} log loss {candidate['log_loss']:.4f} "
+                  f"AUC {candidate['auc']:.3f} p50 {candidate['latency']['p50_us']:.0f}us")
+    else:
+        print("Cross-validation skipped: serving the equal-weight ensemble")
+    
+    with profiler.stage('publish'):
+        version = model_registry.save(predictor, metadata={
+            'label': 'next analysis of the project is high risk',
+            'label_source': 'risk_level scored by this service (rules or an earlier model), not an observed outcome',
+            'cross_validation': scores,
+            'n_jobs': resolve_cores(n_jobs),
+            # The publish stage itself is only in the printed report
+            'stages': list(profiler.stages)
+        })
+        if activate:
+            model_registry.activate(version)
+    
+    print(profiler.report())
+    print(f"Published model version {version}" + (" (active)" if activate else ""))
+    
+    if json_path:
+        with open(json_path, 'w') as f:
+            json.dump({'version': version, 'samples': len(y), 'cross_validation': scores,
+                       'ensemble': predictor.ensemble, 'stages': profiler.stages}, f, indent=2)
+
+
+@app.cli.command()
+def list_models():
+    """List stored model versions"""
+    active = model_registry.get_active_version()
+    versions = model_registry.list_versions()
+    if not versions:
+        print("No model versions found")
+        return
+    
+    for version in versions:
+        marker = '*' if version == active else ' '
+        print(f"{marker} {version}")
+
+
+@app.cli.command()
+@click.argument('version')
+def activate_model(version):
+    """Activate a stored model version (workers hot-swap to it)"""
+    try:
+        model_registry.activate(version)
+    except ModelRegistryError as e:
+        raise click.ClickException(str(e))
+    
+    print(f"Model version {version} activated")
+
+
 # ============================================================================
 # RUN APPLICATION
 # ============================================================================
 
+def create_app():
+    """Serving entry point (gunicorn 'app:create_app()'): warm-loads the active model and returns the app"""
+    # Not an application factory: the app, database and singletons are built
+    # once when this module is imported, and every call returns that same app.
+    # Only the model load moves here, so importing the module stays cheap for
+    # CLI commands; without an active model the ML libraries are never imported
+    load_active_model()
+    return app
+
+
 if __name__ == '__main__':
     # Create tables if they don't exist
     with app.app_context():
@@ -743,4 +2601,4 @@ if __name__ == '__main__':
     # Run the application
     port = int(os.environ.get('PORT', 5000))
     debug = os.environ.get('FLASK_ENV') == 'development'
-    app.run(host='0.0.0.0', port=port, debug=debug)
+    create_app().run(host='0.0.0.0', port=port, debug=debug)
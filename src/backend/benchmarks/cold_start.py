@@ -0,0 +1,138 @@
+# Cold start: module import, create_app() and first-request latency
+#
+# Starts a fresh interpreter per run and times, inside it:
+#   import      `import app` (configuration, extensions, routes)
+#   create_app  warm-loading the active model, if there is one
+#   first       the first POST /api/analyze (lazy pools, first queries, first prediction)
+#   second      the next one, for comparison
+# plus the wall time of the whole process as seen from outside. Two modes:
+# `fallback` has no trained model (rule-based scoring) and `model` serves an
+# activated model. The report also lists which ML libraries each mode
+# imported; in fallback mode there should be none.
+#
+# Usage: python benchmarks/cold_start.py [--runs 5] [--modes fallback,model] [--json out.json]
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('pandas', 'sklearn', 'xgboost', 'scipy', 'joblib')
+FEATURE_SCALE = [10, 100, 30, 800, 1]
+
+
+def child_run():
+    """Child process: time import, create_app and two requests; prints one JSON line"""
+    sys.path.insert(0, BACKEND_DIR)
+    started = time.perf_counter()
+    import app as app_module
+    imported = time.perf_counter()
+    app = app_module.create_app()
+    created = time.perf_counter()
+
+    from flask_jwt_extended import create_access_token
+    with app.app_context():
+        app_module.db.create_all()
+        user = app_module.User(username='cold', email='cold@example.com', password_hash='-', role='developer')
+        app_module.db.session.add(user)
+        app_module.db.session.flush()
+        project = app_module.Project(user_id=user.id, name='cold start')
+        app_module.db.session.add(project)
+        app_module.db.session.commit()
+        token = create_access_token(identity=user.id)
+        project_id = project.id
+
+    client = app.test_client()
+    headers = {'Authorization': f'Bearer {token}'}
+    timings = []
+    for i in range(2):
+        metrics = dict(zip(app_module.FEATURE_NAMES, [scale * (0.3 + 0.2 * i) for scale in FEATURE_SCALE]))
+        start = time.perf_counter()
+        response = client.post('/api/analyze', json={'project_id': project_id, 'metrics': metrics}, headers=headers)
+        timings.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.get_data(as_text=True)
+
+    print(json.dumps({
+        'import_ms': (imported - started) * 1000,
+        'create_app_ms': (created - imported) * 1000,
+        'first_request_ms': timings[0] * 1000,
+        'second_request_ms': timings[1] * 1000,
+        'model_version': app_module.predictor.model_version,
+        'heavy_modules': [name for name in HEAVY_MODULES if name in sys.modules]
+    }))
+
+
+def activate_model(env):
+    """Train a small model into the registry of env and activate it"""
+    script = (
+        'import sys; sys.path.insert(0, sys.argv[1])\n'
+        'import numpy as np\n'
+        'from app import RiskPredictor, model_registry\n'
+        'rng = np.random.default_rng(42)\n'
+        f'X = rng.random((5000, 5)) * {FEATURE_SCALE}\n'
+        'y = ((X[:, 1] < 50) ^ (rng.random(5000) < 0.2)).astype(int)\n'
+        'predictor = RiskPredictor()\n'
+        'predictor.train_models(X, y)\n'
+        'model_registry.activate(model_registry.save(predictor))\n'
+    )
+    subprocess.run([sys.executable, '-c', script, BACKEND_DIR], env=env, check=True, capture_output=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cold start and first-request latency')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh processes per mode')
+    parser.add_argument('--modes', default='fallback,model', help='Comma-separated: fallback, model')
+    parser.add_argument('--json', help='Write results to this file')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return child_run()
+
+    results = {}
+    print(f"{'mode':<10}{'process':>10}{'import':>10}{'create_app':>12}{'first req':>11}{'second req':>12}  ML libraries")
+    for mode in [part.strip() for part in args.modes.split(',') if part.strip()]:
+        workdir = tempfile.mkdtemp(prefix='ews-cold-')
+        env = dict(
+            os.environ,
+            MODEL_REGISTRY_DIR=os.path.join(workdir, 'model_registry'),
+            GITHUB_CACHE_PATH='',
+            JOB_WORKERS='0',
+            PASSWORD_HASH_WORKERS='0'
+        )
+        if mode == 'model':
+            activate_model(dict(env, DATABASE_URL=f'sqlite:///{os.path.join(workdir, "train.db")}'))
+
+        runs = []
+        for run in range(args.runs):
+            run_env = dict(env, DATABASE_URL=f'sqlite:///{os.path.join(workdir, f"cold{run}.db")}')
+            start = time.perf_counter()
+            output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child'], env=run_env,
+                                    check=True, capture_output=True, text=True).stdout
+            stats = json.loads(output.strip().splitlines()[-1])
+            stats['process_ms'] = (time.perf_counter() - start) * 1000
+            runs.append(stats)
+
+        medians = {key: statistics.median(run[key] for run in runs)
+                   for key in ('process_ms', 'import_ms', 'create_app_ms', 'first_request_ms', 'second_request_ms')}
+        results[mode] = {**medians, 'runs': len(runs), 'heavy_modules': runs[0]['heavy_modules']}
+        print(f"{mode:<10}{medians['process_ms']:>8.0f}ms{medians['import_ms']:>8.0f}ms"
+              f"{medians['create_app_ms']:>10.0f}ms{medians['first_request_ms']:>9.1f}ms"
+              f"{medians['second_request_ms']:>10.1f}ms  {', '.join(runs[0]['heavy_modules']) or 'none'}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'environment': {'python': platform.python_version(), 'cpus': os.cpu_count()},
+                'modes': results
+            }, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# Explanation cost benchmark: per-prediction contributions vs inference
+#
+# Trains a RiskPredictor on synthetic data and, for several batch sizes,
+# reports the per-analysis time of predict_risk_batch and explain_batch for
+# both inference engines, the explanation/inference ratio and the largest
+# additivity error (base + contributions vs the risk score). With --exact the
+# cost of exact XGBoost TreeSHAP is reported as well.
+#
+# Usage: python benchmarks/explanation_cost.py [--samples 20000] [--batch-sizes 1,100,1000]
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import RiskPredictor  # noqa: E402
+
+FEATURE_SCALE = [10, 100, 30, 800, 1]
+
+
+def per_row_us(func, X, repeats):
+    func(X)  # warm up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(X)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) / len(X) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Explanation cost benchmark')
+    parser.add_argument('--samples', type=int, default=20000, help='Training rows')
+    parser.add_argument('--batch-sizes', default='1,100,1000')
+    parser.add_argument('--repeats', type=int, default=20, help='Timed calls per batch size')
+    parser.add_argument('--exact', action='store_true', help='Also time exact TreeSHAP (slow)')
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    X = rng.random((args.samples, 5)) * FEATURE_SCALE
+    y = ((X[:, 1] < 50) ^ (rng.random(args.samples) < 0.2)).astype(int)
+
+    native = RiskPredictor(inference_engine='native')
+    native.train_models(X, y)
+    compiled = RiskPredictor(inference_engine='compiled')
+    compiled.rf_model, compiled.xgb_model, compiled.compiled = native.rf_model, native.xgb_model, native.compiled
+
+    probe = rng.random((max(int(size) for size in args.batch_sizes.split(',')), 5)) * FEATURE_SCALE
+    base, contributions = native.explain_batch(probe)
+    additivity_error = float(np.max(np.abs(base + contributions.sum(axis=1) - native.predict_risk_batch(probe))))
+    print(f"Max additivity error: {additivity_error:.2e} risk points\n")
+
+    runs = [('native', native, False), ('compiled', compiled, False)]
+    if args.exact:
+        runs.append(('treeshap', compiled, True))
+
+    results = {'additivity_error': additivity_error}
+    print(f"{'engine':<10}{'batch':>7}{'predict':>14}{'explain':>14}{'ratio':>8}")
+    for name, engine, exact in runs:
+        results[name] = {}
+        for size in (int(size) for size in args.batch_sizes.split(',')):
+            batch = probe[:size]
+            predict_us = per_row_us(engine.predict_risk_batch, batch, args.repeats)
+            explain_us = per_row_us(lambda X: engine.explain_batch(X, exact=exact), batch, args.repeats)
+            results[name][size] = {
+                'predict_us_per_row': predict_us,
+                'explain_us_per_row': explain_us,
+                'ratio': explain_us / predict_us
+            }
+            print(f"{name:<10}{size:>7}{predict_us:>12.1f}us{explain_us:>12.1f}us{explain_us / predict_us:>7.2f}x")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+# Local stand-in for the GitHub REST API used by the load test
+#
+# Serves the endpoints the backend calls (repository, commits with Link
+# pagination and ?since=, single commits with stats, issues, contributors and
+# /rate_limit) from deterministic synthetic data, with X-RateLimit-* headers,
+# ETag/If-None-Match revalidation and an optional artificial latency.
+#
+# Usage: python benchmarks/fake_github.py [--port 8900] [--commits 300]
+#        then GITHUB_API_URL=http://127.0.0.1:8900 flask run
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+
+def _iso(value):
+    return value.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class FakeGitHub:
+    """Synthetic repositories generated on first use, the same for the same seed"""
+
+    def __init__(self, commits=300, issues=120, contributors=8, latency=0.0, rate_limit=5000, seed=42):
+        self.commits = commits
+        self.issues = issues
+        self.contributors = contributors
+        self.latency = latency
+        self.limit = rate_limit
+        self.remaining = rate_limit
+        self.reset = int(time.time()) + 3600
+        self.seed = seed
+        self.requests = 0
+        self._repos = {}
+        self._lock = threading.Lock()
+
+    def repository(self, owner, repo):
+        key = f'{owner}/{repo}'
+        with self._lock:
+            if key not in self._repos:
+                self._repos[key] = self._generate(key)
+            return self._repos[key]
+
+    def _generate(self, key):
+        rng = random.Random(f'{self.seed}:{key}')
+        now = datetime.utcnow()
+        commits = [
+            {'sha': f'{i:040x}', 'commit': {'committer': {'date': _iso(now - timedelta(hours=rng.uniform(0, 24 * 60)))}}}
+            for i in range(self.commits)
+        ]
+        commits.sort(key=lambda c: c['commit']['committer']['date'], reverse=True)
+
+        issues = []
+        for number in range(1, self.issues + 1):
+            created = now - timedelta(days=rng.uniform(1, 60))
+            closed = created + timedelta(days=rng.uniform(0, 14)) if rng.random() < 0.7 else None
+            if closed and closed > now:
+                closed = None
+            issues.append({
+                'number': number,
+                'state': 'closed' if closed else 'open',
+                'created_at': _iso(created),
+                'closed_at': _iso(closed) if closed else None,
+                'updated_at': _iso(closed or created)
+            })
+        issues.sort(key=lambda i: i['updated_at'])
+
+        return {
+            'info': {'name': key.split('/')[1], 'description': 'Synthetic repository',
+                     'stargazers_count': rng.randint(0, 5000), 'forks_count': rng.randint(0, 500)},
+            'commits': commits,
+            'churn': {c['sha']: rng.randint(1, 400) for c in commits},
+            'issues': issues,
+            'contributors': [{'login': f'dev{i}'} for i in range(rng.randint(1, self.contributors))]
+        }
+
+    def take_call(self):
+        """Count one request against the budget; False when it is spent"""
+        with self._lock:
+            self.requests += 1
+            if time.time() >= self.reset:
+                self.remaining, self.reset = self.limit, int(time.time()) + 3600
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    github = None
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        github = self.github
+        if github.latency:
+            time.sleep(github.latency)
+
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        parts = url.path.strip('/').split('/')
+
+        # /rate_limit is free, as on GitHub
+        if parts == ['rate_limit']:
+            return self._send(200, {'resources': {'core': {
+                'limit': github.limit, 'remaining': github.remaining, 'reset': github.reset
+            }}})
+        if not github.take_call():
+            return self._send(403, {'message': 'API rate limit exceeded'})
+        if len(parts) < 3 or parts[0] != 'repos':
+            return self._send(404, {'message': 'Not Found'})
+
+        data = github.repository(parts[1], parts[2])
+        resource = parts[3] if len(parts) > 3 else None
+        if resource is None:
+            return self._send(200, data['info'])
+        if resource == 'commits' and len(parts) == 5:
+            return self._send(200, {'sha': parts[4], 'stats': {'total': data['churn'].get(parts[4], 0)}})
+        if resource == 'commits':
+            items = [c for c in data['commits'] if c['commit']['committer']['date'] >= query.get('since', '')]
+        elif resource == 'issues':
+            items = [i for i in data['issues'] if i['updated_at'] >= query.get('since', '')]
+        elif resource == 'contributors':
+            items = data['contributors']
+        else:
+            return self._send(404, {'message': 'Not Found'})
+
+        per_page, page = int(query.get('per_page', 30)), int(query.get('page', 1))
+        link = None
+        if page * per_page < len(items):
+            next_query = urlencode(dict(query, page=page + 1))
+            link = f'<http://{self.headers["Host"]}{url.path}?{next_query}>; rel="next"'
+        self._send(200, items[(page - 1) * per_page:page * per_page], link)
+
+    def _send(self, status, body, link=None):
+        payload = json.dumps(body).encode('utf-8')
+        etag = '"' + hashlib.sha1(payload).hexdigest() + '"'
+        if status == 200 and self.headers.get('If-None-Match') == etag:
+            status, payload = 304, b''
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('ETag', etag)
+        self.send_header('X-RateLimit-Limit', str(self.github.limit))
+        self.send_header('X-RateLimit-Remaining', str(max(self.github.remaining, 0)))
+        self.send_header('X-RateLimit-Reset', str(self.github.reset))
+        if link:
+            self.send_header('Link', link)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def start_server(github, host='127.0.0.1', port=0):
+    """Serve github on a daemon thread; returns the server (see server.server_address)"""
+    handler = type('FakeGitHubHandler', (_Handler,), {'github': github})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='fake-github', daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in GitHub API')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--commits', type=int, default=300, help='Commits per repository')
+    parser.add_argument('--issues', type=int, default=120, help='Issues per repository')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Delay added to every response')
+    parser.add_argument('--rate-limit', type=int, default=5000, help='Requests per hour')
+    args = parser.parse_args()
+
+    github = FakeGitHub(commits=args.commits, issues=args.issues,
+                        latency=args.latency_ms / 1000, rate_limit=args.rate_limit)
+    server = start_server(github, port=args.port)
+    print(f"Fake GitHub API on http://127.0.0.1:{server.server_address[1]}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
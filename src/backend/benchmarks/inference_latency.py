@@ -0,0 +1,90 @@
+# Inference latency benchmark: native predict_proba vs the compiled tree engine
+#
+# Trains a RiskPredictor on synthetic data, checks that both engines agree and
+# reports p50/p99 latency of predict_risk for single rows and of
+# predict_risk_batch for a batch.
+#
+# Usage: python benchmarks/inference_latency.py [--samples 20000] [--iterations 2000]
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import RiskPredictor  # noqa: E402
+
+FEATURE_SCALE = [10, 100, 30, 800, 1]
+
+
+def percentiles(samples):
+    samples = np.asarray(samples) * 1e6
+    return {
+        'p50_us': float(np.percentile(samples, 50)),
+        'p99_us': float(np.percentile(samples, 99)),
+        'mean_us': float(samples.mean())
+    }
+
+
+def time_calls(func, inputs, warmup=50):
+    for row in inputs[:warmup]:
+        func(row)
+    timings = []
+    for row in inputs:
+        start = time.perf_counter()
+        func(row)
+        timings.append(time.perf_counter() - start)
+    return percentiles(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inference latency benchmark')
+    parser.add_argument('--samples', type=int, default=20000, help='Training rows')
+    parser.add_argument('--iterations', type=int, default=2000, help='Single-row calls per engine')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    X = rng.random((args.samples, 5)) * FEATURE_SCALE
+    y = ((X[:, 1] < 50) ^ (rng.random(args.samples) < 0.2)).astype(int)
+
+    native = RiskPredictor(inference_engine='native')
+    native.train_models(X, y)
+    compiled = RiskPredictor(inference_engine='compiled')
+    compiled.rf_model, compiled.xgb_model, compiled.compiled = native.rf_model, native.xgb_model, native.compiled
+
+    probe = rng.random((5000, 5)) * np.multiply(FEATURE_SCALE, 1.2)
+    max_error = np.max(np.abs(native.predict_risk_batch(probe) - compiled.predict_risk_batch(probe))) / 100
+    print(f"Compiled: {compiled.compiled.n_nodes} nodes, depth {compiled.compiled.max_depth}, "
+          f"max probability error {max_error:.2e}\n")
+
+    rows = [list(row) for row in probe[:args.iterations]]
+    batches = [probe[i:i + args.batch_size] for i in range(0, len(probe), args.batch_size)] * 5
+
+    results = {'max_probability_error': float(max_error)}
+    print(f"{'engine':<10}{'call':<16}{'p50':>12}{'p99':>12}")
+    for name, engine in (('native', native), ('compiled', compiled)):
+        results[name] = {
+            'single': time_calls(engine.predict_risk, rows),
+            'batch': time_calls(engine.predict_risk_batch, batches, warmup=2)
+        }
+        for call in ('single', 'batch'):
+            label = 'predict_risk' if call == 'single' else f'batch[{args.batch_size}]'
+            stats = results[name][call]
+            print(f"{name:<10}{label:<16}{stats['p50_us']:>10.1f}us{stats['p99_us']:>10.1f}us")
+
+    speedup = results['native']['single']['p50_us'] / results['compiled']['single']['p50_us']
+    print(f"\nSingle-row p50 speedup: {speedup:.1f}x")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,277 @@
+# API load test: every endpoint against a seeded database and a fake GitHub
+#
+# Seeds a scratch database with --users users, --projects projects per user
+# and --analyses analyses (plus warnings) per project, starts the stand-in
+# GitHub server from fake_github.py, optionally activates a trained model and
+# then drives each endpoint with --concurrency client threads through Flask's
+# test client. For each endpoint it reports throughput and p50/p95/p99
+# latency. Latency is measured inside the process (routing, handlers,
+# database, serialization), without a WSGI server or network, so runs on the
+# same machine are comparable; --json results can be diffed with --compare.
+#
+# Usage: python benchmarks/load_test.py [--users 20] [--projects 10] [--analyses 200]
+#                                       [--requests 300] [--concurrency 4] [--json out.json]
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_github import FakeGitHub, start_server  # noqa: E402
+
+FEATURE_SCALE = [10, 100, 30, 800, 1]
+PASSWORD = 'benchmark-password'
+
+
+def random_metrics(rng, names):
+    return {name: round(rng.random() * scale, 3) for name, scale in zip(names, FEATURE_SCALE)}
+
+
+def seed_database(app_module, args, rng):
+    """Bulk-insert users, projects, analyses and warnings; returns one dict per user"""
+    from flask_jwt_extended import create_access_token
+
+    db = app_module.db
+    names = app_module.FEATURE_NAMES
+    # One real hash at the configured cost, shared by every user
+    password_hash = app_module.password_hasher.hash(PASSWORD)
+    now = datetime.utcnow()
+
+    with app_module.app.app_context():
+        db.create_all()
+        db.session.execute(app_module.User.__table__.insert(), [
+            {'username': f'bench{u}', 'email': f'bench{u}@example.com', 'password_hash': password_hash,
+             'role': 'developer', 'created_at': now}
+            for u in range(args.users)
+        ])
+        users = db.session.query(app_module.User.id, app_module.User.username).filter(
+            app_module.User.username.like('bench%')
+        ).all()
+
+        db.session.execute(app_module.Project.__table__.insert(), [
+            {'user_id': user_id, 'name': f'project {p}', 'repository': f'https://github.com/bench{user_id}/repo{p}',
+             'risk_score': float(rng.random() * 100), 'risk_level': rng.choice(['low', 'medium', 'high']),
+             'created_at': now, 'last_analyzed': now}
+            for user_id, _ in users for p in range(args.projects)
+        ])
+        projects = db.session.query(app_module.Project.id, app_module.Project.user_id).all()
+
+        for project_id, _ in projects:
+            analyses, warnings = [], []
+            for i in range(args.analyses):
+                metrics = random_metrics(rng, names)
+                score = float(rng.random() * 100)
+                timestamp = now - timedelta(hours=(args.analyses - i) * 6)
+                analyses.append({
+                    'project_id': project_id, 'timestamp': timestamp, 'risk_score': score,
+                    'risk_level': app_module.get_risk_level(score), 'model_version': 'seed',
+                    'metrics': metrics, 'feature_importance': [], 'warnings': [], 'recommendations': [],
+                    **metrics
+                })
+                if score >= 60:
+                    warnings.append({'project_id': project_id, 'severity': 'high', 'timestamp': timestamp,
+                                     'message': 'Seeded warning', 'acknowledged': bool(rng.random() < 0.5)})
+            db.session.execute(app_module.Analysis.__table__.insert(), analyses)
+            if warnings:
+                db.session.execute(app_module.Warning.__table__.insert(), warnings)
+        db.session.commit()
+
+        by_user = {}
+        for project_id, user_id in projects:
+            by_user.setdefault(user_id, []).append(project_id)
+        return [
+            {'id': user_id, 'username': username, 'token': create_access_token(identity=user_id),
+             'projects': by_user.get(user_id, [])}
+            for user_id, username in users
+        ]
+
+
+def train_model(app_module, samples):
+    """Train on synthetic data and activate it, like `flask train --activate`"""
+    rng = np.random.default_rng(42)
+    X = rng.random((samples, 5)) * FEATURE_SCALE
+    y = ((X[:, 1] < 50) ^ (rng.random(samples) < 0.2)).astype(int)
+    predictor = app_module.RiskPredictor(inference_engine=app_module.app.config['INFERENCE_ENGINE'])
+    predictor.train_models(X, y)
+    version = app_module.model_registry.save(predictor)
+    app_module.model_registry.activate(version)
+    return version
+
+
+def scenarios(names):
+    """(endpoint, share of --requests, request builder) for every endpoint exercised"""
+    def auth(user):
+        return {'Authorization': f"Bearer {user['token']}"}
+
+    def project(rng, user):
+        return rng.choice(user['projects'])
+
+    return [
+        ('GET /api/health', 1.0, lambda rng, user: ('GET', '/api/health', None, {})),
+        ('POST /api/auth/login', 0.1, lambda rng, user: (
+            'POST', '/api/auth/login', {'username': user['username'], 'password': PASSWORD}, {})),
+        ('GET /api/projects', 1.0, lambda rng, user: ('GET', '/api/projects', None, auth(user))),
+        ('GET /api/projects/<id>', 1.0, lambda rng, user: (
+            'GET', f'/api/projects/{project(rng, user)}', None, auth(user))),
+        ('GET /api/projects/<id>/analyses', 1.0, lambda rng, user: (
+            'GET', f'/api/projects/{project(rng, user)}/analyses', None, auth(user))),
+        ('GET /api/projects/<id>/trends', 1.0, lambda rng, user: (
+            'GET', f'/api/projects/{project(rng, user)}/trends', None, auth(user))),
+        ('GET /api/warnings', 1.0, lambda rng, user: ('GET', '/api/warnings', None, auth(user))),
+        ('GET /api/stats', 1.0, lambda rng, user: ('GET', '/api/stats', None, auth(user))),
+        ('POST /api/analyze', 1.0, lambda rng, user: (
+            'POST', '/api/analyze',
+            {'project_id': project(rng, user), 'metrics': random_metrics(rng, names)}, auth(user))),
+        ('POST /api/analyze/batch', 0.2, lambda rng, user: (
+            'POST', '/api/analyze/batch',
+            {'items': [{'project_id': project(rng, user), 'metrics': random_metrics(rng, names)}
+                       for _ in range(50)]}, auth(user))),
+        ('POST /api/github/analyze', 0.5, lambda rng, user: (
+            'POST', '/api/github/analyze',
+            {'repository': f"https://github.com/bench{user['id']}/repo{rng.randrange(len(user['projects']))}",
+             'project_id': project(rng, user)}, auth(user))),
+        ('GET /api/analyses/export', 0.2, lambda rng, user: (
+            'GET', f'/api/analyses/export?project_id={project(rng, user)}', None, auth(user))),
+        ('GET /api/model/drift', 1.0, lambda rng, user: ('GET', '/api/model/drift', None, auth(user))),
+        ('GET /api/cache/stats', 1.0, lambda rng, user: ('GET', '/api/cache/stats', None, auth(user))),
+        ('GET /api/github/stats', 1.0, lambda rng, user: ('GET', '/api/github/stats', None, auth(user)))
+    ]
+
+
+def run_endpoint(app, build, users, requests, concurrency, seed):
+    """Send `requests` requests from `concurrency` threads; returns latencies, status counts and wall time"""
+    latencies = []
+    statuses = Counter()
+    lock = threading.Lock()
+    local = threading.local()
+
+    def send(i):
+        if not hasattr(local, 'client'):
+            local.client = app.test_client()
+        rng = random.Random(seed * 1000003 + i)
+        method, path, body, headers = build(rng, rng.choice(users))
+        start = time.perf_counter()
+        response = local.client.open(path, method=method, json=body, headers=headers)
+        response.get_data()
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            statuses[response.status_code] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(send, range(requests)))
+    return latencies, statuses, time.perf_counter() - started
+
+
+def summarize(latencies, statuses, wall):
+    ms = np.asarray(latencies) * 1000
+    return {
+        'requests': len(latencies),
+        'errors': sum(count for status, count in statuses.items() if status >= 400),
+        'status_codes': {str(status): count for status, count in sorted(statuses.items())},
+        'throughput_rps': len(latencies) / wall if wall else 0.0,
+        'p50_ms': float(np.percentile(ms, 50)),
+        'p95_ms': float(np.percentile(ms, 95)),
+        'p99_ms': float(np.percentile(ms, 99))
+    }
+
+
+def compare(results, baseline_path):
+    """Print throughput and p50/p99 changes against an earlier --json file"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)['endpoints']
+    print(f"\n{'endpoint':<34}{'rps change':>12}{'p50 change':>12}{'p99 change':>12}")
+    for name, stats in results.items():
+        old = baseline.get(name)
+        if old and old['p50_ms'] and old['throughput_rps']:
+            print(f"{name:<34}{stats['throughput_rps'] / old['throughput_rps'] - 1:>+11.1%}"
+                  f"{stats['p50_ms'] / old['p50_ms'] - 1:>+12.1%}{stats['p99_ms'] / old['p99_ms'] - 1:>+12.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='API load test')
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--projects', type=int, default=10, help='Projects per user')
+    parser.add_argument('--analyses', type=int, default=200, help='Seeded analyses per project')
+    parser.add_argument('--requests', type=int, default=300, help='Requests per endpoint (scaled for slow ones)')
+    parser.add_argument('--concurrency', type=int, default=4, help='Client threads')
+    parser.add_argument('--endpoints', help='Comma-separated substrings selecting endpoints, e.g. analyze,stats')
+    parser.add_argument('--model', choices=['trained', 'rule-based'], default='trained')
+    parser.add_argument('--inference-engine', choices=['native', 'compiled'], default='compiled')
+    parser.add_argument('--github-latency-ms', type=float, default=0.0, help='Delay added by the fake GitHub')
+    parser.add_argument('--database-url', help='Scratch database to seed (default: SQLite in a temp dir)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='Write results to this file')
+    parser.add_argument('--compare', help='Earlier --json results to compare with')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='ews-load-')
+    github = FakeGitHub(latency=args.github_latency_ms / 1000, rate_limit=10 ** 9, seed=args.seed)
+    github_server = start_server(github)
+
+    # The app reads its configuration at import time
+    os.environ.update({
+        'DATABASE_URL': args.database_url or f'sqlite:///{os.path.join(workdir, "load.db")}',
+        'GITHUB_API_URL': f'http://127.0.0.1:{github_server.server_address[1]}',
+        'GITHUB_CACHE_PATH': os.path.join(workdir, 'github_cache.db'),
+        'MODEL_REGISTRY_DIR': os.path.join(workdir, 'model_registry'),
+        'INFERENCE_ENGINE': args.inference_engine,
+        'JOB_WORKERS': '0'
+    })
+    app_module = importlib.import_module('app')
+
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    users = [user for user in seed_database(app_module, args, rng) if user['projects']]
+    print(f"Seeded {args.users} users, {args.users * args.projects} projects, "
+          f"{args.users * args.projects * args.analyses} analyses in {time.perf_counter() - started:.1f}s")
+    if args.model == 'trained':
+        print(f"Activated model {train_model(app_module, 5000)}")
+
+    selected = scenarios(app_module.FEATURE_NAMES)
+    if args.endpoints:
+        wanted = [part.strip() for part in args.endpoints.split(',') if part.strip()]
+        selected = [scenario for scenario in selected if any(part in scenario[0] for part in wanted)]
+
+    results = {}
+    print(f"\n{'endpoint':<34}{'requests':>9}{'errors':>8}{'req/s':>9}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for index, (name, share, build) in enumerate(selected):
+        requests = max(int(args.requests * share), 10)
+        # Warm up caches, connections and the model before measuring
+        run_endpoint(app_module.app, build, users, min(requests, 10), 1, args.seed + 7919 * (index + 1))
+        latencies, statuses, wall = run_endpoint(app_module.app, build, users, requests, args.concurrency,
+                                               args.seed + index)
+        results[name] = stats = summarize(latencies, statuses, wall)
+        print(f"{name:<34}{stats['requests']:>9}{stats['errors']:>8}{stats['throughput_rps']:>9.1f}"
+              f"{stats['p50_ms']:>8.2f}ms{stats['p95_ms']:>8.2f}ms{stats['p99_ms']:>8.2f}ms")
+    print(f"\nFake GitHub served {github.requests} requests")
+
+    if args.compare:
+        compare(results, args.compare)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'environment': {'python': platform.python_version(), 'cpus': os.cpu_count(),
+                                'database': os.environ['DATABASE_URL'].split(':', 1)[0]},
+                'config': {key: value for key, value in vars(args).items() if key not in ('json', 'compare')},
+                'endpoints': results
+            }, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
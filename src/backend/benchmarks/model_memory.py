@@ -0,0 +1,124 @@
+# Per-worker memory benchmark for serving RiskPredictor models
+#
+# Forks N worker processes the way gunicorn does and reports each worker's
+# RSS/PSS before and after the model is loaded and used, for three strategies:
+#
+#   per-worker  every worker joblib.load()s its own copy (no preload)
+#   mmap        every worker joblib.load(mmap_mode='r')s the artifact
+#   preload     the master loads once and workers inherit it copy-on-write
+#
+# Usage: python benchmarks/model_memory.py [--workers 4] [--samples 20000]
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Imported up front so every strategy shares the libraries and the per-worker
+# numbers isolate the cost of the model itself
+from app import RiskPredictor  # noqa: E402
+from memory_usage import process_memory  # noqa: E402
+from model_registry import ModelRegistry  # noqa: E402
+
+STRATEGIES = ['per-worker', 'mmap', 'preload']
+
+
+def train_and_save(registry, samples):
+    """Train in a throwaway child so the parent never starts OpenMP threads"""
+    pid = os.fork()
+    if pid == 0:
+        rng = np.random.default_rng(42)
+        X = rng.random((samples, 5)) * [10, 100, 30, 800, 1]
+        y = ((X[:, 1] < 50) ^ (rng.random(samples) < 0.2)).astype(int)
+        predictor = RiskPredictor()
+        predictor.train_models(X, y)
+        registry.save(predictor, version='bench')
+        os._exit(0)
+    _, status = os.waitpid(pid, 0)
+    if status != 0:
+        raise SystemExit('Training failed')
+
+
+def run_worker(strategy, registry, preloaded, write_fd):
+    before = process_memory()
+    if strategy == 'preload':
+        predictor = preloaded
+    else:
+        mmap_mode = 'r' if strategy == 'mmap' else None
+        predictor = RiskPredictor.from_bundle(registry.load('bench', mmap_mode=mmap_mode))
+
+    X = np.random.default_rng(os.getpid()).random((256, 5)) * [10, 100, 30, 800, 1]
+    predictor.predict_risk_batch(X)
+    after = process_memory()
+
+    with os.fdopen(write_fd, 'w') as f:
+        json.dump({'before': before, 'after': after}, f)
+    os._exit(0)
+
+
+def run_strategy(strategy, registry, workers):
+    preloaded = None
+    if strategy == 'preload':
+        preloaded = RiskPredictor.from_bundle(registry.load('bench'))
+        # Keep the collector from dirtying inherited pages in the workers
+        gc.freeze()
+
+    children = []
+    for _ in range(workers):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            run_worker(strategy, registry, preloaded, write_fd)
+        os.close(write_fd)
+        children.append((pid, read_fd))
+
+    reports = []
+    for pid, read_fd in children:
+        with os.fdopen(read_fd) as f:
+            reports.append(json.load(f))
+        os.waitpid(pid, 0)
+
+    if strategy == 'preload':
+        gc.unfreeze()
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-worker model memory benchmark')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--samples', type=int, default=20000)
+    parser.add_argument('--json', help='Write results to this file')
+    args = parser.parse_args()
+
+    registry = ModelRegistry(tempfile.mkdtemp(prefix='model-memory-'))
+    train_and_save(registry, args.samples)
+    artifact_mb = os.path.getsize(os.path.join(registry.versions_dir, 'bench', 'models.joblib')) / 2**20
+    print(f"Model artifact: {artifact_mb:.1f} MiB, {args.workers} workers\n")
+
+    print(f"{'strategy':<12}{'RSS before':>12}{'RSS after':>12}{'PSS after':>12}{'private delta':>15}")
+    results = {}
+    for strategy in STRATEGIES:
+        reports = run_strategy(strategy, registry, args.workers)
+        results[strategy] = reports
+        before = np.mean([r['before']['rss_kb'] for r in reports]) / 1024
+        after = np.mean([r['after']['rss_kb'] for r in reports]) / 1024
+        pss = np.mean([r['after']['pss_kb'] or 0 for r in reports]) / 1024
+        private = np.mean([
+            (r['after']['private_kb'] or 0) - (r['before']['private_kb'] or 0) for r in reports
+        ]) / 1024
+        print(f"{strategy:<12}{before:>10.1f}Mi{after:>10.1f}Mi{pss:>10.1f}Mi{private:>13.1f}Mi")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'workers': args.workers, 'artifact_mb': artifact_mb, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+# Predictor microbenchmarks
+#
+# Times the per-analysis building blocks in isolation: predict_risk with the
+# rule-based fallback and with trained models (both inference engines),
+# generate_warnings and get_feature_importance (first call and cached).
+# Reports p50/p95/p99 per operation; --json results can be diffed between runs
+# with --compare.
+#
+# Usage: python benchmarks/predictor_micro.py [--samples 20000] [--iterations 5000] [--json out.json]
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import RiskPredictor  # noqa: E402
+
+FEATURE_SCALE = [10, 100, 30, 800, 1]
+
+
+def percentiles(timings):
+    timings = np.asarray(timings) * 1e6
+    return {
+        'p50_us': float(np.percentile(timings, 50)),
+        'p95_us': float(np.percentile(timings, 95)),
+        'p99_us': float(np.percentile(timings, 99)),
+        'mean_us': float(timings.mean()),
+        'calls': len(timings)
+    }
+
+
+def time_calls(func, inputs, warmup=50):
+    for args in inputs[:warmup]:
+        func(*args)
+    timings = []
+    for args in inputs:
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return percentiles(timings)
+
+
+def compare(results, baseline_path):
+    """Print the p50/p99 change of every operation against an earlier --json file"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)['operations']
+    print(f"\n{'operation':<34}{'p50 change':>12}{'p99 change':>12}")
+    for name, stats in results.items():
+        if name in baseline:
+            old = baseline[name]
+            print(f"{name:<34}{stats['p50_us'] / old['p50_us'] - 1:>+11.1%}{stats['p99_us'] / old['p99_us'] - 1:>+12.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Predictor microbenchmarks')
+    parser.add_argument('--samples', type=int, default=20000, help='Training rows')
+    parser.add_argument('--iterations', type=int, default=5000, help='Calls per operation')
+    parser.add_argument('--json', help='Write results to this file')
+    parser.add_argument('--compare', help='Earlier --json results to compare with')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    X = rng.random((args.samples, 5)) * FEATURE_SCALE
+    y = ((X[:, 1] < 50) ^ (rng.random(args.samples) < 0.2)).astype(int)
+
+    rule_based = RiskPredictor()
+    native = RiskPredictor(inference_engine='native')
+    native.train_models(X, y)
+    compiled = RiskPredictor(inference_engine='compiled')
+    compiled.rf_model, compiled.xgb_model, compiled.compiled = native.rf_model, native.xgb_model, native.compiled
+
+    probe = rng.random((args.iterations, 5)) * np.multiply(FEATURE_SCALE, 1.2)
+    rows = [(list(row),) for row in probe]
+    scored = [(list(row), score) for row, score in zip(probe, native.predict_risk_batch(probe))]
+
+    def first_feature_importance():
+        native._feature_importance = None
+        return native.get_feature_importance()
+
+    operations = {
+        'predict_risk[rule-based]': (rule_based.predict_risk, rows),
+        'predict_risk[native]': (native.predict_risk, rows),
+        'predict_risk[compiled]': (compiled.predict_risk, rows),
+        'generate_warnings': (native.generate_warnings, scored),
+        'get_feature_importance[first]': (first_feature_importance, [()] * min(args.iterations, 1000)),
+        'get_feature_importance[cached]': (native.get_feature_importance, [()] * args.iterations)
+    }
+
+    results = {}
+    print(f"{'operation':<34}{'p50':>11}{'p95':>11}{'p99':>11}")
+    for name, (func, inputs) in operations.items():
+        results[name] = time_calls(func, inputs)
+        stats = results[name]
+        print(f"{name:<34}{stats['p50_us']:>9.1f}us{stats['p95_us']:>9.1f}us{stats['p99_us']:>9.1f}us")
+
+    if args.compare:
+        compare(results, args.compare)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'environment': {'python': platform.python_version(), 'cpus': os.cpu_count(),
+                                'samples': args.samples, 'iterations': args.iterations},
+                'operations': results
+            }, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
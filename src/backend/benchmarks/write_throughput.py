@@ -0,0 +1,111 @@
+# Analysis write throughput under different database engine profiles
+#
+# Drives POST /api/analyze from --concurrency client threads against a seeded
+# SQLite database once per profile, each in a fresh process because the app
+# reads its configuration at import time:
+#
+#   default              rollback journal, synchronous=FULL (SQLite's defaults)
+#   wal                  WAL, synchronous=NORMAL (the app's default)
+#   wal-full+group       WAL, synchronous=FULL, group commit
+#   wal+group            WAL, synchronous=NORMAL, group commit
+#
+# Reports analyses per second and p50/p95/p99 latency per profile. The gain
+# depends on how expensive an fsync is on the machine's disk, so run it on the
+# storage the database will use.
+#
+# Usage: python benchmarks/write_throughput.py [--requests 1000] [--concurrency 8]
+#                                              [--profiles default,wal+group] [--json out.json]
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from load_test import random_metrics, run_endpoint, seed_database, summarize  # noqa: E402
+
+PROFILES = {
+    'default': {'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL', 'ANALYSIS_GROUP_COMMIT': '0'},
+    'wal': {'SQLITE_JOURNAL_MODE': 'WAL', 'SQLITE_SYNCHRONOUS': 'NORMAL', 'ANALYSIS_GROUP_COMMIT': '0'},
+    'wal-full+group': {'SQLITE_JOURNAL_MODE': 'WAL', 'SQLITE_SYNCHRONOUS': 'FULL', 'ANALYSIS_GROUP_COMMIT': '1'},
+    'wal+group': {'SQLITE_JOURNAL_MODE': 'WAL', 'SQLITE_SYNCHRONOUS': 'NORMAL', 'ANALYSIS_GROUP_COMMIT': '1'}
+}
+
+
+def run_profile(args):
+    """Child process: seed, then time POST /api/analyze under the environment set by the parent"""
+    import app as app_module
+
+    rng = random.Random(args.seed)
+    users = [user for user in seed_database(app_module, args, rng) if user['projects']]
+    names = app_module.FEATURE_NAMES
+
+    def analyze(rng, user):
+        body = {'project_id': rng.choice(user['projects']), 'metrics': random_metrics(rng, names)}
+        return 'POST', '/api/analyze', body, {'Authorization': f"Bearer {user['token']}"}
+
+    run_endpoint(app_module.app, analyze, users, 20, 1, args.seed + 1)
+    latencies, statuses, wall = run_endpoint(app_module.app, analyze, users, args.requests, args.concurrency,
+                                             args.seed)
+    stats = summarize(latencies, statuses, wall)
+    if app_module.group_committer is not None:
+        stats['group_commit'] = app_module.group_committer.stats()
+    print(json.dumps(stats))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Analysis write throughput per database profile')
+    parser.add_argument('--requests', type=int, default=1000, help='POST /api/analyze requests per profile')
+    parser.add_argument('--concurrency', type=int, default=8, help='Client threads')
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--projects', type=int, default=10, help='Projects per user')
+    parser.add_argument('--analyses', type=int, default=20, help='Seeded analyses per project')
+    parser.add_argument('--profiles', default=','.join(PROFILES), help='Comma-separated profiles to run')
+    parser.add_argument('--window-ms', type=float, default=2.0, help='Group-commit window')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='Write results to this file')
+    parser.add_argument('--profile', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.profile:
+        return run_profile(args)
+
+    results = {}
+    print(f"{'profile':<18}{'requests':>9}{'errors':>8}{'req/s':>9}{'p50':>10}{'p95':>10}{'p99':>10}{'batch':>8}")
+    for name in [part.strip() for part in args.profiles.split(',') if part.strip()]:
+        workdir = tempfile.mkdtemp(prefix='ews-write-')
+        env = dict(
+            os.environ, **PROFILES[name],
+            DATABASE_URL=f'sqlite:///{os.path.join(workdir, "write.db")}',
+            MODEL_REGISTRY_DIR=os.path.join(workdir, 'model_registry'),
+            GITHUB_CACHE_PATH='',
+            JOB_WORKERS='0',
+            PREDICTION_CACHE_SIZE='0',
+            ANALYSIS_GROUP_COMMIT_WINDOW_MS=str(args.window_ms)
+        )
+        command = [sys.executable, os.path.abspath(__file__), '--profile', name,
+                   '--requests', str(args.requests), '--concurrency', str(args.concurrency),
+                   '--users', str(args.users), '--projects', str(args.projects),
+                   '--analyses', str(args.analyses), '--seed', str(args.seed)]
+        output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+        results[name] = stats = json.loads(output.strip().splitlines()[-1])
+        batch = stats.get('group_commit', {}).get('average_batch', 1.0)
+        print(f"{name:<18}{stats['requests']:>9}{stats['errors']:>8}{stats['throughput_rps']:>9.1f}"
+              f"{stats['p50_ms']:>8.2f}ms{stats['p95_ms']:>8.2f}ms{stats['p99_ms']:>8.2f}ms{batch:>8.1f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'environment': {'python': platform.python_version(), 'cpus': os.cpu_count()},
+                'config': {key: value for key, value in vars(args).items() if key not in ('json', 'profile')},
+                'profiles': results
+            }, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+# Database engine profiles for the ML-Based Early Warning System
+#
+# SQLite: write-ahead logging lets readers run while a write is in progress,
+# and with `synchronous=NORMAL` a commit appends to the WAL without an fsync
+# (the WAL is synced at checkpoints). A committed transaction can be lost on
+# power failure or OS crash, never on an application crash, and the database
+# is never corrupted. `synchronous=FULL` syncs on every commit. busy_timeout
+# makes a writer wait for the lock instead of failing with "database is
+# locked" right away.
+#
+# Server databases (PostgreSQL, MySQL): a bounded connection pool per process,
+# with pre-ping so connections dropped by the server or a proxy are replaced
+# transparently, and recycling before typical idle timeouts.
+
+import sqlite3
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+
+def is_sqlite(uri):
+    return uri.startswith('sqlite')
+
+
+def engine_options(uri, pool_size=10, max_overflow=20, pool_timeout=30, pool_recycle=1800, sqlite_busy_timeout=5000):
+    """SQLALCHEMY_ENGINE_OPTIONS for the database at uri"""
+    if is_sqlite(uri):
+        # The sqlite3 module's own lock wait; the pragma below covers connections it did not open
+        return {'connect_args': {'timeout': sqlite_busy_timeout / 1000.0}}
+    return {
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'pool_timeout': pool_timeout,
+        'pool_recycle': pool_recycle,
+        'pool_pre_ping': True
+    }
+
+
+def sqlite_pragmas(journal_mode='WAL', synchronous='NORMAL', busy_timeout=5000, cache_size_kb=20000):
+    """PRAGMA statements run on every new SQLite connection"""
+    synchronous = synchronous.upper()
+    if synchronous not in SYNCHRONOUS_MODES:
+        raise ValueError(f'synchronous must be one of {", ".join(SYNCHRONOUS_MODES)}')
+    pragmas = [
+        f'PRAGMA busy_timeout = {int(busy_timeout)}',
+        f'PRAGMA synchronous = {synchronous}',
+        # Negative cache_size is in KiB rather than pages
+        f'PRAGMA cache_size = -{int(cache_size_kb)}',
+        'PRAGMA temp_store = MEMORY'
+    ]
+    if journal_mode:
+        # Persistent for the database file; set first so synchronous applies to the WAL
+        pragmas.insert(0, f'PRAGMA journal_mode = {journal_mode}')
+    return pragmas
+
+
+def install_sqlite_pragmas(pragmas):
+    """Run pragmas on every new SQLite DBAPI connection of any engine"""
+    @event.listens_for(Engine, 'connect')
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        if not isinstance(dbapi_connection, sqlite3.Connection):
+            return
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    return _set_sqlite_pragmas
@@ -0,0 +1,179 @@
+# Streaming input-drift monitor for the ML-Based Early Warning System
+#
+# At training time every feature gets a reference profile: decile bin edges,
+# the share of training rows in each bin, and the mean and standard deviation.
+# While serving, every scored feature vector updates a Welford mean/variance
+# and the bin counts of the current window. That is a few float operations and
+# one bisect per feature, with fixed memory. Every `check_every` observations,
+# the window is compared with the reference. The Population Stability Index
+# (PSI) and the Kolmogorov-Smirnov distance between the binned CDFs are
+# computed, and features whose PSI crosses the threshold are reported once.
+
+import math
+import threading
+from bisect import bisect_right
+
+import numpy as np
+
+# Rule-of-thumb PSI levels: < 0.1 stable, 0.1-0.25 moderate shift, > 0.25 major shift
+PSI_MODERATE = 0.1
+PSI_MAJOR = 0.25
+
+# Floor for empty bins, which would make PSI infinite
+MIN_SHARE = 1e-4
+
+
+def reference_profile(X, feature_names, bins=10):
+    """Training-time reference: quantile bin edges and shares, mean and std per feature"""
+    X = np.asarray(X, dtype=float)
+    edges, shares = [], []
+    for column in X.T:
+        column = column[~np.isnan(column)]
+        # Ties (e.g. many zeros) collapse quantiles, so keep distinct cut points only
+        cuts = np.unique(np.quantile(column, np.linspace(0, 1, bins + 1)[1:-1])) if len(column) else np.array([])
+        counts = np.bincount(np.searchsorted(cuts, column, side='right'), minlength=len(cuts) + 1)
+        edges.append(cuts.tolist())
+        shares.append((counts / max(len(column), 1)).tolist())
+    return {
+        'feature_names': list(feature_names),
+        'edges': edges,
+        'shares': shares,
+        'mean': np.nanmean(X, axis=0).tolist(),
+        'std': np.nanstd(X, axis=0).tolist(),
+        'n_samples': int(len(X))
+    }
+
+
+def psi(expected, actual):
+    """Population Stability Index between two lists of bin shares"""
+    total = 0.0
+    for e, a in zip(expected, actual):
+        e, a = max(e, MIN_SHARE), max(a, MIN_SHARE)
+        total += (a - e) * math.log(a / e)
+    return total
+
+
+def ks_distance(expected, actual):
+    """Largest gap between the two binned CDFs"""
+    gap = cumulative_e = cumulative_a = 0.0
+    for e, a in zip(expected, actual):
+        cumulative_e += e
+        cumulative_a += a
+        gap = max(gap, abs(cumulative_a - cumulative_e))
+    return gap
+
+
+class _Window:
+    """Welford moments and bin counts of one tumbling window"""
+
+    def __init__(self, bin_counts):
+        self.count = [0] * len(bin_counts)
+        self.mean = [0.0] * len(bin_counts)
+        self.m2 = [0.0] * len(bin_counts)
+        self.bins = [[0] * n for n in bin_counts]
+        self.observed = 0
+
+
+class FeatureDriftMonitor:
+    """Per-process running feature statistics against a training reference"""
+
+    def __init__(self, reference, window=1000, min_samples=200, check_every=50, psi_threshold=PSI_MAJOR):
+        self.reference = reference
+        self.feature_names = reference['feature_names']
+        self.edges = reference['edges']
+        self.window = window
+        self.min_samples = min_samples
+        self.check_every = check_every
+        self.psi_threshold = psi_threshold
+        self._bin_counts = [len(edges) + 1 for edges in self.edges]
+        self._current = _Window(self._bin_counts)
+        self._completed = None
+        self._alerting = set()
+        self._lock = threading.Lock()
+        self.total = 0
+
+    def observe(self, features):
+        """Add one feature vector; returns [(feature, psi)] for features that just crossed the threshold"""
+        with self._lock:
+            current = self._current
+            for i, value in enumerate(features):
+                try:
+                    x = float(value)
+                except (TypeError, ValueError):
+                    continue
+                if x != x:
+                    continue
+                n = current.count[i] = current.count[i] + 1
+                delta = x - current.mean[i]
+                current.mean[i] += delta / n
+                current.m2[i] += delta * (x - current.mean[i])
+                current.bins[i][bisect_right(self.edges[i], x)] += 1
+            current.observed += 1
+            self.total += 1
+
+            alerts = []
+            if current.observed >= self.min_samples and current.observed % self.check_every == 0:
+                alerts = self._check(current)
+            if current.observed >= self.window:
+                self._completed = current
+                self._current = _Window(self._bin_counts)
+            return alerts
+
+    def _check(self, window):
+        """Update the alerting set; returns the features that entered it"""
+        alerts = []
+        for i, name in enumerate(self.feature_names):
+            if not window.count[i]:
+                continue
+            score = psi(self.reference['shares'][i], [c / window.count[i] for c in window.bins[i]])
+            if score >= self.psi_threshold and name not in self._alerting:
+                self._alerting.add(name)
+                alerts.append((name, score))
+            elif score < self.psi_threshold:
+                self._alerting.discard(name)
+        return alerts
+
+    def snapshot(self):
+        """Drift scores of the current window, or of the last full one while it fills"""
+        with self._lock:
+            window = self._current
+            if window.observed < self.min_samples and self._completed is not None:
+                window = self._completed
+            observed = window.observed
+            counts, means, m2s = list(window.count), list(window.mean), list(window.m2)
+            bins = [list(b) for b in window.bins]
+
+        features = []
+        for i, name in enumerate(self.feature_names):
+            n = counts[i]
+            expected = self.reference['shares'][i]
+            actual = [c / n for c in bins[i]] if n else None
+            std = math.sqrt(m2s[i] / n) if n else None
+            reference_std = self.reference['std'][i]
+            item = {
+                'feature': name,
+                'count': n,
+                'mean': means[i] if n else None,
+                'std': std,
+                'reference_mean': self.reference['mean'][i],
+                'reference_std': reference_std,
+                # Shift of the mean in reference standard deviations
+                'mean_shift': (means[i] - self.reference['mean'][i]) / reference_std if n and reference_std else None,
+                'psi': psi(expected, actual) if actual else None,
+                'ks': ks_distance(expected, actual) if actual else None
+            }
+            item['drifted'] = bool(
+                observed >= self.min_samples and item['psi'] is not None and item['psi'] >= self.psi_threshold
+            )
+            features.append(item)
+
+        return {
+            'window_size': self.window,
+            'window_observed': observed,
+            'min_samples': self.min_samples,
+            'psi_threshold': self.psi_threshold,
+            'total_observed': self.total,
+            'sufficient': observed >= self.min_samples,
+            'features': features,
+            'drifted_features': [item['feature'] for item in features if item['drifted']]
+        }
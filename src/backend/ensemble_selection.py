@@ -0,0 +1,86 @@
+# Ensemble weighting and latency-aware member selection
+#
+# The served score is a convex blend w * P(RF) + (1 - w) * P(XGB). The blend
+# weight is fitted on held-out (out-of-fold) probabilities by minimising log
+# loss. Three candidates are then compared: RF alone, XGBoost alone and the
+# fitted blend. Among those within the latency budget, the fastest one whose
+# held-out log loss is within a tolerance of the best is served, so a slow
+# member that adds little accuracy is dropped. scikit-learn is imported on
+# first use, so the serving process does not load it for EQUAL_WEIGHTS.
+
+import time
+
+import numpy as np
+
+# Blend weights tried for the RF share (the XGBoost share is the remainder)
+WEIGHT_GRID = np.linspace(0.0, 1.0, 101)
+
+EQUAL_WEIGHTS = {'rf': 0.5, 'xgb': 0.5}
+
+
+def _blend(rf_prob, xgb_prob, rf_weight):
+    return np.clip(rf_weight * rf_prob + (1.0 - rf_weight) * xgb_prob, 1e-7, 1 - 1e-7)
+
+
+def fit_blend_weight(rf_prob, xgb_prob, y):
+    """RF share in [0, 1] that minimises the held-out log loss of the blend"""
+    from sklearn.metrics import log_loss
+    losses = [log_loss(y, _blend(rf_prob, xgb_prob, w), labels=[0, 1]) for w in WEIGHT_GRID]
+    return float(WEIGHT_GRID[int(np.argmin(losses))])
+
+
+def held_out_scores(rf_prob, xgb_prob, y, weights):
+    """Log loss and AUC of a weighting on held-out probabilities"""
+    from sklearn.metrics import log_loss, roc_auc_score
+    prob = _blend(rf_prob, xgb_prob, weights['rf'])
+    return {'log_loss': float(log_loss(y, prob, labels=[0, 1])), 'auc': float(roc_auc_score(y, prob))}
+
+
+def candidate_weights(rf_prob, xgb_prob, y):
+    """{candidate: weights} for RF alone, XGBoost alone and the fitted blend"""
+    candidates = {
+        'rf': {'rf': 1.0, 'xgb': 0.0},
+        'xgb': {'rf': 0.0, 'xgb': 1.0}
+    }
+    rf_weight = fit_blend_weight(rf_prob, xgb_prob, y)
+    # A blend at either end of the grid is one of the single models
+    if 0.0 < rf_weight < 1.0:
+        candidates['blend'] = {'rf': rf_weight, 'xgb': 1.0 - rf_weight}
+    return candidates
+
+
+def measure_latency(predict, rows, warmup=20):
+    """Single-row latency of predict over rows: p50 and p99 in microseconds"""
+    for row in rows[:warmup]:
+        predict(row)
+    timings = np.empty(len(rows))
+    for i, row in enumerate(rows):
+        start = time.perf_counter()
+        predict(row)
+        timings[i] = time.perf_counter() - start
+    return {
+        'p50_us': float(np.percentile(timings, 50) * 1e6),
+        'p99_us': float(np.percentile(timings, 99) * 1e6)
+    }
+
+
+def choose(candidates, latency_budget_us=None, loss_tolerance=0.01):
+    """Name of the candidate to serve.
+
+    `candidates` maps names to dicts with `log_loss` and `latency` (from
+    measure_latency). Candidates over the p50 budget are excluded unless none
+    fits, in which case the fastest is served.
+    """
+    by_speed = sorted(candidates, key=lambda name: candidates[name]['latency']['p50_us'])
+    eligible = [
+        name for name in by_speed
+        if not latency_budget_us or candidates[name]['latency']['p50_us'] <= latency_budget_us
+    ]
+    if not eligible:
+        return by_speed[0]
+
+    best_loss = min(candidates[name]['log_loss'] for name in eligible)
+    return next(
+        name for name in eligible
+        if candidates[name]['log_loss'] <= best_loss * (1 + loss_tolerance)
+    )
@@ -0,0 +1,129 @@
+# Persistent conditional-request cache for GitHub API responses
+#
+# Stores the body and ETag/Last-Modified validators of every cacheable
+# response in a local SQLite file shared by all workers on the node. The
+# client revalidates with If-None-Match / If-Modified-Since; GitHub answers
+# unchanged resources with 304 Not Modified, which does not count against
+# the rate limit, and the body is served from here.
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Response headers kept with the body (Link is needed for pagination)
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified', 'Link')
+
+
+class ResponseCache:
+    """Size-bounded LRU store of GitHub responses keyed by URL"""
+
+    def __init__(self, path, max_bytes=50 * 2**20):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+        self.lookups = 0
+        self.misses = 0
+        self.not_modified = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def _connection(self):
+        # SQLite connections must not cross a fork: each gunicorn worker opens its own on first use.
+        # Callers hold self._lock.
+        if self._conn is None or self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                ' url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, headers TEXT,'
+                ' body BLOB NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS ix_responses_last_used ON responses (last_used)')
+            self._conn.commit()
+        return self._conn
+
+    def get(self, url):
+        """Cached entry for url as a dict, or None"""
+        with self._lock:
+            self.lookups += 1
+            row = self._connection().execute(
+                'SELECT etag, last_modified, headers, body FROM responses WHERE url = ?', (url,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+        etag, last_modified, headers, body = row
+        return {'etag': etag, 'last_modified': last_modified, 'headers': json.loads(headers), 'body': body}
+
+    def conditional_headers(self, entry):
+        """Validators to send with a revalidation request"""
+        headers = {}
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def mark_not_modified(self, url):
+        """Record a 304 served from the cache"""
+        with self._lock:
+            self.not_modified += 1
+            conn = self._connection()
+            conn.execute('UPDATE responses SET last_used = ? WHERE url = ?', (time.time(), url))
+            conn.commit()
+
+    def put(self, url, response):
+        """Store a 200 response if it carries a validator and fits the cache"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        body = response.content
+        if not (etag or last_modified) or len(body) > self.max_bytes:
+            return
+
+        headers = {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                'INSERT OR REPLACE INTO responses (url, etag, last_modified, headers, body, size, last_used)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (url, etag, last_modified, json.dumps(headers), body, len(body), time.time())
+            )
+            self.stores += 1
+            self._evict(conn)
+            conn.commit()
+
+    def _evict(self, conn):
+        """Drop least recently used entries until the cache fits max_bytes"""
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in conn.execute('SELECT url, size FROM responses ORDER BY last_used').fetchall():
+            conn.execute('DELETE FROM responses WHERE url = ?', (url,))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self):
+        """Counters for monitoring (this worker) and the shared cache size"""
+        with self._lock:
+            entries, size = self._connection().execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses'
+            ).fetchone()
+            return {
+                'entries': entries,
+                'size_bytes': size,
+                'max_bytes': self.max_bytes,
+                'lookups': self.lookups,
+                'misses': self.misses,
+                'not_modified': self.not_modified,
+                'stores': self.stores,
+                'evictions': self.evictions,
+                'hit_rate': round(self.not_modified / self.lookups, 4) if self.lookups else 0.0
+            }
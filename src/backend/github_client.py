@@ -0,0 +1,220 @@
+# GitHub REST API client for the ML-Based Early Warning System
+#
+# One pooled keep-alive session per process, per-call timeouts, bounded retry
+# with exponential backoff, X-RateLimit-* tracking, concurrent fetching and
+# optional conditional requests against a persistent ResponseCache. An
+# optional observer is called with (url, status, seconds) after every attempt.
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+# Statuses worth retrying (besides rate limiting)
+RETRY_STATUSES = {500, 502, 503, 504}
+
+
+class GitHubAPIError(Exception):
+    """Raised when GitHub cannot be reached after all retries"""
+
+
+class GitHubRateLimitError(GitHubAPIError):
+    """Raised when the rate limit is exhausted for longer than we are willing to wait"""
+
+    def __init__(self, reset_at):
+        self.reset_at = reset_at
+        super().__init__(f'GitHub rate limit exceeded until {time.strftime("%H:%M:%S", time.gmtime(reset_at))} UTC')
+
+    @property
+    def retry_after(self):
+        return max(int(self.reset_at - time.time()) + 1, 1)
+
+
+class GitHubClient:
+    """Thread-safe GitHub API client with a shared connection pool"""
+
+    def __init__(self, base_url='https://api.github.com', token=None, timeout=10.0,
+                 max_retries=3, backoff=0.5, max_rate_limit_wait=5.0, pool_size=16, cache=None, observer=None):
+        self.base_url = base_url.rstrip('/')
+        self.cache = cache
+        self.observer = observer
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_rate_limit_wait = max_rate_limit_wait
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['Accept'] = 'application/vnd.github+json'
+        if token:
+            self.session.headers['Authorization'] = f'token {token}'
+
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='github')
+        self._lock = threading.Lock()
+        self.rate_limit = {'limit': None, 'remaining': None, 'reset': None}
+
+    def _url(self, path):
+        return path if path.startswith(('http://', 'https://')) else f'{self.base_url}{path}'
+
+    def _update_rate_limit(self, response):
+        headers = response.headers
+        if 'X-RateLimit-Remaining' not in headers:
+            return
+        with self._lock:
+            self.rate_limit = {
+                'limit': int(headers.get('X-RateLimit-Limit', 0)),
+                'remaining': int(headers['X-RateLimit-Remaining']),
+                'reset': int(headers.get('X-RateLimit-Reset', 0))
+            }
+
+    def rate_limit_status(self):
+        """Last seen X-RateLimit-* values"""
+        with self._lock:
+            return dict(self.rate_limit)
+
+    def refresh_rate_limit(self):
+        """Fetch the current budget from /rate_limit (which does not count against it)"""
+        try:
+            response = self.session.get(self._url('/rate_limit'), timeout=self.timeout)
+            core = response.json().get('resources', {}).get('core', {}) if response.status_code == 200 else {}
+        except (requests.RequestException, ValueError):
+            core = {}
+        if 'remaining' in core:
+            with self._lock:
+                self.rate_limit = {
+                    'limit': core.get('limit'),
+                    'remaining': core['remaining'],
+                    'reset': core.get('reset')
+                }
+        return self.rate_limit_status()
+
+    def _exhausted_until(self):
+        """Reset time if the last response said the budget is spent, else None"""
+        with self._lock:
+            remaining, reset = self.rate_limit['remaining'], self.rate_limit['reset']
+        if remaining == 0 and reset and reset > time.time():
+            return reset
+        return None
+
+    def _observe(self, url, status, started):
+        if self.observer is not None:
+            self.observer(url, status, time.perf_counter() - started)
+
+    def _sleep_backoff(self, attempt):
+        delay = self.backoff * (2 ** attempt)
+        time.sleep(delay + random.uniform(0, delay / 2))
+
+    def get(self, path, params=None, headers=None):
+        """GET a path (or absolute URL), revalidating cached responses"""
+        url = self._url(path)
+        if self.cache is None:
+            return self._request(url, params, headers)
+
+        # Key on the full URL including the query string
+        url = requests.Request('GET', url, params=params).prepare().url
+        entry = self.cache.get(url)
+        request_headers = dict(headers or {})
+        if entry is not None:
+            request_headers.update(self.cache.conditional_headers(entry))
+
+        response = self._request(url, None, request_headers)
+        if response.status_code == 304 and entry is not None:
+            self.cache.mark_not_modified(url)
+            return _cached_response(url, entry, response)
+        if response.status_code == 200:
+            self.cache.put(url, response)
+        return response
+
+    def _request(self, url, params=None, headers=None):
+        """GET with retry and rate-limit handling"""
+        for attempt in range(self.max_retries + 1):
+            reset_at = self._exhausted_until()
+            if reset_at is not None:
+                if reset_at - time.time() > self.max_rate_limit_wait:
+                    raise GitHubRateLimitError(reset_at)
+                time.sleep(max(reset_at - time.time(), 0))
+
+            started = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._observe(url, None, started)
+                if attempt == self.max_retries:
+                    raise GitHubAPIError(f'GET {url} failed: {e}') from e
+                self._sleep_backoff(attempt)
+                continue
+
+            self._update_rate_limit(response)
+            self._observe(url, response.status_code, started)
+
+            if response.status_code in (403, 429) and (
+                response.headers.get('X-RateLimit-Remaining') == '0' or 'Retry-After' in response.headers
+            ):
+                if 'Retry-After' in response.headers:
+                    reset_at = time.time() + int(response.headers['Retry-After'])
+                else:
+                    reset_at = int(response.headers.get('X-RateLimit-Reset', time.time()))
+                if attempt == self.max_retries or reset_at - time.time() > self.max_rate_limit_wait:
+                    raise GitHubRateLimitError(reset_at)
+                time.sleep(max(reset_at - time.time(), 0))
+                continue
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                self._sleep_backoff(attempt)
+                continue
+
+            return response
+
+    def iter_pages(self, path, params=None, max_pages=None):
+        """Yield the items of every page of a listing, following Link rel="next" """
+        url, page = path, 0
+        while url and (max_pages is None or page < max_pages):
+            response = self.get(url, params if page == 0 else None)
+            if response.status_code != 200:
+                return
+            yield from response.json()
+            # The next URL already carries the query string
+            url = response.links.get('next', {}).get('url')
+            page += 1
+
+    def get_all(self, path, params=None, max_pages=None):
+        """Every item of a paginated listing as one list"""
+        return list(self.iter_pages(path, params, max_pages))
+
+    def submit(self, func, *args, **kwargs):
+        """Run func on the client's thread pool and return its future"""
+        return self._executor.submit(func, *args, **kwargs)
+
+    def map_get(self, paths):
+        """GET several paths concurrently, responses in input order"""
+        return list(self._executor.map(self.get, paths))
+
+    def get_many(self, requests_by_name):
+        """Run several GETs concurrently; {name: path or (path, params)} -> {name: response}"""
+        futures = {}
+        for name, spec in requests_by_name.items():
+            path, params = spec if isinstance(spec, tuple) else (spec, None)
+            futures[name] = self._executor.submit(self.get, path, params)
+        return {name: future.result() for name, future in futures.items()}
+
+
+def _cached_response(url, entry, not_modified):
+    """Rebuild a 200 response from a cache entry after a 304"""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.encoding = 'utf-8'
+    response._content = entry['body']
+    response.headers = CaseInsensitiveDict(entry['headers'])
+    # Fresh rate-limit headers come from the 304 itself
+    for name, value in not_modified.headers.items():
+        if name.lower().startswith('x-ratelimit-'):
+            response.headers[name] = value
+    response.headers['X-Cache'] = 'revalidated'
+    return response
@@ -0,0 +1,121 @@
+# Group commit for the ML-Based Early Warning System
+#
+# Request threads hand their writes to one committer thread per process and
+# wait for the outcome. The committer collects the writes that arrive within
+# `window` seconds of the first one (up to `max_batch`) and applies them all in
+# a single transaction, so a burst of N analyses costs one commit (and one
+# fsync) instead of N. `apply_batch(items)` returns one result per item; if it
+# raises, every item is retried in its own transaction via `apply_one(item)`
+# so one bad write cannot fail the others. A caller is only answered after its
+# transaction committed.
+
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+class GroupCommitter:
+    """Single committer thread batching writes submitted by request threads"""
+
+    def __init__(self, app, apply_batch, apply_one, window=0.005, max_batch=100, timeout=30.0):
+        self.app = app
+        self.apply_batch = apply_batch
+        self.apply_one = apply_one
+        self.window = window
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+
+    @property
+    def running(self):
+        # Threads do not survive fork, so a committer started in another process is not ours
+        return self._pid == os.getpid() and self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the committer thread in this process (idempotent)"""
+        with self._lock:
+            if self.running:
+                return
+            self._pid = os.getpid()
+            self._queue = queue.Queue()
+            self._thread = threading.Thread(target=self._run, name='group-committer', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        if self.running:
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+    def submit(self, item):
+        """Queue item for the next batch and return its result once committed (re-raises its error)"""
+        if not self.running:
+            self.start()
+        future = Future()
+        self._queue.put((item, future))
+        return future.result(self.timeout)
+
+    def stats(self):
+        return {
+            'batches': self.batches,
+            'items': self.items,
+            'average_batch': round(self.items / self.batches, 2) if self.batches else 0.0,
+            'pending': self._queue.qsize()
+        }
+
+    def _collect(self, first):
+        """first plus whatever arrives within the window, up to max_batch entries"""
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is None:
+                # Stop after this batch
+                self._queue.put(None)
+                break
+            batch.append(entry)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [(item, future) for item, future in self._collect(first)
+                     if future.set_running_or_notify_cancel()]
+            if batch:
+                self._commit(batch)
+
+    def _commit(self, batch):
+        try:
+            with self.app.app_context():
+                results = self.apply_batch([item for item, _ in batch])
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+            else:
+                logger.warning('Group commit of %d items failed (%s); committing them one by one', len(batch), e)
+                for item, future in batch:
+                    try:
+                        with self.app.app_context():
+                            future.set_result(self.apply_one(item))
+                    except Exception as item_error:
+                        future.set_exception(item_error)
+
+        self.batches += 1
+        self.items += len(batch)
@@ -0,0 +1,46 @@
+# Gunicorn configuration for the ML-Based Early Warning System
+#
+# The app (and the active model) is loaded once in the master and inherited
+# copy-on-write by every worker, so a node keeps one physical copy of the
+# read-only model instead of one per worker.
+#
+# With METRICS_MULTIPROC_DIR set, workers share their /metrics snapshots
+# through that directory; it is cleared when the server starts.
+
+import gc
+import os
+import sys
+
+from memory_usage import process_memory, format_memory
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_CONCURRENCY', 4))
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') != '0'
+
+
+def on_starting(server):
+    metrics_dir = os.environ.get('METRICS_MULTIPROC_DIR')
+    if metrics_dir and os.path.isdir(metrics_dir):
+        for name in os.listdir(metrics_dir):
+            if name.startswith('metrics-') and name.endswith('.json'):
+                os.remove(os.path.join(metrics_dir, name))
+
+
+def when_ready(server):
+    server.log.info(f"Master memory after app load: {format_memory(process_memory())}")
+    if preload_app:
+        # Move preloaded objects out of the collector's reach so that
+        # collections in the workers do not dirty (and copy) shared pages
+        gc.freeze()
+
+
+def post_worker_init(worker):
+    worker.log.info(f"Worker {worker.pid} memory at start: {format_memory(process_memory())}")
+
+
+def worker_exit(server, worker):
+    server.log.info(f"Worker {worker.pid} memory at exit: {format_memory(process_memory())}")
+    # Keep the worker's final counts in the shared metrics directory
+    app = sys.modules.get('app')
+    if app is not None:
+        app.metrics_registry.flush(force=True)
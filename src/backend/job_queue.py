@@ -0,0 +1,70 @@
+# Background job worker pool for the ML-Based Early Warning System
+#
+# Jobs live in the application database; this module only runs the worker
+# threads. Each thread repeatedly asks `process_next` to claim and run one
+# job, and sleeps until notified or until the poll interval passes when the
+# queue is empty (jobs enqueued by other processes are found by polling).
+
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorkerPool:
+    """Fixed-size pool of daemon threads draining a durable job queue"""
+
+    def __init__(self, app, process_next, workers=2, poll_interval=1.0):
+        self.app = app
+        self.process_next = process_next
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        # Threads do not survive fork, so a pool started in another process is not ours
+        return self._pid == os.getpid() and any(t.is_alive() for t in self._threads)
+
+    def start(self):
+        """Start the worker threads in this process (idempotent)"""
+        with self._lock:
+            if self.workers <= 0 or self.running:
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._threads = [
+                threading.Thread(target=self._run, name=f'job-worker-{i}', daemon=True)
+                for i in range(self.workers)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def notify(self):
+        """Wake idle workers after a job was enqueued in this process"""
+        self._wakeup.set()
+
+    def _run(self):
+        name = f'{os.getpid()}:{threading.current_thread().name}'
+        while not self._stop.is_set():
+            try:
+                with self.app.app_context():
+                    processed = self.process_next(name)
+            except Exception:
+                logger.exception('Job worker %s failed to process a job', name)
+                processed = False
+
+            if not processed:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
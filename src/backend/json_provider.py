@@ -0,0 +1,98 @@
+# JSON providers for the ML-Based Early Warning System
+#
+# OrjsonProvider serializes responses with orjson, which is several times
+# faster than the json module and writes bytes directly. StdlibJSONProvider is
+# Flask's default provider with the same output conventions, used when orjson
+# is not installed. Both write datetimes as ISO 8601 (Flask's default would
+# write HTTP dates) and NumPy scalars and arrays as numbers, so rows can be
+# serialized straight from query results. `dumps_line` encodes one record as
+# a newline-terminated line for NDJSON streaming.
+
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, datetime
+
+import numpy as np
+from flask.json.provider import DefaultJSONProvider
+
+PROVIDERS = ('auto', 'orjson', 'stdlib')
+
+
+def _default(o):
+    if isinstance(o, (datetime, date)):
+        return o.isoformat()
+    if isinstance(o, np.generic):
+        return o.item()
+    if isinstance(o, np.ndarray):
+        return o.tolist()
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """Flask's json-module provider, with ISO 8601 datetimes and NumPy support"""
+
+    default = staticmethod(_default)
+
+    def dumps_line(self, obj):
+        return (self.dumps(obj) + '\n').encode('utf-8')
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """orjson-backed provider; falls back to the json module for what orjson rejects"""
+
+    def __init__(self, app):
+        super().__init__(app)
+        import orjson
+        self._orjson = orjson
+
+    def _options(self, indent=False):
+        options = self._orjson.OPT_SERIALIZE_NUMPY | self._orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= self._orjson.OPT_SORT_KEYS
+        if indent:
+            options |= self._orjson.OPT_INDENT_2
+        return options
+
+    def _dumps(self, obj, indent=False):
+        return self._orjson.dumps(obj, default=_default, option=self._options(indent))
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # json.dumps-only arguments (cls, separators, ...)
+            kwargs.setdefault('default', _default)
+            return json.dumps(obj, **kwargs)
+        return self._dumps(obj).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return self._orjson.loads(s)
+
+    def dumps_line(self, obj):
+        return self._dumps(obj) + b'\n'
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(self._dumps(obj, indent) + b'\n', mimetype=self.mimetype)
+
+
+def make_json_provider(app, name='auto'):
+    """Provider instance for JSON_PROVIDER: 'orjson', 'stdlib' or 'auto' (orjson when installed)"""
+    if name not in PROVIDERS:
+        raise ValueError(f'JSON provider must be one of {", ".join(PROVIDERS)}')
+    if name in ('auto', 'orjson'):
+        try:
+            return OrjsonProvider(app)
+        except ImportError:
+            if name == 'orjson':
+                raise RuntimeError('JSON_PROVIDER is orjson but the orjson package is not installed')
+    return StdlibJSONProvider(app)
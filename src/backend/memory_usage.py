@@ -0,0 +1,54 @@
+# Process memory reporting for the ML-Based Early Warning System
+
+import os
+import resource
+
+
+def process_memory(pid='self'):
+    """Return resident memory of a process in KiB.
+
+    On Linux this reads /proc/<pid>/smaps_rollup, which separates pages shared
+    with other processes (e.g. a preloaded or memory-mapped model) from
+    private ones. Elsewhere only the peak RSS of the current process is known.
+    """
+    path = f'/proc/{pid}/smaps_rollup'
+    if os.path.exists(path):
+        fields = {}
+        with open(path) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == 'kB':
+                    fields[parts[0].rstrip(':')] = int(parts[1])
+        return {
+            'rss_kb': fields.get('Rss', 0),
+            'pss_kb': fields.get('Pss', 0),
+            'shared_kb': fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0),
+            'private_kb': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+        }
+
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if os.uname().sysname == 'Darwin':
+        max_rss //= 1024
+    return {'rss_kb': max_rss, 'pss_kb': None, 'shared_kb': None, 'private_kb': None}
+
+
+def current_rss_kb():
+    """Resident memory of this process in KiB, cheap enough to poll.
+
+    Falls back to the peak RSS where /proc/self/statm does not exist.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * (os.sysconf('SC_PAGE_SIZE') // 1024)
+    except (OSError, ValueError, IndexError):
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss // 1024 if os.uname().sysname == 'Darwin' else max_rss
+
+
+def format_memory(stats):
+    """One-line summary of process_memory() output"""
+    return ' '.join(
+        f"{key[:-3]}={value / 1024:.1f}MiB"
+        for key, value in stats.items() if value is not None
+    )
@@ -0,0 +1,92 @@
+# Vectorized metric trends for the ML-Based Early Warning System
+#
+# A project's analysis history is read as a timestamp vector and an
+# (N x series) value matrix; one least-squares pass over all columns gives
+# every series' slope, and the means of the latest and previous windows give
+# a rolling delta. Nothing loops over rows in Python.
+
+from datetime import datetime
+
+import numpy as np
+
+from risk_rules import FEATURE_NAMES, RISK_RULES
+
+# Series tracked per analysis: the model features plus the resulting score
+TREND_SERIES = FEATURE_NAMES + ['risk_score']
+
+# Whether a rising value means rising risk (from the rule ladders' direction)
+HIGHER_IS_WORSE = {feature: direction == 'above' for feature, direction, _, _ in RISK_RULES}
+HIGHER_IS_WORSE['risk_score'] = True
+
+# Fitted change over the span below this share of the mean counts as stable
+STABLE_THRESHOLD = 0.05
+
+SECONDS_PER_DAY = 86400.0
+EPOCH = datetime(1970, 1, 1)
+
+
+def as_history(timestamps, values, columns=len(TREND_SERIES)):
+    """Naive UTC datetimes + rows -> (days since first point, float matrix); rows with gaps are dropped"""
+    values = np.asarray(values, dtype=float).reshape(len(timestamps), columns)
+    # Much faster than converting datetime objects through datetime64
+    seconds = np.fromiter(
+        ((ts - EPOCH).total_seconds() for ts in timestamps), dtype=float, count=len(timestamps)
+    )
+    complete = ~np.isnan(values).any(axis=1)
+    seconds, values = seconds[complete], values[complete]
+    days = (seconds - seconds[0]) / SECONDS_PER_DAY if len(seconds) else seconds
+    return days, values
+
+
+def slopes(days, values):
+    """Least-squares slope per unit of days for every column at once"""
+    if len(days) < 2:
+        return np.zeros(values.shape[1])
+    x = days - days.mean()
+    denominator = x @ x
+    if denominator == 0:
+        return np.zeros(values.shape[1])
+    return x @ (values - values.mean(axis=0)) / denominator
+
+
+def window_deltas(values, window):
+    """Mean of the latest `window` points minus the mean of the `window` before them"""
+    if len(values) < 2:
+        recent = values[-1] if len(values) else np.zeros(values.shape[1])
+        return np.zeros(values.shape[1]), recent
+    window = max(min(window, len(values) // 2), 1)
+    recent = values[-window:].mean(axis=0)
+    previous = values[-2 * window:-window].mean(axis=0)
+    return recent - previous, recent
+
+
+def compute_trends(days, values, names=TREND_SERIES, window=10, stable_threshold=STABLE_THRESHOLD):
+    """Per-series slope, rolling delta and direction for a history matrix"""
+    slope = slopes(days, values)
+    delta, recent = window_deltas(values, window)
+    span = days[-1] - days[0] if len(days) else 0.0
+    scale = np.abs(values.mean(axis=0)) if len(values) else np.zeros(values.shape[1])
+    # Relative fitted change over the whole span; guard against all-zero series
+    relative = np.divide(np.abs(slope * span), scale, out=np.zeros_like(slope), where=scale > 1e-12)
+
+    trends = []
+    for i, name in enumerate(names):
+        if relative[i] < stable_threshold:
+            trend = 'stable'
+        else:
+            trend = 'increasing' if slope[i] > 0 else 'decreasing'
+
+        if trend == 'stable':
+            assessment = 'stable'
+        else:
+            assessment = 'worsening' if (trend == 'increasing') == HIGHER_IS_WORSE.get(name, True) else 'improving'
+
+        trends.append({
+            'name': name,
+            'slope_per_day': float(slope[i]),
+            'window_delta': float(delta[i]),
+            'recent_mean': float(recent[i]),
+            'trend': trend,
+            'assessment': assessment
+        })
+    return trends
@@ -0,0 +1,233 @@
+# Prometheus-style metrics for the ML-Based Early Warning System
+#
+# A small dependency-free registry of counters, gauges and histograms, with
+# exposition in the Prometheus text format (version 0.0.4). Updates take one
+# lock and a dict lookup, so instrumenting a request costs microseconds.
+#
+# gunicorn runs several worker processes, and a scrape reaches only one of
+# them. With a shared `directory`, every worker periodically writes its
+# snapshot to <directory>/metrics-<pid>.json, and the worker serving /metrics
+# merges all the files: counters and histograms are summed, and gauges take
+# the most recent value. Files of workers that exited are kept, so totals
+# never go backwards. Clear the directory when the server starts.
+
+import json
+import math
+import os
+import threading
+import time
+
+# Seconds; spans a cached endpoint up to a slow GitHub sync
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in pairs
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'type': self.kind,
+                'help': self.documentation,
+                'labels': list(self.labelnames),
+                'samples': [[list(key), value] for key, value in self._snapshot_values()]
+            }
+
+    def _snapshot_values(self):
+        return list(self._values.items())
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            # The timestamp picks the newest value when workers are merged
+            self._values[key] = [value, time.time()]
+
+    def _snapshot_values(self):
+        return [(key, list(value)) for key, value in self._values.items()]
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        # Non-cumulative bucket counts; the last slot is +Inf
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def snapshot(self):
+        snapshot = super().snapshot()
+        snapshot['buckets'] = list(self.buckets)
+        return snapshot
+
+    def _snapshot_values(self):
+        return [(key, [list(state[0]), state[1], state[2]]) for key, state in self._values.items()]
+
+
+def merge_snapshots(snapshots):
+    """Combine per-process snapshots: sum counters and histograms, newest gauge value wins"""
+    merged = {}
+    for snapshot in snapshots:
+        for name, metric in snapshot.items():
+            target = merged.setdefault(name, {**metric, 'samples': {}})
+            samples = target['samples']
+            for labels, value in metric['samples']:
+                key = tuple(labels)
+                current = samples.get(key)
+                if current is None:
+                    samples[key] = json.loads(json.dumps(value))
+                elif metric['type'] == 'counter':
+                    samples[key] = current + value
+                elif metric['type'] == 'gauge':
+                    samples[key] = value if value[1] > current[1] else current
+                elif len(current[0]) == len(value[0]):
+                    samples[key] = [[a + b for a, b in zip(current[0], value[0])], current[1] + value[1],
+                                    current[2] + value[2]]
+    for metric in merged.values():
+        metric['samples'] = [[list(key), value] for key, value in metric['samples'].items()]
+    return merged
+
+
+def render(snapshot):
+    """Prometheus text exposition of a (merged) snapshot"""
+    lines = []
+    for name, metric in sorted(snapshot.items()):
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        labelnames = metric['labels']
+        for labels, value in metric['samples']:
+            if metric['type'] == 'counter':
+                lines.append(f"{name}{_format_labels(labelnames, labels)} {_format_value(value)}")
+            elif metric['type'] == 'gauge':
+                lines.append(f"{name}{_format_labels(labelnames, labels)} {_format_value(value[0])}")
+            else:
+                counts, total, count = value
+                cumulative = 0
+                for bound, bucket_count in zip(list(metric['buckets']) + [math.inf], counts):
+                    cumulative += bucket_count
+                    le = (('le', _format_value(float(bound))),)
+                    lines.append(f"{name}_bucket{_format_labels(labelnames, labels, le)} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labelnames, labels)} {_format_value(float(total))}")
+                lines.append(f"{name}_count{_format_labels(labelnames, labels)} {count}")
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsRegistry:
+    """Named metrics of one process, optionally shared with sibling workers through a directory"""
+
+    def __init__(self, directory=None, flush_interval=5.0):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f'Metric {metric.name} is already registered')
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def snapshot(self):
+        """This process's metric values"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.snapshot() for metric in metrics}
+
+    def flush(self, force=False):
+        """Write this process's snapshot to the shared directory (throttled unless forced)"""
+        now = time.monotonic()
+        if not self.directory or (not force and now - self._last_flush < self.flush_interval):
+            return
+        self._last_flush = now
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f'metrics-{os.getpid()}.json')
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    def collect(self):
+        """Snapshot of every worker sharing the directory (or just this process)"""
+        if not self.directory:
+            return self.snapshot()
+
+        self.flush(force=True)
+        snapshots = []
+        for name in os.listdir(self.directory):
+            if name.startswith('metrics-') and name.endswith('.json'):
+                try:
+                    with open(os.path.join(self.directory, name)) as f:
+                        snapshots.append(json.load(f))
+                except (OSError, ValueError):
+                    # Being replaced by its worker right now
+                    continue
+        return merge_snapshots(snapshots)
+
+    def exposition(self):
+        """Prometheus text format of collect()"""
+        return render(self.collect())
@@ -0,0 +1,128 @@
+# Versioned on-disk model registry for the ML-Based Early Warning System
+#
+# Layout:
+#   <root>/versions/<version>/models.joblib   RF/XGB pair, compiled trees and feature names
+#   <root>/versions/<version>/metadata.json   training metadata
+#   <root>/ACTIVE                             name of the active version
+
+import json
+import os
+import uuid
+from datetime import datetime
+
+MODEL_FILE = 'models.joblib'
+METADATA_FILE = 'metadata.json'
+ACTIVE_FILE = 'ACTIVE'
+
+
+class ModelRegistryError(Exception):
+    """Raised when a model version cannot be saved, found or activated"""
+
+
+class ModelRegistry:
+    """Stores RiskPredictor model versions on local disk"""
+
+    def __init__(self, root):
+        self.root = root
+        self.versions_dir = os.path.join(root, 'versions')
+
+    def _version_dir(self, version):
+        return os.path.join(self.versions_dir, version)
+
+    def list_versions(self):
+        """Return the stored versions, oldest first"""
+        if not os.path.isdir(self.versions_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(self.versions_dir)
+            if not name.startswith('.') and os.path.isdir(self._version_dir(name))
+        )
+
+    def get_metadata(self, version):
+        """Return the metadata stored with a version"""
+        path = os.path.join(self._version_dir(version), METADATA_FILE)
+        if not os.path.exists(path):
+            raise ModelRegistryError(f'Model version {version} not found')
+        with open(path) as f:
+            return json.load(f)
+
+    def get_active_version(self):
+        """Return the active version name, or None if nothing is active"""
+        try:
+            with open(os.path.join(self.root, ACTIVE_FILE)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def save(self, predictor, metadata=None, version=None):
+        """Persist a trained predictor as a new version and return its name"""
+        if predictor.rf_model is None or predictor.xgb_model is None:
+            raise ModelRegistryError('Cannot save an untrained predictor')
+
+        version = version or datetime.utcnow().strftime('v%Y%m%dT%H%M%S%f')
+        final_dir = self._version_dir(version)
+        if os.path.exists(final_dir):
+            raise ModelRegistryError(f'Model version {version} already exists')
+
+        # Write into a hidden staging directory and rename it into place so
+        # that readers never observe a partially written version
+        os.makedirs(self.versions_dir, exist_ok=True)
+        staging_dir = os.path.join(self.versions_dir, f'.staging-{uuid.uuid4().hex}')
+        os.makedirs(staging_dir)
+
+        import joblib
+
+        # Uncompressed so that arrays can be memory-mapped on load
+        joblib.dump({
+            'rf_model': predictor.rf_model,
+            'xgb_model': predictor.xgb_model,
+            # Flat node arrays for the compiled engine (mmap friendly)
+            'compiled': predictor.compiled,
+            # Served ensemble weights and the latencies they were chosen by
+            'ensemble': getattr(predictor, 'ensemble', None),
+            # Training feature profile for the input-drift monitor
+            'drift_reference': getattr(predictor, 'drift_reference', None),
+            'feature_names': list(predictor.feature_names)
+        }, os.path.join(staging_dir, MODEL_FILE))
+
+        with open(os.path.join(staging_dir, METADATA_FILE), 'w') as f:
+            json.dump({
+                **(predictor.metadata or {}),
+                **(metadata or {}),
+                'version': version,
+                'feature_names': list(predictor.feature_names),
+                'saved_at': datetime.utcnow().isoformat()
+            }, f, indent=2)
+
+        os.rename(staging_dir, final_dir)
+        return version
+
+    def load(self, version, mmap_mode=None):
+        """Load the model bundle of a version.
+
+        With mmap_mode='r', NumPy arrays in the bundle are mapped read-only
+        from the (uncompressed) file, so every process on the node shares one
+        copy through the page cache.
+        """
+        path = os.path.join(self._version_dir(version), MODEL_FILE)
+        if not os.path.exists(path):
+            raise ModelRegistryError(f'Model version {version} not found')
+        # Deferred with the model libraries it unpickles; processes without a model never import them
+        import joblib
+        bundle = joblib.load(path, mmap_mode=mmap_mode)
+        bundle['metadata'] = self.get_metadata(version)
+        bundle['version'] = version
+        return bundle
+
+    def activate(self, version):
+        """Atomically point ACTIVE at an existing version"""
+        if version not in self.list_versions():
+            raise ModelRegistryError(f'Model version {version} not found')
+
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = os.path.join(self.root, f'.{ACTIVE_FILE}.{uuid.uuid4().hex}')
+        with open(tmp_path, 'w') as f:
+            f.write(version)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(self.root, ACTIVE_FILE))
@@ -0,0 +1,115 @@
+# Bounded bcrypt hashing pool for the ML-Based Early Warning System
+#
+# bcrypt is deliberately CPU-expensive. Running it inline lets a login burst
+# occupy every web worker, so requests that need no hashing queue up behind
+# it. Hashes are computed in a small process pool instead; at most
+# `max_pending` hashes may be running or queued per web process, and callers
+# beyond that are turned away immediately with PasswordHasherBusy. A slot is
+# held until its hash has left the pool, not just until the caller gave up
+# waiting. If a pool worker dies (OOM killer, signal) the pool is replaced and
+# the hash retried once.
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+import bcrypt
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full or a hash took too long"""
+
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        super().__init__('Authentication is busy, please retry shortly')
+
+
+def _hash_password(password, rounds):
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
+
+
+def _check_password(password_hash, password):
+    return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+
+
+def hash_rounds(password_hash):
+    """Cost factor of a stored $2b$<rounds>$... hash, or None if unrecognised"""
+    parts = password_hash.split('$')
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class PasswordHasher:
+    """bcrypt in a size-bounded process pool (workers=0 hashes inline)"""
+
+    def __init__(self, rounds=12, workers=2, max_pending=16, timeout=10.0, retry_after=1):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+
+    def _pool(self):
+        # Pools do not survive fork: each gunicorn worker starts its own on first use
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                # spawn, not fork: the web process has other threads running
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+    def _discard(self, executor):
+        # A broken pool fails every job; the next call starts a fresh one
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def _submit(self, executor, func, *args):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy(self.retry_after)
+        try:
+            future = executor.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _run(self, func, *args):
+        if self.workers <= 0:
+            return func(*args)
+
+        for attempt in range(2):
+            executor = self._pool()
+            try:
+                future = self._submit(executor, func, *args)
+                return future.result(timeout=self.timeout)
+            except TimeoutError:
+                # Drop it if it has not started; a running hash keeps its slot until it finishes
+                future.cancel()
+                raise PasswordHasherBusy(self.retry_after)
+            except BrokenProcessPool:
+                self._discard(executor)
+        raise PasswordHasherBusy(self.retry_after)
+
+    def hash(self, password):
+        """bcrypt hash of password at the configured cost"""
+        return self._run(_hash_password, password, self.rounds)
+
+    def check(self, password_hash, password):
+        """Whether password matches the stored hash"""
+        return self._run(_check_password, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """Whether a stored hash was made with a different cost than configured"""
+        return hash_rounds(password_hash) != self.rounds
@@ -0,0 +1,131 @@
+# Prediction cache for the ML-Based Early Warning System
+#
+# Caches complete analysis results keyed by model version and the feature
+# vector rounded to a configurable precision, so repeated analyses of the
+# same (or nearly the same) metrics skip prediction and rule evaluation.
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class RedisCacheBackend:
+    """Shared second-level cache so that all workers see each other's results"""
+
+    def __init__(self, url, ttl, prefix='prediction:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('PREDICTION_CACHE_REDIS_URL is set but the redis package is not installed')
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, key):
+        version, features = key
+        return self.prefix + version + ':' + ','.join(repr(f) for f in features)
+
+    def get(self, key):
+        raw = self.client.get(self._key(key))
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value):
+        self.client.set(self._key(key), json.dumps(value), ex=max(int(self.ttl), 1))
+
+
+class PredictionCache:
+    """Bounded LRU cache with per-entry TTL and hit/miss counters"""
+
+    def __init__(self, max_entries=10000, ttl=300, precision=2, backend=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.precision = precision
+        self.backend = backend
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.backend_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    def make_key(self, model_version, features):
+        """Cache key for a feature vector, or None if it is not numeric"""
+        try:
+            return model_version, tuple(round(float(f), self.precision) for f in features)
+        except (TypeError, ValueError):
+            return None
+
+    def get(self, key):
+        """Return the cached result for key, or None"""
+        if not self.enabled or key is None:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+
+        if self.backend is not None:
+            value = self.backend.get(key)
+            if value is not None:
+                self._store(key, value, now)
+                with self._lock:
+                    self.hits += 1
+                    self.backend_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, value):
+        """Cache a result locally and in the shared backend"""
+        if not self.enabled or key is None:
+            return
+        self._store(key, value, time.monotonic())
+        if self.backend is not None:
+            self.backend.set(key, value)
+
+    def _store(self, key, value, now):
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl,
+                'precision': self.precision,
+                'shared_backend': self.backend is not None,
+                'hits': self.hits,
+                'misses': self.misses,
+                'backend_hits': self.backend_hits,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,73 @@
+# Slow-request profiler for the ML-Based Early Warning System
+#
+# Runs a sampled share of requests under cProfile and keeps the profile only
+# when the request took longer than the threshold. Dumps are standard pstats
+# files (`python -m pstats <file>`, snakeviz, ...). Only the newest
+# `max_files` are kept. cProfile slows the profiled request down noticeably,
+# so the profiler is off unless a threshold is configured.
+
+import cProfile
+import os
+import random
+import re
+import threading
+import time
+
+
+class SlowRequestProfiler:
+    """Profile requests and keep cProfile dumps of those slower than threshold_ms"""
+
+    def __init__(self, directory, threshold_ms, sample_rate=1.0, max_files=100):
+        self.directory = directory
+        self.threshold = threshold_ms / 1000.0
+        self.sample_rate = sample_rate
+        self.max_files = max_files
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.dumped = 0
+
+    def start(self):
+        """Begin profiling the current thread's request (if sampled)"""
+        self._local.profile = None
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is already active on this thread
+            return
+        self._local.profile = profile
+        self._local.started = time.perf_counter()
+
+    def stop(self, label):
+        """Stop profiling; returns the dump path if the request was slow enough, else None"""
+        profile = getattr(self._local, 'profile', None)
+        if profile is None:
+            return None
+        profile.disable()
+        self._local.profile = None
+        elapsed = time.perf_counter() - self._local.started
+        if elapsed < self.threshold:
+            return None
+
+        safe_label = re.sub(r'[^A-Za-z0-9]+', '_', label).strip('_') or 'request'
+        name = f'{time.strftime("%Y%m%dT%H%M%S")}-{os.getpid()}-{safe_label}-{int(elapsed * 1000)}ms.prof'
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, name)
+        profile.dump_stats(path)
+        with self._lock:
+            self.dumped += 1
+            self._prune()
+        return path
+
+    def _prune(self):
+        files = sorted(
+            (entry for entry in os.scandir(self.directory) if entry.name.endswith('.prof')),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        for entry in files[:max(len(files) - self.max_files, 0)]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
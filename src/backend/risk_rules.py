@@ -0,0 +1,170 @@
+# Declarative rule engine for the ML-Based Early Warning System
+# Vectorized evaluation of the fallback risk score, warnings and recommendations
+
+import numpy as np
+
+# Feature order shared with RiskPredictor.feature_names
+FEATURE_NAMES = [
+    'commit_frequency',
+    'contributor_activity',
+    'issue_resolution_time',
+    'code_churn',
+    'open_issues_ratio'
+]
+FEATURE_INDEX = {name: i for i, name in enumerate(FEATURE_NAMES)}
+
+# ============================================================================
+# RULE TABLES
+# ============================================================================
+
+# Risk score ladders: (feature, direction, ascending thresholds, points per bucket)
+# 'below' scores value < threshold, 'above' scores value > threshold.
+# Points are listed from the lowest bucket to the highest one.
+RISK_RULES = [
+    # Commit frequency (lower is worse)
+    ('commit_frequency', 'below', [2, 4, 6], [25, 15, 5, 0]),
+    # Contributor activity (lower is worse)
+    ('contributor_activity', 'below', [40, 60, 80], [30, 20, 10, 0]),
+    # Issue resolution time (higher is worse)
+    ('issue_resolution_time', 'above', [7, 10, 14], [0, 5, 15, 25]),
+    # Code churn (very high is unstable)
+    ('code_churn', 'above', [300, 500], [0, 5, 10]),
+    # Open issues ratio (higher is worse)
+    ('open_issues_ratio', 'above', [0.3, 0.4], [0, 5, 10]),
+]
+
+MAX_RISK_SCORE = 100
+
+# Warning conditions: (feature, direction, threshold, warning, recommendations)
+# Bit i of a warning/recommendation mask is set when condition i holds.
+CONDITION_RULES = [
+    ('contributor_activity', 'below', 50,
+     "Declining contributor activity detected - engagement is below healthy levels",
+     ["Increase team collaboration through daily standups or weekly syncs",
+      "Consider bringing in additional contributors or redistributing workload"]),
+    ('open_issues_ratio', 'above', 0.3,
+     "Increasing number of unresolved issues - backlog is growing",
+     ["Prioritize and address open issues - consider triage meeting",
+      "Review issue management workflow for bottlenecks"]),
+    ('issue_resolution_time', 'above', 10,
+     "Delayed issue resolution times - average resolution taking too long",
+     ["Optimize bug resolution workflow to reduce average resolution time",
+      "Implement automated testing to catch issues earlier"]),
+    ('commit_frequency', 'below', 3,
+     "Low commit frequency - development activity is declining",
+     ["Establish regular development cadence with consistent commit schedule",
+      "Break down large tasks into smaller, more frequent commits"]),
+    ('code_churn', 'above', 400,
+     "High code churn detected - potential instability in codebase",
+     ["Review code review practices to reduce unnecessary changes",
+      "Stabilize architecture before adding new features"]),
+]
+
+# Raised when the score is high but no individual condition fired
+HIGH_RISK_THRESHOLD = 70
+HIGH_RISK_WARNING = "Multiple risk factors detected - comprehensive review recommended"
+HIGH_RISK_BIT = len(CONDITION_RULES)
+
+HEALTHY_RECOMMENDATIONS = [
+    "Project is healthy - maintain current development practices",
+    "Continue regular contributions and active issue management"
+]
+MAX_RECOMMENDATIONS = 5
+
+
+def _build_message_tables():
+    """Precompute the message list for every possible mask"""
+    warning_table = []
+    for mask in range(1 << (HIGH_RISK_BIT + 1)):
+        messages = [rule[3] for bit, rule in enumerate(CONDITION_RULES) if mask & (1 << bit)]
+        if mask & (1 << HIGH_RISK_BIT):
+            messages.append(HIGH_RISK_WARNING)
+        warning_table.append(tuple(messages))
+
+    recommendation_table = []
+    for mask in range(1 << len(CONDITION_RULES)):
+        messages = []
+        for bit, rule in enumerate(CONDITION_RULES):
+            if mask & (1 << bit):
+                messages.extend(rule[4])
+        recommendation_table.append(tuple((messages or HEALTHY_RECOMMENDATIONS)[:MAX_RECOMMENDATIONS]))
+
+    return warning_table, recommendation_table
+
+
+WARNING_MESSAGES, RECOMMENDATION_MESSAGES = _build_message_tables()
+
+
+# ============================================================================
+# VECTORIZED EVALUATION
+# ============================================================================
+
+def as_feature_matrix(features):
+    """Coerce a single feature vector or a batch into an (N x 5) float array"""
+    return np.asarray(features, dtype=float).reshape(-1, len(FEATURE_NAMES))
+
+
+def _condition(values, direction, threshold):
+    if direction == 'below':
+        return values < threshold
+    return values > threshold
+
+
+def rule_based_points(X):
+    """Points each feature adds to the fallback risk score, shape (N x 5)"""
+    X = as_feature_matrix(X)
+    points_matrix = np.zeros(X.shape)
+
+    for feature, direction, thresholds, points in RISK_RULES:
+        column = FEATURE_INDEX[feature]
+        values = X[:, column]
+        # 'below' buckets are [t_i, t_i+1), 'above' buckets are (t_i, t_i+1]
+        buckets = np.digitize(values, thresholds, right=(direction == 'above'))
+        # NaN never satisfies a comparison, so it never scores
+        points_matrix[:, column] += np.where(np.isnan(values), 0, np.asarray(points, dtype=float)[buckets])
+
+    return points_matrix
+
+
+def rule_based_scores(X):
+    """Fallback risk scores (0-100) for every row of X"""
+    return np.minimum(rule_based_points(X).sum(axis=1), MAX_RISK_SCORE)
+
+
+def rule_based_contributions(X):
+    """Per-feature share of the fallback score, scaled down where the cap applies"""
+    points = rule_based_points(X)
+    totals = points.sum(axis=1, keepdims=True)
+    scale = np.divide(MAX_RISK_SCORE, totals, out=np.ones_like(totals), where=totals > MAX_RISK_SCORE)
+    return points * scale
+
+
+def condition_masks(X):
+    """Bitmask of the CONDITION_RULES that hold for every row of X"""
+    X = as_feature_matrix(X)
+    masks = np.zeros(len(X), dtype=np.int64)
+
+    for bit, (feature, direction, threshold, _, _) in enumerate(CONDITION_RULES):
+        values = X[:, FEATURE_INDEX[feature]]
+        masks |= _condition(values, direction, threshold).astype(np.int64) << bit
+
+    return masks
+
+
+def warning_masks(X, risk_scores, conditions=None):
+    """Warning bitmask for every row, including the high risk catch-all"""
+    if conditions is None:
+        conditions = condition_masks(X)
+    risk_scores = np.asarray(risk_scores, dtype=float).reshape(-1)
+    catch_all = (conditions == 0) & (risk_scores > HIGH_RISK_THRESHOLD)
+    return conditions | (catch_all.astype(np.int64) << HIGH_RISK_BIT)
+
+
+def decode_warnings(masks):
+    """Map warning masks to lists of warning messages"""
+    return [list(WARNING_MESSAGES[mask]) for mask in np.asarray(masks).reshape(-1).tolist()]
+
+
+def decode_recommendations(masks):
+    """Map condition masks to lists of recommendations"""
+    return [list(RECOMMENDATION_MESSAGES[mask]) for mask in np.asarray(masks).reshape(-1).tolist()]
@@ -0,0 +1,145 @@
+# Periodic re-analysis scheduler for the ML-Based Early Warning System
+#
+# Every tick the scheduler picks the projects whose analysis is most overdue
+# (staleness weighted by risk level) and enqueues background sync jobs for
+# them. The number of jobs per tick is paced so that the GitHub calls they
+# need are spread evenly over the time left until the rate limit resets,
+# keeping a reserve of the budget for interactive requests.
+
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+# Higher risk projects are re-analyzed more often
+RISK_WEIGHTS = {'high': 3.0, 'medium': 2.0, 'low': 1.0}
+
+
+def priority(last_analyzed, risk_level, now):
+    """Risk-weighted staleness in hours (never analyzed projects come first)"""
+    if last_analyzed is None:
+        return math.inf
+    hours = (now - last_analyzed).total_seconds() / 3600
+    return hours * RISK_WEIGHTS.get(risk_level, 1.0)
+
+
+class ScanScheduler:
+    """Rate-limit-aware pacing of repository re-analysis jobs.
+
+    ``list_candidates(cutoff)`` returns ``(project_id, last_analyzed, risk_level)``
+    tuples of projects that have a repository, no pending job and were not
+    analyzed after ``cutoff``; ``enqueue(project_ids)`` queues their jobs and
+    ``get_budget()`` returns ``(limit, remaining, reset_epoch)`` of the GitHub
+    rate limit, net of calls already promised to queued jobs.
+    """
+
+    def __init__(self, app, list_candidates, enqueue, get_budget, interval=60, min_age_hours=6,
+                 calls_per_sync=6, reserve=0.2, max_per_tick=50):
+        self.app = app
+        self.list_candidates = list_candidates
+        self.enqueue = enqueue
+        self.get_budget = get_budget
+        self.interval = interval
+        self.min_age_hours = min_age_hours
+        self.calls_per_sync = calls_per_sync
+        self.reserve = reserve
+        self.max_per_tick = max_per_tick
+
+        self._credit = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.ticks = 0
+        self.enqueued_total = 0
+        self.last_tick = None
+
+    @property
+    def running(self):
+        return self._pid == os.getpid() and self._thread is not None and self._thread.is_alive()
+
+    def cutoff(self, now):
+        """Latest last_analyzed that can be due (highest risk weight, shortest age)"""
+        return now - timedelta(hours=self.min_age_hours / max(RISK_WEIGHTS.values()))
+
+    def allowance(self, now_epoch=None):
+        """Syncs this tick may start without outrunning the rate limit"""
+        now_epoch = now_epoch or time.time()
+        limit, remaining, reset = self.get_budget()
+        if remaining is None:
+            # Unknown budget (e.g. stand-in server without headers): no pacing
+            return self.max_per_tick, {'limit': None, 'remaining': None, 'reset': None}
+
+        usable = max(remaining - self.reserve * (limit or 0), 0)
+        ticks_until_reset = max((reset or now_epoch) - now_epoch, self.interval) / self.interval
+        # Carry fractional syncs over so slow paces still make progress
+        self._credit = min(self._credit + usable / self.calls_per_sync / ticks_until_reset, self.max_per_tick)
+        allowed = int(self._credit)
+        self._credit -= allowed
+        return allowed, {'limit': limit, 'remaining': remaining, 'reset': reset, 'usable': usable}
+
+    def due(self, candidates, now):
+        """Candidates past their risk-adjusted minimum age, most overdue first"""
+        scored = []
+        for project_id, last_analyzed, risk_level in candidates:
+            score = priority(last_analyzed, risk_level, now)
+            if score >= self.min_age_hours:
+                scored.append((score, project_id))
+        scored.sort(reverse=True)
+        return [project_id for _, project_id in scored]
+
+    def tick(self):
+        """Enqueue the next batch of re-analysis jobs"""
+        now = datetime.utcnow()
+        allowed, budget = self.allowance()
+        due = self.due(self.list_candidates(self.cutoff(now)), now)
+        selected = due[:allowed]
+        if selected:
+            self.enqueue(selected)
+
+        self.ticks += 1
+        self.enqueued_total += len(selected)
+        self.last_tick = {
+            'at': now.isoformat(),
+            'due': len(due),
+            'allowed': allowed,
+            'enqueued': len(selected),
+            'budget': budget
+        }
+        return self.last_tick
+
+    def run_forever(self):
+        while not self._stop.is_set():
+            try:
+                with self.app.app_context():
+                    summary = self.tick()
+                logger.info('Scheduler tick: %s', summary)
+            except Exception:
+                logger.exception('Scheduler tick failed')
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Start the scheduler thread in this process (idempotent)"""
+        with self._lock:
+            if self.running:
+                return
+            self._pid = os.getpid()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run_forever, name='scan-scheduler', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self):
+        return {
+            'running': self.running,
+            'interval_seconds': self.interval,
+            'ticks': self.ticks,
+            'enqueued_total': self.enqueued_total,
+            'last_tick': self.last_tick
+        }
@@ -0,0 +1,76 @@
+# Shared fixtures for the backend tests
+#
+# app.py reads its configuration from the environment when it is imported, so
+# the environment is prepared first: a throwaway SQLite database and model
+# registry, inline bcrypt at the lowest cost, and no background workers,
+# GitHub response cache or prediction cache. Every test starts from empty
+# tables.
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORK_DIR = tempfile.mkdtemp(prefix='ews-tests-')
+
+os.environ.update(
+    DATABASE_URL=f'sqlite:///{os.path.join(WORK_DIR, "test.db")}',
+    MODEL_REGISTRY_DIR=os.path.join(WORK_DIR, 'model_registry'),
+    BCRYPT_LOG_ROUNDS='4',
+    PASSWORD_HASH_WORKERS='0',
+    JOB_WORKERS='0',
+    GITHUB_CACHE_PATH='',
+    PREDICTION_CACHE_SIZE='0',
+    ANALYSIS_GROUP_COMMIT='0'
+)
+sys.path.insert(0, BACKEND_DIR)
+
+import app as app_module  # noqa: E402
+
+
+@pytest.fixture
+def backend():
+    """The app module, with empty tables"""
+    with app_module.app.app_context():
+        app_module.db.drop_all()
+        app_module.db.create_all()
+    yield app_module
+    with app_module.app.app_context():
+        app_module.db.session.remove()
+
+
+@pytest.fixture
+def client(backend):
+    return backend.app.test_client()
+
+
+@pytest.fixture
+def signup(client):
+    """signup(username) -> (user id, Authorization headers)"""
+    def signup(username='alice'):
+        response = client.post('/api/auth/signup', json={
+            'username': username, 'email': f'{username}@example.com', 'password': 'secret', 'role': 'developer'
+        })
+        assert response.status_code == 201, response.get_json()
+        body = response.get_json()
+        return body['user']['id'], {'Authorization': f"Bearer {body['access_token']}"}
+    return signup
+
+
+@pytest.fixture
+def headers(signup):
+    return signup()[1]
+
+
+@pytest.fixture
+def create_projects(backend):
+    """create_projects(user_id, count) -> project ids, inserted directly"""
+    def create_projects(user_id, count):
+        with backend.app.app_context():
+            projects = [backend.Project(user_id=user_id, name=f'project {i}') for i in range(count)]
+            backend.db.session.add_all(projects)
+            backend.db.session.commit()
+            return [project.id for project in projects]
+    return create_projects
@@ -0,0 +1,106 @@
+import importlib.util
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from analysis_io import EXPORT_COLUMNS, read_records
+
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+FORMATS = ['ndjson', 'csv', pytest.param('parquet', marks=pytest.mark.skipif(not HAS_PYARROW,
+                                                                             reason='pyarrow is not installed'))]
+
+
+@pytest.fixture
+def history(backend, signup, create_projects):
+    """(project id, headers) of a user whose project has 7 analyses, some with missing features"""
+    user_id, headers = signup()
+    project_id, = create_projects(user_id, 1)
+    start = datetime(2025, 6, 1)
+    with backend.app.app_context():
+        for i in range(7):
+            backend.db.session.add(backend.Analysis(
+                project_id=project_id, timestamp=start + timedelta(hours=i), risk_score=10.0 * i,
+                risk_level='high' if i > 4 else 'low', model_version='v1' if i % 2 else None,
+                metrics={}, feature_importance=[], warnings=[], recommendations=[],
+                commit_frequency=1.5 * i, contributor_activity=None if i == 3 else 20.0,
+                issue_resolution_time=4.0, code_churn=100.0 + i, open_issues_ratio=0.25
+            ))
+        backend.db.session.commit()
+    return project_id, headers
+
+
+def exported(client, headers, fmt):
+    response = client.get(f'/api/analyses/export?format={fmt}', headers=headers)
+    assert response.status_code == 200
+    return response.data
+
+
+def comparable(records):
+    """Records without ids, as sorted tuples of normalized values"""
+    rows = []
+    for record in records:
+        timestamp = record['timestamp']
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        values = [timestamp]
+        for name in EXPORT_COLUMNS[3:]:
+            value = record[name]
+            values.append(None if value in (None, '') else value if name in ('risk_level', 'model_version')
+                          else float(value))
+        rows.append((int(record['project_id']), *values))
+    return sorted(rows, key=repr)
+
+
+@pytest.mark.parametrize('fmt', FORMATS)
+def test_export_import_round_trip(client, history, fmt):
+    _, headers = history
+    body = exported(client, headers, fmt)
+    original = comparable(read_records(fmt, io.BytesIO(body)))
+    assert len(original) == 7
+    
+    response = client.post(f'/api/analyses/import?format={fmt}', headers=headers, data=body)
+    assert response.status_code == 200
+    assert response.get_json() == {'imported': 7, 'rejected': 0, 'errors': []}
+    
+    # Every record now exists twice, with identical values
+    again = comparable(read_records(fmt, io.BytesIO(exported(client, headers, fmt))))
+    assert again == sorted(original * 2, key=repr)
+
+
+def test_import_rejects_records_of_other_users(client, signup, history):
+    project_id, headers = history
+    _, other = signup('mallory')
+    body = exported(client, headers, 'ndjson') + b'not json\n'
+    
+    response = client.post('/api/analyses/import?format=ndjson', headers=other, data=body)
+    
+    assert response.status_code == 200
+    result = response.get_json()
+    assert (result['imported'], result['rejected']) == (0, 8)
+    assert result['errors'][0] == {'record': 1, 'error': 'Project not found'}
+
+
+def test_unreadable_body_imports_nothing(backend, client, history, monkeypatch):
+    # Several chunks are inserted before the malformed row is reached
+    monkeypatch.setitem(backend.app.config, 'EXPORT_CHUNK_SIZE', 2)
+    project_id, headers = history
+    body = exported(client, headers, 'csv') + f'99,{project_id},{"x" * 200000}\n'.encode()
+    
+    response = client.post('/api/analyses/import?format=csv', headers=headers, data=body)
+    
+    assert response.status_code == 400
+    assert response.get_json()['imported'] == 0
+    assert 'Malformed CSV' in response.get_json()['error']
+    with backend.app.app_context():
+        assert backend.Analysis.query.count() == 7
+
+
+def test_ndjson_export_matches_listing_encoding(backend, client, history):
+    project_id, headers = history
+    line = exported(client, headers, 'ndjson').splitlines()[0]
+    record = json.loads(line)
+    
+    with backend.app.app_context():
+        assert line + b'\n' == backend.app.json.dumps_line(record)
@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+from risk_rules import FEATURE_NAMES
+
+METRICS = dict(zip(FEATURE_NAMES, [2.0, 40.0, 12.0, 500.0, 0.4]))
+
+
+@pytest.fixture
+def bob(signup, create_projects):
+    """(project id, headers) of a user with one project"""
+    user_id, headers = signup('bob')
+    return create_projects(user_id, 1)[0], headers
+
+
+@pytest.mark.parametrize('body', [[1, 2], 'metrics', 42, None])
+@pytest.mark.parametrize('path', ['/api/analyze', '/api/analyze/batch'])
+def test_non_object_body_is_rejected(client, headers, path, body):
+    response = client.post(path, headers=headers, data=json.dumps(body), content_type='application/json')
+    
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Request body must be a JSON object'
+
+
+@pytest.mark.parametrize('metrics', [{'code_churn': 'lots'}, {'code_churn': [1]}, 'not a dict'])
+def test_non_numeric_metrics_are_rejected(client, bob, metrics):
+    project_id, headers = bob
+    
+    response = client.post('/api/analyze', headers=headers, json={'project_id': project_id, 'metrics': metrics})
+    
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Metrics must be numeric'
+
+
+def test_numeric_strings_are_accepted(client, bob):
+    project_id, headers = bob
+    
+    response = client.post('/api/analyze', headers=headers, json={
+        'project_id': project_id, 'metrics': {name: str(value) for name, value in METRICS.items()}
+    })
+    
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize('project_id', [[1], {'id': 1}, True, '1'])
+def test_invalid_project_id_is_rejected(client, headers, project_id):
+    response = client.post('/api/analyze', headers=headers, json={'project_id': project_id, 'metrics': METRICS})
+    
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Project ID must be an integer'
+
+
+def test_batch_reports_errors_per_item(client, bob):
+    project_id, headers = bob
+    items = [
+        {'project_id': project_id, 'metrics': METRICS},
+        {'project_id': [project_id]},
+        {'project_id': {'id': project_id}},
+        {'project_id': 999999, 'metrics': METRICS},
+        {'project_id': project_id, 'metrics': {'code_churn': 'x'}},
+        'not an object'
+    ]
+    
+    response = client.post('/api/analyze/batch', headers=headers, json={'items': items})
+    
+    assert response.status_code == 200
+    body = response.get_json()
+    assert (body['succeeded'], body['failed']) == (1, 5)
+    assert [result.get('error') for result in body['results']] == [
+        None, 'Project ID must be an integer', 'Project ID must be an integer', 'Project not found',
+        'Metrics must be numeric', 'Item must be an object'
+    ]
+
+
+def test_projects_of_other_users_are_not_found(client, signup, bob):
+    project_id, _ = bob
+    _, intruder = signup('mallory')
+    
+    response = client.post('/api/analyze', headers=intruder, json={'project_id': project_id, 'metrics': METRICS})
+    
+    assert response.status_code == 404
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from app import RiskPredictor
+from risk_rules import rule_based_scores
+
+SCALE = np.array([10, 100, 30, 800, 1])
+
+
+def synthetic(rows, seed):
+    rng = np.random.default_rng(seed)
+    X = rng.random((rows, 5)) * SCALE
+    y = ((X[:, 1] < 50) ^ (rng.random(rows) < 0.2)).astype(int)
+    return X, y
+
+
+@pytest.fixture(scope='module')
+def trained():
+    """A compiled-engine predictor trained on synthetic data, and held-out rows"""
+    X, y = synthetic(2000, seed=1)
+    predictor = RiskPredictor(inference_engine='compiled')
+    predictor.train_models(X, y, n_jobs=1)
+    assert predictor.compiled is not None
+    return predictor, synthetic(500, seed=2)[0]
+
+
+def native(predictor):
+    """The same models served through sklearn/XGBoost predict_proba"""
+    copy = RiskPredictor(inference_engine='native')
+    copy.rf_model, copy.xgb_model, copy.weights = predictor.rf_model, predictor.xgb_model, predictor.weights
+    return copy
+
+
+def split_points(predictor):
+    """Rows sitting exactly on the compiled trees' split thresholds"""
+    compiled = predictor.compiled
+    internal = compiled.feature >= 0
+    points = np.tile(SCALE / 2, (internal.sum(), 1))
+    points[np.arange(len(points)), compiled.feature[internal]] = compiled.threshold[internal]
+    return points
+
+
+def test_compiled_matches_native_predictions(trained):
+    predictor, X = trained
+    rows = np.vstack([X, split_points(predictor)[:2000]])
+    
+    compiled_rf, compiled_xgb = predictor._predict_proba(rows)
+    native_rf, native_xgb = native(predictor)._predict_proba(rows)
+    
+    assert np.max(np.abs(compiled_rf - native_rf)) <= RiskPredictor.COMPILED_TOLERANCE
+    assert np.max(np.abs(compiled_xgb - native_xgb)) <= RiskPredictor.COMPILED_TOLERANCE
+
+
+@pytest.mark.parametrize('weights', [{'rf': 0.5, 'xgb': 0.5}, {'rf': 1.0, 'xgb': 0.0}, {'rf': 0.3, 'xgb': 0.7}])
+def test_single_and_batch_scores_agree_across_engines(trained, weights):
+    predictor, X = trained
+    predictor.weights = weights
+    try:
+        batch = predictor.predict_risk_batch(X[:50])
+        single = [predictor.predict_risk(list(row)) for row in X[:50]]
+        reference = native(predictor).predict_risk_batch(X[:50])
+    finally:
+        predictor.weights = {'rf': 0.5, 'xgb': 0.5}
+    
+    np.testing.assert_allclose(batch, single, atol=1e-9)
+    np.testing.assert_allclose(batch, reference, atol=RiskPredictor.COMPILED_TOLERANCE * 100)
+
+
+@pytest.mark.parametrize('engine', ['compiled', 'native'])
+@pytest.mark.parametrize('exact', [False, True])
+def test_contributions_add_up_to_the_score(trained, engine, exact):
+    predictor, X = trained
+    model = predictor if engine == 'compiled' else native(predictor)
+    
+    base, contributions = model.explain_batch(X, exact=exact)
+    
+    assert contributions.shape == X.shape
+    # XGBoost's own probabilities are float32, so native scores match to float32 precision
+    np.testing.assert_allclose(base + contributions.sum(axis=1), model.predict_risk_batch(X),
+                               atol=RiskPredictor.COMPILED_TOLERANCE * 100)
+
+
+def test_rule_based_contributions_add_up_to_the_score():
+    X = synthetic(500, seed=3)[0] * np.array([0.5, 0.8, 1.5, 1.2, 1.0])
+    
+    base, contributions = RiskPredictor().explain_batch(X)
+    
+    np.testing.assert_allclose(base + contributions.sum(axis=1), rule_based_scores(X))
+
+
+def test_analysis_contributions_add_up_to_the_stored_score(client, signup, create_projects):
+    user_id, headers = signup()
+    project_id, = create_projects(user_id, 1)
+    
+    response = client.post('/api/analyze', headers=headers, json={'project_id': project_id, 'metrics': {
+        'commit_frequency': 1.0, 'contributor_activity': 35.0, 'issue_resolution_time': 20.0,
+        'code_churn': 900.0, 'open_issues_ratio': 0.6
+    }})
+    
+    analysis = response.get_json()['analysis']
+    contributions = analysis['contributions']
+    total = contributions['base_value'] + sum(item['contribution'] for item in contributions['features'])
+    assert total == pytest.approx(analysis['risk_score'])
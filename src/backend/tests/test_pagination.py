@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+START = datetime(2026, 1, 1)
+
+
+@pytest.fixture
+def listing(backend, signup, create_projects):
+    """(project id, headers): 23 analyses and warnings, two per timestamp, plus another user's rows"""
+    user_id, headers = signup()
+    other_id, _ = signup('mallory')
+    project_id, = create_projects(user_id, 1)
+    other_project, = create_projects(other_id, 1)
+    with backend.app.app_context():
+        for i in range(23):
+            # Pairs share a timestamp, so the cursor must break ties by id
+            timestamp = START + timedelta(hours=i // 2)
+            backend.db.session.add(backend.Analysis(
+                project_id=project_id, timestamp=timestamp, risk_score=float(i), risk_level='low',
+                metrics={}, feature_importance=[], warnings=[], recommendations=[]
+            ))
+            backend.db.session.add(backend.Warning(
+                project_id=project_id, timestamp=timestamp, severity=['high', 'critical'][i % 2],
+                message=str(i), acknowledged=i % 3 == 0
+            ))
+            backend.db.session.add(backend.Warning(project_id=other_project, severity='critical', message='other'))
+        backend.db.session.commit()
+    return project_id, headers
+
+
+def walk(client, headers, url, key):
+    """Every item of a paginated listing, following next_cursor"""
+    items, cursor, pages = [], None, 0
+    while True:
+        separator = '&' if '?' in url else '?'
+        response = client.get(url + (f'{separator}after={cursor}' if cursor else ''), headers=headers)
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        items += body[key]
+        pages += 1
+        cursor = body['next_cursor']
+        if not cursor:
+            return items, pages
+
+
+def test_analyses_pages_cover_every_row_once_newest_first(client, listing):
+    project_id, headers = listing
+    
+    analyses, pages = walk(client, headers, f'/api/projects/{project_id}/analyses?limit=5', 'analyses')
+    
+    assert pages == 5
+    assert [analysis['risk_score'] for analysis in analyses] == [float(i) for i in range(22, -1, -1)]
+
+
+def test_warning_filters_combine_with_the_cursor(client, listing):
+    _, headers = listing
+    url = '/api/warnings?limit=2&severity=critical&acknowledged=false&since=2026-01-01T02:00:00Z'
+    
+    warnings, _ = walk(client, headers, url, 'warnings')
+    
+    expected = [i for i in range(22, -1, -1) if i % 2 == 1 and i % 3 != 0 and i // 2 >= 2]
+    assert [int(warning['message']) for warning in warnings] == expected
+
+
+def test_warnings_of_other_users_are_not_listed(client, listing):
+    _, headers = listing
+    
+    warnings, _ = walk(client, headers, '/api/warnings?limit=500', 'warnings')
+    
+    assert len(warnings) == 23
+    assert all(warning['message'] != 'other' for warning in warnings)
+
+
+def test_last_page_has_no_cursor(client, listing):
+    project_id, headers = listing
+    
+    body = client.get(f'/api/projects/{project_id}/analyses?limit=23', headers=headers).get_json()
+    
+    assert len(body['analyses']) == 23
+    assert body['next_cursor'] is None
+
+
+@pytest.mark.parametrize('query', ['after=zzz', 'since=yesterday', 'limit=0', 'limit=-3'])
+def test_invalid_listing_arguments_are_rejected(client, listing, query):
+    _, headers = listing
+    
+    assert client.get(f'/api/warnings?{query}', headers=headers).status_code == 400
@@ -0,0 +1,132 @@
+import random
+
+import numpy as np
+import pytest
+
+from app import RiskPredictor
+
+# The original if/elif ladders, kept as the reference for the vectorized rule tables
+
+
+def reference_score(features):
+    commit_freq, contributor_activity, resolution_time, code_churn, open_ratio = features
+    risk_score = 0.0
+    if commit_freq < 2:
+        risk_score += 25
+    elif commit_freq < 4:
+        risk_score += 15
+    elif commit_freq < 6:
+        risk_score += 5
+    if contributor_activity < 40:
+        risk_score += 30
+    elif contributor_activity < 60:
+        risk_score += 20
+    elif contributor_activity < 80:
+        risk_score += 10
+    if resolution_time > 14:
+        risk_score += 25
+    elif resolution_time > 10:
+        risk_score += 15
+    elif resolution_time > 7:
+        risk_score += 5
+    if code_churn > 500:
+        risk_score += 10
+    elif code_churn > 300:
+        risk_score += 5
+    if open_ratio > 0.4:
+        risk_score += 10
+    elif open_ratio > 0.3:
+        risk_score += 5
+    return min(risk_score, 100)
+
+
+def reference_warnings(features, risk_score):
+    commit_freq, contributor_activity, resolution_time, code_churn, open_ratio = features
+    warnings = []
+    if contributor_activity < 50:
+        warnings.append("Declining contributor activity detected - engagement is below healthy levels")
+    if open_ratio > 0.3:
+        warnings.append("Increasing number of unresolved issues - backlog is growing")
+    if resolution_time > 10:
+        warnings.append("Delayed issue resolution times - average resolution taking too long")
+    if commit_freq < 3:
+        warnings.append("Low commit frequency - development activity is declining")
+    if code_churn > 400:
+        warnings.append("High code churn detected - potential instability in codebase")
+    if risk_score > 70 and not warnings:
+        warnings.append("Multiple risk factors detected - comprehensive review recommended")
+    return warnings
+
+
+def reference_recommendations(features):
+    commit_freq, contributor_activity, resolution_time, code_churn, open_ratio = features
+    recommendations = []
+    if contributor_activity < 50:
+        recommendations.append("Increase team collaboration through daily standups or weekly syncs")
+        recommendations.append("Consider bringing in additional contributors or redistributing workload")
+    if open_ratio > 0.3:
+        recommendations.append("Prioritize and address open issues - consider triage meeting")
+        recommendations.append("Review issue management workflow for bottlenecks")
+    if resolution_time > 10:
+        recommendations.append("Optimize bug resolution workflow to reduce average resolution time")
+        recommendations.append("Implement automated testing to catch issues earlier")
+    if commit_freq < 3:
+        recommendations.append("Establish regular development cadence with consistent commit schedule")
+        recommendations.append("Break down large tasks into smaller, more frequent commits")
+    if code_churn > 400:
+        recommendations.append("Review code review practices to reduce unnecessary changes")
+        recommendations.append("Stabilize architecture before adding new features")
+    if not recommendations:
+        recommendations.append("Project is healthy - maintain current development practices")
+        recommendations.append("Continue regular contributions and active issue management")
+    return recommendations[:5]
+
+
+# Values on and around every threshold of each feature
+EDGES = [
+    [0, 1.99, 2, 2.99, 3, 3.99, 4, 5.99, 6, 7],
+    [0, 39.9, 40, 49.9, 50, 59.9, 60, 79.9, 80, 100],
+    [0, 7, 7.01, 10, 10.01, 14, 14.01, 30],
+    [0, 300, 300.5, 400, 400.5, 500, 500.5, 900],
+    [0, 0.3, 0.31, 0.4, 0.41, 1]
+]
+
+
+def sample_features(count, seed=1):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        row = [rng.choice(edges) if rng.random() < 0.7 else rng.uniform(0, edges[-1] * 1.2) for edges in EDGES]
+        if rng.random() < 0.2:
+            row = [int(value) for value in row]
+        rows.append(row)
+    return rows
+
+
+@pytest.fixture(scope='module')
+def predictor():
+    return RiskPredictor()
+
+
+def test_rule_score_matches_reference(predictor):
+    for features in sample_features(5000):
+        score = predictor._rule_based_prediction(features)
+        assert score == reference_score(features), features
+        assert type(score) is float
+
+
+def test_batch_scores_match_reference(predictor):
+    rows = sample_features(500, seed=2)
+    
+    scores = predictor.predict_risk_batch(rows)
+    
+    assert list(np.asarray(scores, dtype=float)) == [reference_score(row) for row in rows]
+
+
+@pytest.mark.parametrize('risk_score', [None, 70, 71, 90])
+def test_warnings_and_recommendations_match_reference(predictor, risk_score):
+    for features in sample_features(2000, seed=3):
+        score = reference_score(features) if risk_score is None else risk_score
+        warnings = predictor.generate_warnings(features, score)
+        assert warnings == reference_warnings(features, score), features
+        assert predictor.generate_recommendations(features, warnings) == reference_recommendations(features)
@@ -0,0 +1,68 @@
+import pytest
+
+from risk_rules import FEATURE_NAMES
+
+HIGH = dict(zip(FEATURE_NAMES, [0.5, 10.0, 30.0, 900.0, 0.9]))
+MEDIUM = dict(zip(FEATURE_NAMES, [3.0, 50.0, 8.0, 350.0, 0.2]))
+LOW = dict(zip(FEATURE_NAMES, [8.0, 90.0, 2.0, 100.0, 0.1]))
+
+
+@pytest.fixture(params=[True, False], ids=['summary', 'aggregate'])
+def summary(request, backend, monkeypatch):
+    monkeypatch.setitem(backend.app.config, 'STATS_SUMMARY_ENABLED', request.param)
+    return request.param
+
+
+def stats(client, headers):
+    response = client.get('/api/stats', headers=headers)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def aggregated(backend, user_id):
+    with backend.app.app_context():
+        return backend.compute_user_stats(user_id).to_dict()
+
+
+def test_stats_follow_every_write(backend, client, signup, summary):
+    user_id, headers = signup()
+    _, other = signup('mallory')
+    # Build the summary row before the writes, so they have to keep it up to date
+    assert stats(client, headers)['total_projects'] == 0
+    
+    ids = [client.post('/api/projects', headers=headers, json={'name': f'p{i}'}).get_json()['project']['id']
+           for i in range(5)]
+    client.post('/api/projects', headers=other, json={'name': 'theirs'})
+    for project_id, metrics in zip(ids, [HIGH, HIGH, MEDIUM, LOW, LOW]):
+        assert client.post('/api/analyze', headers=headers,
+                           json={'project_id': project_id, 'metrics': metrics}).status_code == 200
+    # Re-analysis moves projects between risk levels
+    client.post('/api/analyze/batch', headers=headers, json={'items': [
+        {'project_id': ids[0], 'metrics': LOW}, {'project_id': ids[3], 'metrics': HIGH}
+    ]})
+    
+    warnings = client.get('/api/warnings', headers=headers).get_json()['warnings']
+    assert warnings
+    for _ in range(2):
+        # Acknowledging twice must not count twice
+        client.put(f"/api/warnings/{warnings[0]['id']}/acknowledge", headers=headers)
+    client.delete(f'/api/projects/{ids[1]}', headers=headers)
+    
+    result = stats(client, headers)
+    assert result == aggregated(backend, user_id)
+    assert result['total_projects'] == 4
+    assert result['risk_distribution'] == {'low': 2, 'medium': 1, 'high': 1}
+
+
+def test_rebuild_matches_incremental_summary(backend, client, signup, monkeypatch):
+    monkeypatch.setitem(backend.app.config, 'STATS_SUMMARY_ENABLED', True)
+    user_id, headers = signup()
+    stats(client, headers)
+    project_id = client.post('/api/projects', headers=headers, json={'name': 'p'}).get_json()['project']['id']
+    client.post('/api/analyze', headers=headers, json={'project_id': project_id, 'metrics': HIGH})
+    incremental = stats(client, headers)
+    
+    with backend.app.app_context():
+        rebuilt = backend.rebuild_user_stats(user_id).to_dict()
+    
+    assert incremental == rebuilt
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+
+from risk_rules import FEATURE_NAMES
+
+METRICS = dict(zip(FEATURE_NAMES, [2.0, 40.0, 12.0, 500.0, 0.4]))
+
+
+def add_history(backend, project_id, values):
+    """One analysis per day ending yesterday, with commit_frequency taking each value in turn"""
+    start = datetime.utcnow() - timedelta(days=len(values))
+    with backend.app.app_context():
+        for day, value in enumerate(values):
+            backend.db.session.add(backend.Analysis(
+                project_id=project_id, timestamp=start + timedelta(days=day), risk_score=50.0, risk_level='medium',
+                metrics={}, feature_importance=[], warnings=[], recommendations=[],
+                **dict(METRICS, commit_frequency=value)
+            ))
+        backend.db.session.commit()
+
+
+def test_history_is_capped_per_project(backend, signup, create_projects):
+    user_id, _ = signup()
+    first, second = create_projects(user_id, 2)
+    add_history(backend, first, [float(i) for i in range(30)])
+    add_history(backend, second, [1.0, 2.0, 3.0])
+    
+    with backend.app.app_context():
+        history = backend.load_metric_history([first, second], max_points=5)
+    
+    timestamps, rows = history[first]
+    assert len(rows) == 5
+    assert timestamps == sorted(timestamps)
+    assert [row[0] for row in rows] == [25.0, 26.0, 27.0, 28.0, 29.0]
+    assert len(history[second][1]) == 3
+
+
+def test_batch_over_sqlite_compound_select_limit(client, signup, create_projects):
+    # One history query term per project: more than 500 used to exceed SQLite's limits
+    user_id, headers = signup()
+    project_ids = create_projects(user_id, 600)
+    
+    response = client.post('/api/analyze/batch', headers=headers, json={
+        'items': [{'project_id': project_id, 'metrics': METRICS} for project_id in project_ids]
+    })
+    
+    assert response.status_code == 200, response.get_json()
+    assert response.get_json()['succeeded'] == 600
+
+
+def test_analysis_trend_labels_follow_recent_history(backend, client, signup, create_projects):
+    user_id, headers = signup()
+    project_id, = create_projects(user_id, 1)
+    add_history(backend, project_id, [10.0 - i * 0.4 for i in range(20)])
+    
+    response = client.post('/api/analyze', headers=headers, json={
+        'project_id': project_id, 'metrics': dict(METRICS, commit_frequency=2.0)
+    })
+    
+    assert response.status_code == 200
+    trends = {item['feature']: item['trend'] for item in response.get_json()['analysis']['feature_importance']}
+    assert trends['Commit Frequency'] == 'decreasing'
+    assert trends['Code Churn'] == 'stable'
@@ -0,0 +1,162 @@
+# Offline training pipeline for the ML-Based Early Warning System
+#
+# Builds the RandomForest/XGBoost pair with the hyperparameters the service
+# has always used, fits the two models concurrently (both release the GIL, so
+# threads share the feature matrix instead of copying it into processes),
+# cross-validates folds in parallel and records the wall-clock time and peak
+# resident memory of every pipeline stage.
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score, brier_score_loss, roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+from xgboost import XGBClassifier
+
+from memory_usage import current_rss_kb
+
+# Fold metrics, reported as mean and standard deviation over the folds
+CV_METRICS = ['auc', 'rf_auc', 'xgb_auc', 'brier', 'accuracy']
+
+
+def resolve_cores(n_jobs=None):
+    """Number of cores to use; None or -1 means all of them"""
+    if n_jobs is None or n_jobs < 0:
+        return os.cpu_count() or 1
+    return max(n_jobs, 1)
+
+
+def build_models(rf_jobs=None, xgb_threads=None):
+    """Unfitted RF and XGBoost classifiers"""
+    rf_model = RandomForestClassifier(
+        n_estimators=100,
+        max_depth=10,
+        random_state=42,
+        n_jobs=rf_jobs
+    )
+    xgb_model = XGBClassifier(
+        n_estimators=100,
+        max_depth=10,
+        learning_rate=0.1,
+        random_state=42,
+        n_jobs=xgb_threads
+    )
+    return rf_model, xgb_model
+
+
+def fit_models(X, y, n_jobs=None):
+    """Fit both models at the same time, splitting the cores between them"""
+    cores = resolve_cores(n_jobs)
+    rf_jobs = max(cores // 2, 1)
+    rf_model, xgb_model = build_models(rf_jobs, max(cores - rf_jobs, 1))
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(model.fit, X, y) for model in (rf_model, xgb_model)]
+        for future in futures:
+            future.result()
+
+    # Serve with the library defaults: a thread pool per single-row predict is pure overhead
+    rf_model.set_params(n_jobs=None)
+    xgb_model.set_params(n_jobs=None)
+    # The fitted booster keeps its own copy; 0 is XGBoost's "all cores" default
+    xgb_model.get_booster().set_param({'nthread': 0})
+    return rf_model, xgb_model
+
+
+def _fold_scores(X, y, train, test, n_jobs):
+    rf_model, xgb_model = fit_models(X[train], y[train], n_jobs)
+    rf_prob = rf_model.predict_proba(X[test])[:, 1]
+    xgb_prob = xgb_model.predict_proba(X[test])[:, 1]
+    prob = (rf_prob + xgb_prob) / 2
+    return test, rf_prob, xgb_prob, {
+        'auc': roc_auc_score(y[test], prob),
+        'rf_auc': roc_auc_score(y[test], rf_prob),
+        'xgb_auc': roc_auc_score(y[test], xgb_prob),
+        'brier': brier_score_loss(y[test], prob),
+        'accuracy': accuracy_score(y[test], prob >= 0.5)
+    }
+
+
+def cross_validate(X, y, folds=5, n_jobs=None):
+    """Stratified k-fold scores of the averaged ensemble, folds evaluated in parallel.
+
+    Returns the score summary and each model's out-of-fold probabilities,
+    which are held-out predictions for every row (used to fit blend weights).
+    """
+    if min(np.bincount(y, minlength=2)) < folds:
+        raise ValueError(f'Each class needs at least {folds} samples for {folds}-fold cross-validation')
+
+    cores = resolve_cores(n_jobs)
+    parallel = min(folds, cores)
+    splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=42)
+    results = Parallel(n_jobs=parallel, prefer='threads')(
+        delayed(_fold_scores)(X, y, train, test, max(cores // parallel, 1))
+        for train, test in splitter.split(X, y)
+    )
+
+    rf_oof, xgb_oof = np.empty(len(y)), np.empty(len(y))
+    for test, rf_prob, xgb_prob, _ in results:
+        rf_oof[test], xgb_oof[test] = rf_prob, xgb_prob
+
+    scores = [fold for _, _, _, fold in results]
+    summary = {
+        'folds': folds,
+        **{
+            metric: {
+                'mean': float(np.mean([fold[metric] for fold in scores])),
+                'std': float(np.std([fold[metric] for fold in scores]))
+            }
+            for metric in CV_METRICS
+        }
+    }
+    return summary, (rf_oof, xgb_oof)
+
+
+class StageProfiler:
+    """Wall-clock time and peak resident memory of named pipeline stages"""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        start_rss = current_rss_kb()
+        peak = [start_rss]
+        done = threading.Event()
+
+        # RSS is sampled, so allocations shorter than the interval may be missed
+        def sample():
+            while not done.wait(self.interval):
+                peak[0] = max(peak[0], current_rss_kb())
+
+        sampler = threading.Thread(target=sample, name=f'profile-{name}', daemon=True)
+        sampler.start()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_seconds = time.perf_counter() - start
+            done.set()
+            sampler.join()
+            end_rss = current_rss_kb()
+            self.stages.append({
+                'stage': name,
+                'wall_seconds': round(wall_seconds, 3),
+                'peak_rss_mb': round(max(peak[0], end_rss) / 1024, 1),
+                'rss_delta_mb': round((end_rss - start_rss) / 1024, 1)
+            })
+
+    def report(self):
+        """One line per stage"""
+        return '\n'.join(
+            f"{s['stage']:<10}{s['wall_seconds']:>9.2f}s  peak {s['peak_rss_mb']:>8.1f} MiB"
+            f"  ({s['rss_delta_mb']:+.1f} MiB)"
+            for s in self.stages
+        )
@@ -0,0 +1,245 @@
+# Compiled flat-array tree evaluator for the ML-Based Early Warning System
+#
+# Exports the RandomForest and XGBoost ensembles of a RiskPredictor into
+# contiguous NumPy node arrays and evaluates all trees of both models in a
+# single vectorized traversal. This skips the per-call validation and
+# dispatch overhead of predict_proba, which dominates single-row latency.
+
+import json
+
+import numpy as np
+
+
+class CompiledEnsemble:
+    """RF + XGBoost ensemble flattened into contiguous node arrays.
+
+    Every node stores the feature it splits on, a float64 threshold, its
+    children (``children[2 * node]`` is left, ``children[2 * node + 1]`` is
+    right), the value of the node if it is a leaf and whether missing values
+    go left. Leaves point to themselves so a fixed number of steps walks every
+    tree to its leaf. All nodes split as ``float32(x) <= threshold``, which is
+    what scikit-learn does; XGBoost's ``x < t`` is rewritten as
+    ``x <= nextafter(t, -inf)`` in float32.
+    """
+
+    def __init__(self, feature, threshold, children, value, default_left,
+                 roots, n_rf_trees, xgb_base_margin, max_depth, node_mean=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.default_left = default_left
+        self.roots = roots
+        self.n_rf_trees = n_rf_trees
+        self.xgb_base_margin = xgb_base_margin
+        self.max_depth = max_depth
+        # Expected value below every node, for path decomposition (explanations)
+        self.node_mean = node_mean
+
+    @classmethod
+    def from_models(cls, rf_model, xgb_model):
+        """Export fitted RandomForestClassifier and XGBClassifier models"""
+        trees = [_export_sklearn_tree(est.tree_) for est in rf_model.estimators_]
+        n_rf_trees = len(trees)
+
+        booster_trees, base_margin = _export_xgb_booster(xgb_model.get_booster())
+        trees.extend(booster_trees)
+
+        feature, threshold, left, right, value, default_left, node_mean, roots = [], [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for tree in trees:
+            n_nodes = len(tree['feature'])
+            roots.append(offset)
+            # Leaves (-1) loop back onto themselves
+            own = np.arange(n_nodes)
+            left.append(np.where(tree['left'] < 0, own, tree['left']) + offset)
+            right.append(np.where(tree['right'] < 0, own, tree['right']) + offset)
+            feature.append(np.where(tree['left'] < 0, 0, tree['feature']))
+            threshold.append(tree['threshold'])
+            value.append(tree['value'])
+            default_left.append(tree['default_left'])
+            node_mean.append(tree['node_mean'])
+            max_depth = max(max_depth, _tree_depth(tree['left'], tree['right']))
+            offset += n_nodes
+
+        children = np.empty(2 * offset, dtype=np.int32)
+        children[0::2] = np.concatenate(left)
+        children[1::2] = np.concatenate(right)
+
+        return cls(
+            feature=np.concatenate(feature).astype(np.intp),
+            threshold=np.concatenate(threshold).astype(np.float64),
+            children=children,
+            value=np.concatenate(value).astype(np.float64),
+            default_left=np.concatenate(default_left).astype(bool),
+            roots=np.asarray(roots, dtype=np.int32),
+            n_rf_trees=n_rf_trees,
+            xgb_base_margin=base_margin,
+            max_depth=max_depth,
+            node_mean=np.concatenate(node_mean).astype(np.float64)
+        )
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    def _prepare(self, X):
+        # Same precision as the models: sklearn and XGBoost both split on float32
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        n_rows, n_features = X.shape
+        row_offset = (np.arange(n_rows, dtype=np.intp) * n_features)[:, None]
+        return X.ravel(), row_offset, np.isnan(X).any()
+
+    def _step(self, nodes, flat_X, row_offset, has_missing):
+        """Advance every (row, tree) cursor one level down"""
+        values = flat_X[row_offset + self.feature[nodes]]
+        go_right = values > self.threshold[nodes]
+        if has_missing:
+            go_right |= np.isnan(values) & ~self.default_left[nodes]
+        return self.children[2 * nodes + go_right]
+
+    def apply(self, X, trees=slice(None)):
+        """Return the leaf index reached in every tree (or a slice of them), shape (N, n_trees)"""
+        flat_X, row_offset, has_missing = self._prepare(X)
+        roots = self.roots[trees]
+        nodes = np.broadcast_to(roots, (len(row_offset), len(roots))).astype(np.intp)
+
+        for _ in range(self.max_depth):
+            nodes = self._step(nodes, flat_X, row_offset, has_missing)
+
+        return nodes
+
+    def contributions(self, X, n_features):
+        """Tree-path decomposition of both models.
+
+        Each split moves a tree's expected output from the parent's mean to the
+        child's; that change is credited to the split feature. Returns
+        ``(rf_bias, rf_contributions, xgb_bias, xgb_contributions)``: the RF
+        parts are in probability (averaged over the forest), the XGBoost parts
+        in log-odds (summed over the boosting rounds), and each bias plus its
+        contributions' row sum reproduces that model's ``predict_proba`` output
+        (before the sigmoid for XGBoost).
+        """
+        flat_X, row_offset, has_missing = self._prepare(X)
+        n_rows = len(row_offset)
+        nodes = np.broadcast_to(self.roots, (n_rows, len(self.roots))).astype(np.intp)
+        # Flat (row, feature) slot of each split, summed with bincount per model
+        slot_base = (np.arange(n_rows, dtype=np.intp) * n_features)[:, None]
+        rf, xgb = slice(None, self.n_rf_trees), slice(self.n_rf_trees, None)
+        rf_sum = np.zeros(n_rows * n_features)
+        xgb_sum = np.zeros(n_rows * n_features)
+
+        for _ in range(self.max_depth):
+            children = self._step(nodes, flat_X, row_offset, has_missing)
+            # Leaves point to themselves, so finished trees add nothing
+            delta = self.node_mean[children] - self.node_mean[nodes]
+            slots = slot_base + self.feature[nodes]
+            rf_sum += np.bincount(slots[:, rf].ravel(), delta[:, rf].ravel(), n_rows * n_features)
+            xgb_sum += np.bincount(slots[:, xgb].ravel(), delta[:, xgb].ravel(), n_rows * n_features)
+            nodes = children
+
+        root_mean = self.node_mean[self.roots]
+        return (
+            float(root_mean[rf].mean()), rf_sum.reshape(n_rows, n_features) / self.n_rf_trees,
+            float(root_mean[xgb].sum() + self.xgb_base_margin), xgb_sum.reshape(n_rows, n_features)
+        )
+
+    def predict_proba(self, X, rf=True, xgb=True):
+        """Positive class probabilities of the RF and XGBoost models, each shape (N,).
+
+        A model turned off with rf=False or xgb=False is not walked and gets
+        zeros, for ensembles that serve only one of the two.
+        """
+        start = 0 if rf else self.n_rf_trees
+        stop = None if xgb else self.n_rf_trees
+        leaf_values = self.value[self.apply(X, slice(start, stop))]
+        n_rows = len(leaf_values)
+
+        rf_prob = leaf_values[:, :self.n_rf_trees].mean(axis=1) if rf else np.zeros(n_rows)
+        if xgb:
+            margin = leaf_values[:, self.n_rf_trees - start:].sum(axis=1) + self.xgb_base_margin
+            xgb_prob = 1.0 / (1.0 + np.exp(-margin))
+        else:
+            xgb_prob = np.zeros(n_rows)
+        return rf_prob, xgb_prob
+
+    def max_abs_error(self, X, rf_model, xgb_model):
+        """Largest probability difference from the models' own predict_proba"""
+        rf_prob, xgb_prob = self.predict_proba(X)
+        return max(
+            float(np.max(np.abs(rf_prob - rf_model.predict_proba(X)[:, 1]))),
+            float(np.max(np.abs(xgb_prob - xgb_model.predict_proba(X)[:, 1])))
+        )
+
+
+def _export_sklearn_tree(tree):
+    """Node arrays of a fitted sklearn Tree, leaf value = P(class 1)"""
+    counts = tree.value[:, 0, :]
+    totals = counts.sum(axis=1)
+    value = np.divide(counts[:, 1], totals, out=np.zeros(len(totals)), where=totals > 0)
+    return {
+        'feature': tree.feature.copy(),
+        'threshold': tree.threshold.copy(),
+        'left': tree.children_left.copy(),
+        'right': tree.children_right.copy(),
+        'value': value,
+        'node_mean': value,
+        # sklearn 1.3 forests do not route missing values
+        'default_left': np.zeros(tree.node_count, dtype=bool)
+    }
+
+
+def _export_xgb_booster(booster):
+    """Node arrays of every tree in a binary:logistic gbtree booster"""
+    model = json.loads(booster.save_raw(raw_format='json'))
+    learner = model['learner']
+    if learner['gradient_booster']['name'] != 'gbtree':
+        raise ValueError('Only gbtree boosters can be compiled')
+    if learner['objective']['name'] != 'binary:logistic':
+        raise ValueError('Only binary:logistic boosters can be compiled')
+
+    base_score = float(learner['learner_model_param']['base_score'])
+    base_margin = float(np.log(base_score / (1.0 - base_score)))
+
+    trees = []
+    for tree in learner['gradient_booster']['model']['trees']:
+        left = np.asarray(tree['left_children'], dtype=np.int64)
+        conditions = np.asarray(tree['split_conditions'], dtype=np.float32)
+        is_leaf = left < 0
+        # x < t  <=>  x <= largest float32 below t
+        threshold = np.nextafter(conditions, np.float32(-np.inf)).astype(np.float64)
+        trees.append({
+            'node_mean': _xgb_node_means(left, tree['right_children'], conditions, tree['sum_hessian']),
+            'feature': np.asarray(tree['split_indices'], dtype=np.int64),
+            'threshold': np.where(is_leaf, 0.0, threshold),
+            'left': left,
+            'right': np.asarray(tree['right_children'], dtype=np.int64),
+            'value': np.where(is_leaf, conditions.astype(np.float64), 0.0),
+            'default_left': np.asarray(tree['default_left'], dtype=bool)
+        })
+    return trees, base_margin
+
+
+def _xgb_node_means(left, right, leaf_values, sum_hessian):
+    """Hessian-weighted mean leaf value below every node (what approx_contribs uses)"""
+    means = np.asarray(leaf_values, dtype=np.float64).copy()
+    hessian = np.asarray(sum_hessian, dtype=np.float64)
+    # Children come after their parent, so walking backwards finishes them first
+    for node in range(len(left) - 1, -1, -1):
+        if left[node] >= 0:
+            l, r = left[node], right[node]
+            means[node] = (hessian[l] * means[l] + hessian[r] * means[r]) / (hessian[l] + hessian[r])
+    return means
+
+
+def _tree_depth(left, right):
+    depth = np.zeros(len(left), dtype=np.int64)
+    # Children always come after their parent in both formats
+    for node in range(len(left)):
+        if left[node] >= 0:
+            depth[left[node]] = depth[node] + 1
+            depth[right[node]] = depth[node] + 1
+    return int(depth.max()) if len(depth) else 0